@@ -7,6 +7,7 @@
 - 分批处理，避免服务负载过高
 - 生成详细的处理报告
 - 支持断点续传（跳过已处理的图片）
+- 支持PDF和多页TIFF（逐页识别，可指定页码范围）
 """
 
 import sys
@@ -37,7 +38,8 @@ class BatchOCRProcessor:
         max_retries: int = 3,
         retry_delay: float = 2.0,
         skip_existing: bool = True,
-        lang: str = "ch"
+        lang: str = "ch",
+        pages: Optional[str] = None
     ):
         """初始化批量处理器。
         
@@ -50,6 +52,7 @@ class BatchOCRProcessor:
             retry_delay: 重试延迟（秒）
             skip_existing: 是否跳过已处理的图片
             lang: 语言代码
+            pages: PDF/多页TIFF的页码范围，如 "1-3,5"（默认：全部页）
         """
         self.image_dir = Path(image_dir).resolve()
         self.output_dir = output_dir or (self.image_dir / "ocr_results")
@@ -61,6 +64,7 @@ class BatchOCRProcessor:
         self.retry_delay = retry_delay
         self.skip_existing = skip_existing
         self.lang = lang
+        self.pages = pages
         
         # 统计信息
         self.stats = {
@@ -74,8 +78,8 @@ class BatchOCRProcessor:
             "errors": []
         }
         
-        # 支持的图片格式
-        self.image_extensions = {".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".tif", ".webp"}
+        # 支持的图片和文档格式
+        self.image_extensions = {".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".tif", ".webp", ".pdf"}
     
     def find_images(self) -> List[Path]:
         """查找目录中的所有图片文件。"""
@@ -103,20 +107,22 @@ class BatchOCRProcessor:
         """
         from ocr_mcp_service.ocr_engine import OCREngineFactory
         from ocr_mcp_service.utils import validate_image
+        from ocr_mcp_service.document_input import is_multipage_document
         
         for attempt in range(self.max_retries + 1):
             try:
-                # 验证图片
-                validate_image(str(image_path))
-                
                 # 获取引擎并识别
                 engine = OCREngineFactory.get_engine(self.engine)
                 
                 # 根据引擎类型传递参数
-                if self.engine == "paddleocr":
-                    result = engine.recognize_image(str(image_path), lang=self.lang)
+                kwargs = {"lang": self.lang} if self.engine == "paddleocr" else {}
+                
+                if is_multipage_document(str(image_path)):
+                    result = self.process_document(engine, image_path, **kwargs)
                 else:
-                    result = engine.recognize_image(str(image_path))
+                    # 验证图片
+                    validate_image(str(image_path))
+                    result = engine.recognize_image(str(image_path), **kwargs)
                 
                 # 转换为字典
                 result_dict = result.to_dict()
@@ -148,6 +154,51 @@ class BatchOCRProcessor:
         
         return False, None, "Max retries exceeded"
     
+    def process_document(self, engine, document_path: Path, **kwargs):
+        """逐页识别PDF或多页TIFF，每页识别后立即释放像素。
+        
+        Returns:
+            DocumentResult
+        """
+        from ocr_mcp_service.document_input import recognize_document
+        from ocr_mcp_service.image_input import recognize_loaded
+        
+        def on_page(page_result, done, total):
+            if page_result.ok:
+                print(f"  📄 第 {page_result.page} 页 ({done}/{total}): {len(page_result.result.text)}字符")
+            else:
+                print(f"  ⚠️  第 {page_result.page} 页 ({done}/{total}) 失败: {page_result.error}")
+        
+        return recognize_document(
+            str(document_path),
+            lambda page: recognize_loaded(engine, page, **kwargs),
+            pages=self.pages,
+            progress_callback=on_page,
+        )
+    
+    def recognize_batch(self, images: List[Path]) -> Dict:
+        """用引擎的批量接口识别一批图片。
+        
+        Returns:
+            图片路径 -> BatchItemResult；引擎不可用时返回空字典（全部逐张重试）
+        """
+        if not images:
+            return {}
+        
+        from ocr_mcp_service.ocr_engine import OCREngineFactory
+        
+        try:
+            engine = OCREngineFactory.get_engine(self.engine)
+            kwargs = {"lang": self.lang} if self.engine == "paddleocr" else {}
+            items = engine.recognize_images(
+                [str(p) for p in images], batch_size=self.batch_size, **kwargs
+            )
+        except Exception as e:
+            print(f"  ⚠️  批量识别不可用，改为逐张处理: {e}")
+            return {}
+        
+        return {item.image_path: item for item in items}
+    
     def save_result(self, image_path: Path, result_dict: Dict):
         """保存OCR结果。"""
         base_name = image_path.stem
@@ -175,18 +226,35 @@ class BatchOCRProcessor:
             "errors": []
         }
         
+        pending = []
         for image_path in images:
-            print(f"\n📷 处理: {image_path.name}")
-            
             # 检查是否已处理
             if self.is_already_processed(image_path):
+                print(f"\n📷 处理: {image_path.name}")
                 print(f"  ⏭️  跳过（已处理）")
                 batch_stats["skipped"] += 1
                 self.stats["skipped"] += 1
-                continue
+            else:
+                pending.append(image_path)
+        
+        from ocr_mcp_service.document_input import is_multipage_document
+        
+        # 整批交给引擎（支持批量推理的引擎只调用一次），失败的图片再逐张重试；
+        # PDF和多页TIFF不进批量接口，在逐张处理中按页识别
+        batch_results = self.recognize_batch(
+            [p for p in pending if not is_multipage_document(str(p))]
+        )
+        
+        for image_path in pending:
+            print(f"\n📷 处理: {image_path.name}")
             
-            # 处理图片
-            success, result_dict, error_msg = self.process_image(image_path)
+            item = batch_results.get(str(image_path))
+            if item is not None and item.ok:
+                success, result_dict, error_msg = True, item.result.to_dict(), None
+            else:
+                if item is not None:
+                    print(f"  ⚠️  批量识别失败: {item.error_type}: {item.error}")
+                success, result_dict, error_msg = self.process_image(image_path)
             
             if success:
                 # 保存结果
@@ -313,6 +381,9 @@ def main():
 
   # 使用easyocr引擎，不跳过已处理的图片
   python scripts/batch_ocr.py . --engine easyocr --no-skip-existing
+
+  # 只识别目录中PDF/多页TIFF的前3页
+  python scripts/batch_ocr.py /path/to/docs --pages 1-3
         """
     )
     
@@ -369,6 +440,12 @@ def main():
         help="语言代码（默认：ch，仅paddleocr）"
     )
     
+    parser.add_argument(
+        "--pages",
+        type=str,
+        help="PDF/多页TIFF的页码范围，如 1-3,5（默认：全部页）"
+    )
+    
     args = parser.parse_args()
     
     # 验证图片目录
@@ -390,7 +467,8 @@ def main():
         max_retries=args.max_retries,
         retry_delay=args.retry_delay,
         skip_existing=not args.no_skip_existing,
-        lang=args.lang
+        lang=args.lang,
+        pages=args.pages
     )
     
     # 处理所有图片
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""日志开销基准测试
+
+模拟一次识别请求产生的日志（工具调用开始/成功、进度更新等，默认 30 条），
+对比处理器同步执行（LOG_QUEUE_SIZE=0）与队列+后台线程两种方式下，
+调用方每个请求花在日志上的时间。MCP日志通知用带固定延迟的回调模拟。
+
+注意：这是基准测试脚本，不是pytest单元测试。
+"""
+
+import sys
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path before importing scripts.common
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Setup script environment
+from scripts.common import setup_script
+setup_script()
+
+from ocr_mcp_service.logger import OCRLogger
+
+
+def make_logger(log_file: str, queue_size: int, notify_delay: float) -> OCRLogger:
+    """按指定队列容量创建新的日志实例。"""
+    os.environ["LOG_FILE"] = log_file
+    os.environ["LOG_QUEUE_SIZE"] = str(queue_size)
+    OCRLogger._instance = None
+    OCRLogger._initialized = False
+    logger = OCRLogger()
+
+    def notify(level, logger, data):
+        time.sleep(notify_delay)
+
+    logger.set_mcp_callback(notify)
+    return logger
+
+
+def run_request(logger: OCRLogger, lines: int):
+    """一次请求的日志：开始、进度更新、成功。"""
+    tool_logger = logger.get_logger("tools.recognize_image_paddleocr")
+    tool_logger.info("MCP工具调用开始: recognize_image_paddleocr, 图片: bench.png")
+    for i in range(lines - 2):
+        logger.log_progress(
+            "PaddleOCREngine", 100.0 * i / lines, f"处理中... ({i}/{lines})",
+            stage="OCR引擎调用", image_path="bench.png",
+        )
+    tool_logger.info("MCP工具调用成功: recognize_image_paddleocr, 文本长度: 1024")
+
+
+def bench(queue_size: int, args, log_dir: str) -> tuple:
+    """返回 (每请求调用方耗时, 含等待写完的耗时, 丢弃条数)。"""
+    logger = make_logger(os.path.join(log_dir, f"bench_{queue_size}.log"), queue_size, args.notify_delay)
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        run_request(logger, args.lines)
+    caller = time.perf_counter() - start
+    logger.flush(timeout=600)
+    total = time.perf_counter() - start
+    dropped = logger.get_stats()["dropped"]
+    OCRLogger._stop_listener()
+    logger.file_handler.close()
+    return caller / args.requests, total / args.requests, dropped
+
+
+def main():
+    """主函数。"""
+    parser = argparse.ArgumentParser(description="日志开销基准测试")
+    parser.add_argument("--requests", type=int, default=200, help="模拟请求数（默认：200）")
+    parser.add_argument("--lines", type=int, default=30, help="每个请求的日志条数（默认：30）")
+    parser.add_argument("--notify-delay", type=float, default=0.0002,
+                        help="模拟一次MCP日志通知的耗时，秒（默认：0.0002）")
+    parser.add_argument("--queue-size", type=int, default=10000, help="队列容量（默认：10000）")
+    args = parser.parse_args()
+
+    print(f"{args.requests} 个请求，每个 {args.lines} 条日志，MCP通知延迟 {args.notify_delay * 1e6:.0f} µs\n")
+    print(f"{'调用方/请求':>12} {'含写完/请求':>12} {'丢弃':>6}  方式")
+    with tempfile.TemporaryDirectory() as log_dir:
+        for label, queue_size in (("同步处理器", 0), (f"队列 ({args.queue_size})", args.queue_size)):
+            caller, total, dropped = bench(queue_size, args, log_dir)
+            print(f"{caller * 1000:9.3f} ms {total * 1000:9.3f} ms {dropped:6d}  {label}")
+
+
+if __name__ == "__main__":
+    main()
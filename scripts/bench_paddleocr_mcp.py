@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""paddleocr-mcp 引擎单次调用延迟基准测试
+
+对比两种方式的每次调用延迟：
+- 之前：每次调用都创建 PaddleOCR()（重新加载检测和识别模型）
+- 之后：PaddleOCRMCPEngine 在初始化时创建一个长期存在的预测器并复用
+
+注意：这是基准测试脚本，不是pytest单元测试。需要安装 paddleocr 和 paddleocr-mcp。
+"""
+
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+# Add project root to path before importing scripts.common
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Setup script environment
+from scripts.common import setup_script
+setup_script()
+
+
+def bench(label: str, func, runs: int) -> list:
+    """运行 func runs 次并返回每次耗时（秒）。"""
+    timings = []
+    for i in range(runs):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        print(f"  {label} 第 {i + 1}/{runs} 次: {elapsed:.3f}s")
+    return timings
+
+
+def summarize(label: str, timings: list):
+    """打印耗时统计。"""
+    print(
+        f"{label:<24} 平均 {statistics.mean(timings):.3f}s  "
+        f"中位数 {statistics.median(timings):.3f}s  "
+        f"最小 {min(timings):.3f}s  最大 {max(timings):.3f}s"
+    )
+
+
+def main():
+    """主函数。"""
+    parser = argparse.ArgumentParser(description="paddleocr-mcp 引擎单次调用延迟基准测试")
+    parser.add_argument("image", help="测试图片路径")
+    parser.add_argument("--runs", type=int, default=5, help="每种方式的调用次数（默认：5）")
+    args = parser.parse_args()
+
+    image_path = str(Path(args.image).resolve())
+
+    try:
+        from paddleocr import PaddleOCR
+        from ocr_mcp_service.ocr_engine import PaddleOCRMCPEngine
+    except ImportError as e:
+        print(f"❌ 依赖未安装: {e}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print("paddleocr-mcp 单次调用延迟基准测试")
+    print("=" * 80)
+    print(f"测试图片: {image_path}")
+    print(f"调用次数: {args.runs}\n")
+
+    print("之前：每次调用创建 PaddleOCR()")
+    before = bench("per-call", lambda: PaddleOCR().ocr(image_path), args.runs)
+
+    print("\n之后：复用长期存在的预测器")
+    start = time.perf_counter()
+    engine = PaddleOCRMCPEngine()
+    init_time = time.perf_counter() - start
+    print(f"  引擎初始化（仅一次）: {init_time:.3f}s")
+    # 丢弃第一次调用，排除一次性的预热开销
+    engine.recognize_image(image_path)
+    after = bench("persistent", lambda: engine.recognize_image(image_path), args.runs)
+
+    print("\n" + "=" * 80)
+    summarize("之前（每次创建）", before)
+    summarize("之后（复用预测器）", after)
+    print(f"加速比（中位数）: {statistics.median(before) / statistics.median(after):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
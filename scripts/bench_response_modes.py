@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""OCR结果返回模式基准测试
+
+使用合成的密集页面结果（默认 2,000 个文本框），对比各返回模式
+（detail × box_format × progress_history）的序列化耗时与JSON体积。
+序列化耗时包括 to_dict() 和 json.dumps()，即工具返回时的实际开销。
+
+注意：这是基准测试脚本，不是pytest单元测试。
+"""
+
+import sys
+import argparse
+import json
+import timeit
+from pathlib import Path
+
+# Add project root to path before importing scripts.common
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Setup script environment
+from scripts.common import setup_script
+setup_script()
+
+import numpy as np
+
+from ocr_mcp_service.models import BoundingBox, OCRResult
+
+MODES = [
+    ("full / dict", dict(detail="full", box_format="dict")),
+    ("full / dict / 无进度历史", dict(detail="full", box_format="dict", include_progress_history=False)),
+    ("full / flat", dict(detail="full", box_format="flat")),
+    ("full / flat / 无进度历史", dict(detail="full", box_format="flat", include_progress_history=False)),
+    ("confidence", dict(detail="confidence")),
+    ("text", dict(detail="text")),
+]
+
+
+def make_result(n: int, history: int) -> OCRResult:
+    """生成合成的密集页面识别结果。"""
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0, 3000, n)
+    y = rng.uniform(0, 4000, n)
+    w = rng.uniform(20, 400, n)
+    h = rng.uniform(10, 60, n)
+    texts = [f"文本块{i}" for i in range(n)]
+    return OCRResult(
+        text="\n".join(texts),
+        boxes=[BoundingBox(*row) for row in np.stack([x, y, x + w, y + h], axis=1).tolist()],
+        confidence=0.93,
+        engine="paddleocr",
+        processing_time=2.5,
+        analysis="技术解析：" + "检测到表格结构与多栏排版。" * 20,
+        progress_history=[
+            {"timestamp": 1.7e9 + i, "percentage": 100.0 * i / history, "stage": "OCR引擎调用",
+             "message": f"处理中... ({i}/{history})", "elapsed": float(i)}
+            for i in range(history)
+        ],
+        box_texts=texts,
+        box_scores=rng.uniform(0.5, 1.0, n).tolist(),
+    )
+
+
+def serialize(result: OCRResult, options: dict) -> str:
+    """工具返回路径：to_dict() + JSON编码。"""
+    return json.dumps(result.to_dict(**options), ensure_ascii=False)
+
+
+def main():
+    """主函数。"""
+    parser = argparse.ArgumentParser(description="OCR结果返回模式基准测试")
+    parser.add_argument("--boxes", type=int, default=2000, help="合成文本框数量（默认：2000）")
+    parser.add_argument("--history", type=int, default=50, help="进度历史条数（默认：50）")
+    parser.add_argument("--repeat", type=int, default=20, help="重复次数，取最小值（默认：20）")
+    args = parser.parse_args()
+
+    result = make_result(args.boxes, args.history)
+    baseline = len(serialize(result, MODES[0][1]).encode("utf-8"))
+
+    print(f"合成结果: {args.boxes} 个文本框，{args.history} 条进度历史，重复 {args.repeat} 次取最小值\n")
+    # Labels last: CJK characters break fixed-width alignment
+    print(f"{'耗时':>8} {'体积':>10} {'相对':>6}  模式")
+    for label, options in MODES:
+        elapsed = min(timeit.repeat(lambda: serialize(result, options), number=1, repeat=args.repeat))
+        size = len(serialize(result, options).encode("utf-8"))
+        print(f"{elapsed * 1000:7.2f} ms {size / 1024:8.1f} KB {size / baseline:6.1%}  {label}")
+
+
+if __name__ == "__main__":
+    main()
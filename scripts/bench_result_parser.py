@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""OCR结果解析微基准测试
+
+使用合成的 5,000 个文本框结果，对比逐框 Python 循环（旧实现）与
+result_parser 中向量化解析的耗时。
+
+注意：这是基准测试脚本，不是pytest单元测试。
+"""
+
+import sys
+import argparse
+import timeit
+from pathlib import Path
+
+# Add project root to path before importing scripts.common
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Setup script environment
+from scripts.common import setup_script
+setup_script()
+
+import numpy as np
+
+from ocr_mcp_service.models import BoundingBox
+from ocr_mcp_service.result_parser import parse_easyocr_result, parse_paddle_result
+
+
+def make_paddle_result(n: int) -> list:
+    """生成合成的 PaddleOCR 3.x 结果。"""
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0, 3000, n)
+    y = rng.uniform(0, 4000, n)
+    w = rng.uniform(20, 400, n)
+    h = rng.uniform(10, 60, n)
+    polys = np.stack([
+        np.stack([x, y], axis=1),
+        np.stack([x + w, y], axis=1),
+        np.stack([x + w, y + h], axis=1),
+        np.stack([x, y + h], axis=1),
+    ], axis=1).astype(np.int16)
+    return [{
+        "rec_texts": [f"文本块{i}" for i in range(n)],
+        "rec_scores": rng.uniform(0.5, 1.0, n).tolist(),
+        "rec_polys": list(polys),
+    }]
+
+
+def make_easyocr_result(n: int) -> list:
+    """生成合成的 EasyOCR 结果。"""
+    page = make_paddle_result(n)[0]
+    return [
+        (poly.tolist(), text, score)
+        for poly, text, score in zip(page["rec_polys"], page["rec_texts"], page["rec_scores"])
+    ]
+
+
+def legacy_parse_paddle(result):
+    """旧实现：逐框 Python 循环。"""
+    text_parts, boxes, confidences = [], [], []
+    page_result = result[0]
+    rec_texts = page_result.get('rec_texts', [])
+    rec_scores = page_result.get('rec_scores', [])
+    rec_polys = page_result.get('rec_polys', [])
+    for i, text in enumerate(rec_texts):
+        if text:
+            text_parts.append(text)
+            confidence = rec_scores[i] if i < len(rec_scores) else 1.0
+            confidences.append(float(confidence))
+            poly = rec_polys[i]
+            x_coords = [p[0] for p in poly]
+            y_coords = [p[1] for p in poly]
+            boxes.append(BoundingBox(
+                x1=float(min(x_coords)), y1=float(min(y_coords)),
+                x2=float(max(x_coords)), y2=float(max(y_coords)),
+            ))
+    avg = sum(confidences) / len(confidences) if confidences else 0.0
+    return text_parts, boxes, avg
+
+
+def legacy_parse_easyocr(results):
+    """旧实现：逐框 Python 循环。"""
+    text_parts, boxes, confidences = [], [], []
+    for bbox, text, confidence in results:
+        text_parts.append(text)
+        confidences.append(float(confidence))
+        x_coords = [point[0] for point in bbox]
+        y_coords = [point[1] for point in bbox]
+        boxes.append(BoundingBox(
+            x1=float(min(x_coords)), y1=float(min(y_coords)),
+            x2=float(max(x_coords)), y2=float(max(y_coords)),
+        ))
+    avg = sum(confidences) / len(confidences) if confidences else 0.0
+    return text_parts, boxes, avg
+
+
+def report(label: str, legacy, vectorized, repeat: int):
+    """运行并打印对比结果。"""
+    legacy_time = min(timeit.repeat(legacy, number=1, repeat=repeat))
+    vectorized_time = min(timeit.repeat(vectorized, number=1, repeat=repeat))
+    print(
+        f"{label:<12} 旧实现 {legacy_time * 1000:8.2f} ms   "
+        f"向量化 {vectorized_time * 1000:8.2f} ms   "
+        f"加速比 {legacy_time / vectorized_time:5.1f}x"
+    )
+
+
+def main():
+    """主函数。"""
+    parser = argparse.ArgumentParser(description="OCR结果解析微基准测试")
+    parser.add_argument("--boxes", type=int, default=5000, help="合成文本框数量（默认：5000）")
+    parser.add_argument("--repeat", type=int, default=20, help="重复次数，取最小值（默认：20）")
+    args = parser.parse_args()
+
+    paddle_result = make_paddle_result(args.boxes)
+    easyocr_result = make_easyocr_result(args.boxes)
+
+    # 校验两种实现结果一致
+    texts, boxes, avg = legacy_parse_paddle(paddle_result)
+    parsed = parse_paddle_result(paddle_result)
+    assert parsed.texts == texts and parsed.boxes == boxes
+    assert abs(parsed.confidence - avg) < 1e-9
+
+    print(f"合成结果: {args.boxes} 个文本框，重复 {args.repeat} 次取最小值\n")
+    report("PaddleOCR", lambda: legacy_parse_paddle(paddle_result),
+           lambda: parse_paddle_result(paddle_result), args.repeat)
+    report("EasyOCR", lambda: legacy_parse_easyocr(easyocr_result),
+           lambda: parse_easyocr_result(easyocr_result), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
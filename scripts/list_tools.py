@@ -32,6 +32,7 @@ def main():
         recognize_image_deepseek,
         recognize_image_paddleocr_mcp,
         recognize_image_easyocr,
+        recognize_images_batch,
     )
     
     tools = [
@@ -59,6 +60,12 @@ def main():
             "engine": "DeepSeek OCR",
             "status": "Registered (requires: pip install -e '.[deepseek]')"
         },
+        {
+            "name": "recognize_images_batch",
+            "tool": recognize_images_batch,
+            "engine": "Any (per batch)",
+            "status": "Available"
+        },
     ]
     
     for i, tool_info in enumerate(tools, 1):
@@ -81,7 +88,7 @@ def main():
                 print(f"   Parameters: {len(params)} parameter(s)")
     
     print("\n" + "=" * 60)
-    print("Total: 4 OCR tools")
+    print(f"Total: {len(tools)} OCR tools")
     print("=" * 60)
 
 
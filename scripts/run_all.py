@@ -74,6 +74,33 @@ SCRIPTS = {
             "default_args": None,  # 必须提供
         },
     },
+    "benchmark": {
+        "bench_paddleocr_mcp": {
+            "file": "bench_paddleocr_mcp.py",
+            "description": "paddleocr-mcp单次调用延迟基准（需要图片路径）",
+            "requires_args": True,
+            "arg_help": "图片路径",
+            "default_args": None,  # 必须提供
+        },
+        "bench_result_parser": {
+            "file": "bench_result_parser.py",
+            "description": "结果解析向量化基准（合成数据，无需模型）",
+            "requires_args": False,
+            "default_args": [],
+        },
+        "bench_response_modes": {
+            "file": "bench_response_modes.py",
+            "description": "返回模式序列化耗时与体积基准（合成数据，无需模型）",
+            "requires_args": False,
+            "default_args": [],
+        },
+        "bench_logging": {
+            "file": "bench_logging.py",
+            "description": "日志同步处理与队列处理的每请求开销基准（无需模型）",
+            "requires_args": False,
+            "default_args": [],
+        },
+    },
 }
 
 
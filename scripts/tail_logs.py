@@ -17,6 +17,7 @@
 import sys
 import time
 import argparse
+import json
 import re
 from pathlib import Path
 from typing import Optional
@@ -53,12 +54,38 @@ class Colors:
         Colors.RESET = ""
 
 
+LOG_LINE_PATTERN = re.compile(
+    r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] (\w+) \[([^\]]+)\] (.+)'
+)
+
+# Keys of a JSON log line that are not extra fields
+JSON_BASE_KEYS = ("timestamp", "level", "logger", "message")
+
+
+def parse_json_line(line: str) -> Optional[dict]:
+    """解析JSON格式（LOG_FORMAT=json）的日志行，附加字段放在 fields 中"""
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or not all(key in data for key in JSON_BASE_KEYS):
+        return None
+    return {
+        "timestamp": data["timestamp"],
+        "level": data["level"],
+        "logger": data["logger"],
+        "message": data["message"],
+        "fields": {key: value for key, value in data.items() if key not in JSON_BASE_KEYS},
+        "raw": line,
+    }
+
+
 def parse_log_line(line: str) -> Optional[dict]:
-    """解析日志行"""
-    pattern = re.compile(
-        r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] (\w+) \[([^\]]+)\] (.+)'
-    )
-    match = pattern.match(line.strip())
+    """解析日志行（文本格式或JSON格式）"""
+    line = line.strip()
+    if line.startswith("{"):
+        return parse_json_line(line)
+    match = LOG_LINE_PATTERN.match(line)
     if match:
         timestamp, level, logger, message = match.groups()
         return {
@@ -66,7 +93,8 @@ def parse_log_line(line: str) -> Optional[dict]:
             "level": level,
             "logger": logger,
             "message": message,
-            "raw": line.strip()
+            "fields": {},
+            "raw": line
         }
     return None
 
@@ -88,6 +116,15 @@ def colorize_level(level: str, use_color: bool = True) -> str:
     return f"{color}{level}{Colors.RESET}"
 
 
+def format_entry(entry: dict, use_color: bool = True, show_fields: bool = False) -> str:
+    """格式化一条日志用于显示；show_fields 时附加JSON日志的附加字段"""
+    colored_level = colorize_level(entry["level"], use_color)
+    text = f"[{entry['timestamp']}] {colored_level} [{entry['logger']}] {entry['message']}"
+    if show_fields and entry["fields"]:
+        text += " " + " ".join(f"{key}={value}" for key, value in entry["fields"].items())
+    return text
+
+
 def should_show(entry: dict, level: Optional[str] = None,
                 engine: Optional[str] = None, search: Optional[str] = None) -> bool:
     """判断是否应该显示该日志条目"""
@@ -105,7 +142,8 @@ def should_show(entry: dict, level: Optional[str] = None,
 
 def tail_logs(log_file: Path, lines: int = 0, follow: bool = True,
               level: Optional[str] = None, engine: Optional[str] = None,
-              search: Optional[str] = None, use_color: bool = True):
+              search: Optional[str] = None, use_color: bool = True,
+              show_fields: bool = False):
     """实时查看日志"""
     if not log_file.exists():
         print(f"错误: 日志文件不存在: {log_file}")
@@ -123,8 +161,7 @@ def tail_logs(log_file: Path, lines: int = 0, follow: bool = True,
                 for line in recent_lines:
                     entry = parse_log_line(line)
                     if entry and should_show(entry, level, engine, search):
-                        colored_level = colorize_level(entry["level"], use_color)
-                        print(f"[{entry['timestamp']}] {colored_level} [{entry['logger']}] {entry['message']}")
+                        print(format_entry(entry, use_color, show_fields))
         except Exception as e:
             print(f"读取日志文件时出错: {e}")
             sys.exit(1)
@@ -146,8 +183,7 @@ def tail_logs(log_file: Path, lines: int = 0, follow: bool = True,
                     if line:
                         entry = parse_log_line(line)
                         if entry and should_show(entry, level, engine, search):
-                            colored_level = colorize_level(entry["level"], use_color)
-                            print(f"[{entry['timestamp']}] {colored_level} [{entry['logger']}] {entry['message']}")
+                            print(format_entry(entry, use_color, show_fields))
                     else:
                         time.sleep(0.1)  # 短暂休眠避免CPU占用过高
         except KeyboardInterrupt:
@@ -171,6 +207,7 @@ def main():
   %(prog)s --lines 50               # 先显示最近50行，然后实时监控
   %(prog)s --no-follow --lines 100  # 只显示最近100行，不实时监控
   %(prog)s --no-color               # 禁用颜色输出
+  %(prog)s --fields                 # 显示JSON日志的附加字段
         """
     )
     
@@ -209,6 +246,12 @@ def main():
         help="禁用颜色输出"
     )
     
+    parser.add_argument(
+        "--fields",
+        action="store_true",
+        help="显示附加字段（processing_time、text_count等，仅JSON格式日志）"
+    )
+    
     parser.add_argument(
         "--log-file",
         help=f"指定日志文件路径（默认: {LOG_FILE}）"
@@ -230,7 +273,8 @@ def main():
         level=args.level,
         engine=args.engine,
         search=args.search,
-        use_color=use_color
+        use_color=use_color,
+        show_fields=args.fields
     )
 
 
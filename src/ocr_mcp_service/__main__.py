@@ -20,22 +20,20 @@ logger = get_logger("main")
 # Import tools to register them with MCP server
 from . import tools  # noqa: F401
 
-# Preload engines if configured
-for engine_type in config.PRELOAD_ENGINES:
-    try:
-        from .ocr_engine import OCREngineFactory
-        OCREngineFactory.get_engine(engine_type)
-        logger.info(f"预加载引擎成功: {engine_type}")
-    except Exception as e:
-        logger.warning(f"预加载引擎失败: {engine_type}, 错误: {e}", exc_info=True)
-        # Ignore preload errors, engines will be loaded on demand
-
 
 def main():
     """Run the MCP server with error handling and recovery."""
     try:
         logger.info("MCP服务器启动中...")
-    mcp.run()
+        from .concurrency import check_worker_capacity
+        check_worker_capacity()
+        # Preload in the background so the MCP handshake is not delayed;
+        # failed engines are loaded on demand
+        from .preload import start_preload
+        start_preload(config.PRELOAD_ENGINES)
+        from .metrics import start_prometheus_writer
+        start_prometheus_writer(config.METRICS_PROMETHEUS_FILE, config.METRICS_PROMETHEUS_INTERVAL)
+        mcp.run()
     except KeyboardInterrupt:
         logger.info("收到中断信号，正在优雅关闭服务器...")
         sys.exit(0)
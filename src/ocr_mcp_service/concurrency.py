@@ -0,0 +1,318 @@
+"""Run blocking OCR work off the event loop, with per-engine concurrency limits
+and admission control."""
+
+import asyncio
+import contextvars
+import functools
+import math
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+
+from .logger import get_logger
+from .metrics import get_metrics_registry
+from .config import (
+    ENGINE_TYPES,
+    OCR_MAX_WORKERS_PER_KEY,
+    OCR_REQUEST_WORKERS,
+    OCR_QUEUE_MAX_WAIT,
+    OCR_SERVICE_TIME_ESTIMATE,
+    get_max_concurrency,
+    get_queue_max,
+)
+
+T = TypeVar("T")
+
+# Weight of the newest run in the service time moving average
+_EWMA_ALPHA = 0.2
+
+
+class OverloadedError(RuntimeError):
+    """Raised when a request is refused because an engine's queue is full or too slow.
+
+    Attributes:
+        engine_type: Engine that is overloaded
+        reason: 'queue_full', 'wait_too_long' or 'wait_timeout'
+        retry_after: Suggested delay before retrying, in seconds
+        queue_depth: Requests waiting for the engine when refused
+        estimated_wait: Expected wait for a slot, in seconds
+    """
+
+    def __init__(
+        self, engine_type: str, reason: str, retry_after: int, queue_depth: int, estimated_wait: float
+    ):
+        self.engine_type = engine_type
+        self.reason = reason
+        self.retry_after = retry_after
+        self.queue_depth = queue_depth
+        self.estimated_wait = estimated_wait
+        super().__init__(
+            f"引擎 {engine_type} 过载（{reason}）：排队 {queue_depth} 个请求，"
+            f"预计等待 {estimated_wait:.1f} 秒，请在 {retry_after} 秒后重试"
+        )
+
+_request_executor: Optional[ThreadPoolExecutor] = None
+_request_executor_lock = threading.Lock()
+
+
+def _get_request_executor() -> ThreadPoolExecutor:
+    """Get the executor for blocking OCR requests, creating it on first use."""
+    global _request_executor
+    if _request_executor is None:
+        with _request_executor_lock:
+            if _request_executor is None:
+                _request_executor = ThreadPoolExecutor(
+                    max_workers=max(1, OCR_REQUEST_WORKERS),
+                    thread_name_prefix="OCRRequest",
+                )
+    return _request_executor
+
+
+class EngineLimiter:
+    """Caps in-flight OCR requests per engine and decides which requests to admit.
+
+    Requests over the limit wait on an asyncio semaphore, so waiting costs no
+    thread and the event loop stays free for control-plane tools. A slot is
+    held until the blocking call has actually finished, even if the awaiting
+    request is cancelled.
+
+    Admission control keeps a burst from turning into a queue of requests
+    that will all time out: each engine's queue is bounded, and a request is
+    refused up front when the work ahead of it (queued and in-flight
+    requests times a moving average of the measured service time) would
+    exceed the maximum wait. Refusals raise OverloadedError with a
+    retry-after hint.
+    """
+
+    def __init__(
+        self,
+        limit_for: Callable[[str], int] = get_max_concurrency,
+        queue_max_for: Callable[[str], int] = get_queue_max,
+        max_wait: float = OCR_QUEUE_MAX_WAIT,
+        initial_service_time: float = OCR_SERVICE_TIME_ESTIMATE,
+    ):
+        """Initialize the limiter.
+
+        Args:
+            limit_for: Returns the concurrency limit for an engine type
+            queue_max_for: Returns the queue bound for an engine type (0 = unbounded)
+            max_wait: Maximum expected or actual wait for a slot in seconds (0 = no limit)
+            initial_service_time: Service time estimate before any run is measured
+        """
+        self._limit_for = limit_for
+        self._queue_max_for = queue_max_for
+        self._max_wait = max_wait
+        self._initial_service_time = initial_service_time
+        self._lock = threading.Lock()
+        # Semaphores are bound to an event loop, so keep one set per loop
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._limits: Dict[str, int] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._waiting: Dict[str, int] = {}
+        self._completed: Dict[str, int] = {}
+        self._service_time: Dict[str, float] = {}
+        self._rejected: Dict[str, Dict[str, int]] = {}
+
+    def _limit(self, engine_type: str) -> int:
+        # Caller holds self._lock
+        if engine_type not in self._limits:
+            self._limits[engine_type] = max(1, self._limit_for(engine_type))
+        return self._limits[engine_type]
+
+    def _semaphore(self, engine_type: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            per_loop = self._semaphores.setdefault(loop, {})
+            if engine_type not in per_loop:
+                per_loop[engine_type] = asyncio.Semaphore(self._limit(engine_type))
+            return per_loop[engine_type]
+
+    def _add(self, counter: Dict[str, int], engine_type: str, delta: int):
+        with self._lock:
+            counter[engine_type] = counter.get(engine_type, 0) + delta
+
+    def _estimate_wait(self, engine_type: str) -> float:
+        """Expected wait for a slot for a request arriving now. Caller holds self._lock."""
+        limit = self._limit(engine_type)
+        ahead = self._waiting.get(engine_type, 0) + self._in_flight.get(engine_type, 0) - limit + 1
+        if ahead <= 0:
+            return 0.0
+        service_time = self._service_time.get(engine_type, self._initial_service_time)
+        return ahead * service_time / limit
+
+    def get_limit(self, engine_type: str) -> int:
+        """Concurrency limit for an engine type."""
+        with self._lock:
+            return self._limit(engine_type)
+
+    def estimate_wait(self, engine_type: str) -> float:
+        """Expected wait in seconds before a new request for the engine gets a slot."""
+        with self._lock:
+            return self._estimate_wait(engine_type)
+
+    def _reject(self, engine_type: str, reason: str, estimated_wait: Optional[float] = None):
+        with self._lock:
+            counts = self._rejected.setdefault(engine_type, {})
+            counts[reason] = counts.get(reason, 0) + 1
+            if estimated_wait is None:
+                estimated_wait = self._estimate_wait(engine_type)
+            queue_depth = self._waiting.get(engine_type, 0)
+            # Roughly when the work queued now will have drained
+            service_time = self._service_time.get(engine_type, self._initial_service_time)
+            drain = (queue_depth + 1) * service_time / self._limit(engine_type)
+        retry_after = max(1, math.ceil(max(estimated_wait, drain)))
+        get_logger("concurrency").warning(
+            f"拒绝OCR请求: 引擎 {engine_type} 过载（{reason}），排队 {queue_depth}，"
+            f"预计等待 {estimated_wait:.1f} 秒，建议 {retry_after} 秒后重试"
+        )
+        raise OverloadedError(engine_type, reason, retry_after, queue_depth, estimated_wait)
+
+    def _admit(self, engine_type: str):
+        """Refuse the request up front if the queue is full or the wait would be too long."""
+        queue_max = self._queue_max_for(engine_type)
+        with self._lock:
+            queue_depth = self._waiting.get(engine_type, 0)
+            estimated_wait = self._estimate_wait(engine_type)
+        if queue_max and queue_depth >= queue_max:
+            self._reject(engine_type, "queue_full", estimated_wait)
+        if self._max_wait and estimated_wait > self._max_wait:
+            self._reject(engine_type, "wait_too_long", estimated_wait)
+
+    def _release(
+        self, engine_type: str, semaphore: asyncio.Semaphore, started: float, future: asyncio.Future
+    ):
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self._in_flight[engine_type] = self._in_flight.get(engine_type, 0) - 1
+            self._completed[engine_type] = self._completed.get(engine_type, 0) + 1
+            previous = self._service_time.get(engine_type)
+            self._service_time[engine_type] = (
+                elapsed if previous is None else _EWMA_ALPHA * elapsed + (1 - _EWMA_ALPHA) * previous
+            )
+        semaphore.release()
+
+    async def run(self, engine_type: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking function on the request executor once the engine has a free slot.
+
+        Context variables of the caller are visible inside ``func``.
+
+        Args:
+            engine_type: Engine the work is counted against
+            func: Blocking function to run
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Whatever func returns (its exceptions propagate)
+
+        Raises:
+            OverloadedError: If the request is not admitted or waits too long for a slot
+        """
+        semaphore = self._semaphore(engine_type)
+        self._admit(engine_type)
+        self._add(self._waiting, engine_type, 1)
+        queued = time.monotonic()
+        try:
+            if self._max_wait:
+                await asyncio.wait_for(semaphore.acquire(), timeout=self._max_wait)
+            else:
+                await semaphore.acquire()
+        except asyncio.TimeoutError:
+            self._add(self._waiting, engine_type, -1)
+            self._reject(engine_type, "wait_timeout")
+        except BaseException:
+            self._add(self._waiting, engine_type, -1)
+            raise
+        else:
+            self._add(self._waiting, engine_type, -1)
+        get_metrics_registry().observe_queue_wait(engine_type, time.monotonic() - queued)
+
+        self._add(self._in_flight, engine_type, 1)
+        try:
+            context = contextvars.copy_context()
+            future = asyncio.get_running_loop().run_in_executor(
+                _get_request_executor(), functools.partial(context.run, func, *args, **kwargs)
+            )
+        except BaseException:
+            self._add(self._in_flight, engine_type, -1)
+            semaphore.release()
+            raise
+        future.add_done_callback(
+            functools.partial(self._release, engine_type, semaphore, time.monotonic())
+        )
+        # Shield: a cancelled request must not free the slot while its thread still runs
+        return await asyncio.shield(future)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-engine limits, queue depth, in-flight, completed and rejection counts."""
+        with self._lock:
+            engines = set(self._limits) | set(self._in_flight) | set(self._waiting) | set(self._rejected)
+            return {
+                engine: {
+                    "limit": self._limit(engine),
+                    "in_flight": self._in_flight.get(engine, 0),
+                    "queue_depth": self._waiting.get(engine, 0),
+                    "queue_max": self._queue_max_for(engine),
+                    "completed": self._completed.get(engine, 0),
+                    "rejected": dict(self._rejected.get(engine, {})),
+                    "avg_service_time": round(
+                        self._service_time.get(engine, self._initial_service_time), 3
+                    ),
+                    "estimated_wait": round(self._estimate_wait(engine), 3),
+                }
+                for engine in sorted(engines)
+            }
+
+
+_limiter: Optional[EngineLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_engine_limiter() -> EngineLimiter:
+    """Get the process-wide engine limiter."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = EngineLimiter()
+                get_logger("concurrency").info(
+                    f"OCR请求执行器: {max(1, OCR_REQUEST_WORKERS)} 个线程，按引擎限制并发"
+                )
+    return _limiter
+
+
+async def run_ocr(engine_type: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run blocking OCR work for an engine without blocking the event loop."""
+    return await get_engine_limiter().run(engine_type, func, *args, **kwargs)
+
+
+def check_worker_capacity(
+    engine_types: Iterable[str] = ENGINE_TYPES, limiter: Optional[EngineLimiter] = None
+) -> List[str]:
+    """Check that every admitted request can start on a timeout worker right away.
+
+    Each engine key may hold OCR_MAX_WORKERS_PER_KEY threads of the shared
+    timeout executor. An engine whose concurrency limit is larger admits
+    requests that then queue for a worker; they are logged here so the
+    limits can be lowered or OCR_MAX_WORKERS_PER_KEY raised.
+
+    Args:
+        engine_types: Engines to check (default: all)
+        limiter: Limiter whose limits are checked (default: the process-wide one)
+
+    Returns:
+        Engines whose concurrency limit exceeds OCR_MAX_WORKERS_PER_KEY
+    """
+    limiter = limiter or get_engine_limiter()
+    mismatched = []
+    for engine_type in engine_types:
+        limit = limiter.get_limit(engine_type)
+        if limit > OCR_MAX_WORKERS_PER_KEY:
+            mismatched.append(engine_type)
+            get_logger("concurrency").warning(
+                f"引擎 {engine_type} 的并发上限 {limit} 超过单引擎执行线程数 OCR_MAX_WORKERS_PER_KEY={OCR_MAX_WORKERS_PER_KEY}，"
+                f"超出的请求将等待执行线程；请调低 OCR_MAX_CONCURRENCY/ENGINE_POOL_SIZE 或调高 OCR_MAX_WORKERS_PER_KEY"
+            )
+    return mismatched
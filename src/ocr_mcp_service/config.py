@@ -15,13 +15,9 @@ PADDLEOCR_LANG: str = get_env("PADDLEOCR_LANG", "ch")
 
 # DeepSeek OCR configuration
 DEEPSEEK_MODEL_NAME: str = get_env("DEEPSEEK_MODEL_NAME", "deepseek-ai/deepseek-ocr")
-# Default to CUDA if available, otherwise CPU
-try:
-    import torch
-    DEEPSEEK_DEVICE: str = get_env("DEEPSEEK_DEVICE", "cuda" if torch.cuda.is_available() else "cpu")
-except ImportError:
-    # torch not installed, default to CPU
-    DEEPSEEK_DEVICE: str = get_env("DEEPSEEK_DEVICE", "cpu")
+# "auto" uses CUDA if available, otherwise CPU. Resolved by resolve_deepseek_device()
+# when the engine is built, so importing the config never imports torch.
+DEEPSEEK_DEVICE: str = get_env("DEEPSEEK_DEVICE", "auto")
 # Hugging Face mirror for faster download in China
 HF_ENDPOINT: Optional[str] = get_env("HF_ENDPOINT")  # e.g., "https://hf-mirror.com"
 HF_MIRROR: Optional[str] = get_env("HF_MIRROR")  # Alternative mirror setting
@@ -32,17 +28,182 @@ PRELOAD_ENGINES: list[str] = [
     for engine in get_env("PRELOAD_ENGINES", "").split(",")
     if engine.strip()
 ]
+# Preloading runs in background threads after the server starts; each engine
+# then runs one warm-up recognition on a synthetic image
+PRELOAD_WARMUP: bool = get_env("PRELOAD_WARMUP", "true").lower() in ("1", "true", "yes")
+
+# Engine types the service provides
+ENGINE_TYPES = ("paddleocr", "paddleocr_mcp", "easyocr", "deepseek")
+
+# Engine replica pool configuration
+# Number of replicas per engine key; override per engine with ENGINE_POOL_SIZE_<ENGINE>,
+# e.g. ENGINE_POOL_SIZE_PADDLEOCR=4, ENGINE_POOL_SIZE_DEEPSEEK=1
+ENGINE_POOL_SIZE: int = int(get_env("ENGINE_POOL_SIZE", "1"))
+# Maximum time to wait for a free replica (in seconds)
+ENGINE_POOL_TIMEOUT: float = float(get_env("ENGINE_POOL_TIMEOUT", "60"))
+
+
+def get_pool_size(engine_type: str) -> int:
+    """获取引擎的副本池大小。
+
+    Args:
+        engine_type: 引擎类型（如 'paddleocr'）
+
+    Returns:
+        副本数量（至少为1）
+    """
+    size = get_env(f"ENGINE_POOL_SIZE_{engine_type.upper()}")
+    try:
+        return max(1, int(size)) if size else max(1, ENGINE_POOL_SIZE)
+    except ValueError:
+        return max(1, ENGINE_POOL_SIZE)
+
+
+# Engine lifecycle: unload engines idle for longer than this many seconds (0 disables);
+# override per engine with ENGINE_IDLE_TTL_<ENGINE>, e.g. ENGINE_IDLE_TTL_DEEPSEEK=300
+ENGINE_IDLE_TTL: float = float(get_env("ENGINE_IDLE_TTL", "0"))
+# Memory budget for all resident engines in MB (0 disables); least recently used
+# engines are unloaded when the measured footprint exceeds it
+ENGINE_MEMORY_BUDGET_MB: float = float(get_env("ENGINE_MEMORY_BUDGET_MB", "0"))
+# How often the background reaper checks idle TTLs and the memory budget (in seconds)
+ENGINE_REAPER_INTERVAL: float = float(get_env("ENGINE_REAPER_INTERVAL", "30"))
+
+
+def get_idle_ttl(engine_type: str) -> float:
+    """获取引擎的空闲卸载时间。
+
+    Args:
+        engine_type: 引擎类型（如 'deepseek'）
+
+    Returns:
+        空闲秒数，0表示不卸载
+    """
+    ttl = get_env(f"ENGINE_IDLE_TTL_{engine_type.upper()}")
+    try:
+        return max(0.0, float(ttl)) if ttl else max(0.0, ENGINE_IDLE_TTL)
+    except ValueError:
+        return max(0.0, ENGINE_IDLE_TTL)
+
+
+# Engine backend: "inprocess" runs inference in the server process,
+# "process" runs each engine replica in a dedicated worker process that is
+# killed and respawned when a request times out
+ENGINE_BACKEND: str = get_env("ENGINE_BACKEND", "inprocess").lower()
+# Maximum time to wait for a worker process to load its engine (in seconds)
+ENGINE_WORKER_START_TIMEOUT: float = float(get_env("ENGINE_WORKER_START_TIMEOUT", "600"))
+
+# Default number of images per native batch call in OCREngine.recognize_images()
+OCR_BATCH_SIZE: int = int(get_env("OCR_BATCH_SIZE", "8"))
+# Maximum number of images accepted by one recognize_images_batch call
+OCR_BATCH_MAX_IMAGES: int = int(get_env("OCR_BATCH_MAX_IMAGES", "200"))
+
+# Downscale oversized images before recognition (0 disables each limit);
+# boxes are mapped back to original coordinates. Tools can override per call.
+OCR_MAX_SIDE: int = int(get_env("OCR_MAX_SIDE", "0"))  # e.g. 2560
+OCR_MAX_PIXELS: int = int(get_env("OCR_MAX_PIXELS", "0"))  # e.g. 6000000
+# Use JPEG draft mode so large JPEGs are decoded directly at reduced size
+OCR_JPEG_DRAFT: bool = get_env("OCR_JPEG_DRAFT", "true").lower() in ("1", "true", "yes")
+
+# Progress reporting: engine updates closer together than this many seconds are
+# coalesced (the final one is always sent); 0 sends every update
+OCR_PROGRESS_MIN_INTERVAL: float = float(get_env("OCR_PROGRESS_MIN_INTERVAL", "0.5"))
+# Keep each run's progress updates for the progress_history response field
+OCR_PROGRESS_HISTORY: bool = get_env("OCR_PROGRESS_HISTORY", "true").lower() in ("1", "true", "yes")
+
+# Partial results: recognized lines are sent to the client as MCP progress
+# notifications in chunks of this many lines (when the request has a progress token)
+OCR_STREAM_CHUNK_LINES: int = int(get_env("OCR_STREAM_CHUNK_LINES", "20"))
+
+# Multi-page documents (PDF, multi-frame TIFF): PDF pages are rasterized at this DPI
+OCR_PDF_DPI: int = int(get_env("OCR_PDF_DPI", "200"))
+
+# Tiled recognition for very large images (tools' ``tiled`` parameter)
+OCR_TILE_SIZE: int = int(get_env("OCR_TILE_SIZE", "1600"))  # Maximum tile side in pixels
+OCR_TILE_OVERLAP: int = int(get_env("OCR_TILE_OVERLAP", "200"))  # Should exceed a text line height
+OCR_TILE_WORKERS: int = int(get_env("OCR_TILE_WORKERS", "4"))  # Also bounded by the engine pool size
+# Boxes from neighbouring tiles with at least this IoU are treated as duplicates
+OCR_TILE_IOU_THRESHOLD: float = float(get_env("OCR_TILE_IOU_THRESHOLD", "0.5"))
+
+# OCR result cache, keyed by image content hash + engine + parameters
+OCR_CACHE_ENABLED: bool = get_env("OCR_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+# Maximum number of results kept in memory (LRU)
+OCR_CACHE_MAX_ENTRIES: int = int(get_env("OCR_CACHE_MAX_ENTRIES", "256"))
+# Directory for the persistent disk tier (empty disables it), e.g. ".cache/ocr_results"
+OCR_CACHE_DIR: Optional[str] = get_env("OCR_CACHE_DIR")
+# Maximum number of results kept on disk (least recently used are removed)
+OCR_CACHE_DISK_MAX_ENTRIES: int = int(get_env("OCR_CACHE_DISK_MAX_ENTRIES", "10000"))
 
 # Logging configuration
 LOG_LEVEL: str = get_env("LOG_LEVEL", "INFO")
 LOG_FILE: str = get_env("LOG_FILE", "logs/ocr_service.log")
 LOG_MAX_BYTES: int = int(get_env("LOG_MAX_BYTES", "10485760"))  # 10MB
 LOG_BACKUP_COUNT: int = int(get_env("LOG_BACKUP_COUNT", "5"))
+# File log format: "text" (human-readable) or "json" (one JSON object per line,
+# extra fields such as processing_time and text_count kept as typed values)
+LOG_FORMAT: str = get_env("LOG_FORMAT", "text")
+# Bounded queue between loggers and the handler thread; records are dropped
+# (and counted) when it is full. 0 runs handlers synchronously in the caller.
+LOG_QUEUE_SIZE: int = int(get_env("LOG_QUEUE_SIZE", "10000"))
+
+# Metrics: write request metrics as a Prometheus text file (for the node exporter
+# textfile collector) every METRICS_PROMETHEUS_INTERVAL seconds; unset = disabled
+METRICS_PROMETHEUS_FILE: Optional[str] = get_env("METRICS_PROMETHEUS_FILE") or None
+METRICS_PROMETHEUS_INTERVAL: float = float(get_env("METRICS_PROMETHEUS_INTERVAL", "15"))
 
 # Timeout configuration (in seconds)
 # Base timeout - can be overridden based on image size
 OCR_TIMEOUT: int = int(get_env("OCR_TIMEOUT", "120"))  # Default 120 seconds (2 minutes)
 
+# Threads shared by all timeout-protected OCR runs
+OCR_MAX_WORKERS: int = int(get_env("OCR_MAX_WORKERS", "8"))
+# Threads one engine key may hold at once, abandoned runs included; should be at
+# least each engine's concurrency limit (checked at startup)
+OCR_MAX_WORKERS_PER_KEY: int = int(get_env("OCR_MAX_WORKERS_PER_KEY", "4"))
+# Refuse new work for an engine once this many timed-out runs are still executing
+OCR_MAX_ZOMBIE_RUNS: int = int(get_env("OCR_MAX_ZOMBIE_RUNS", "2"))
+
+# Async tools: threads that run blocking OCR requests off the event loop
+OCR_REQUEST_WORKERS: int = int(get_env("OCR_REQUEST_WORKERS", "8"))
+# Maximum in-flight OCR requests per engine; override per engine with
+# OCR_MAX_CONCURRENCY_<ENGINE>. 0 = the engine's replica pool size
+OCR_MAX_CONCURRENCY: int = int(get_env("OCR_MAX_CONCURRENCY", "0"))
+
+
+def get_max_concurrency(engine_type: str) -> int:
+    """获取引擎允许同时处理的OCR请求数。
+
+    Args:
+        engine_type: 引擎类型
+
+    Returns:
+        并发上限（未配置时等于副本池大小）
+    """
+    value = get_env(f"OCR_MAX_CONCURRENCY_{engine_type.upper()}")
+    try:
+        limit = int(value) if value else OCR_MAX_CONCURRENCY
+    except ValueError:
+        limit = OCR_MAX_CONCURRENCY
+    return limit if limit > 0 else get_pool_size(engine_type)
+
+
+# Admission control: requests beyond this many queued per engine are rejected
+# immediately (override per engine with OCR_QUEUE_MAX_<ENGINE>; 0 = unbounded)
+OCR_QUEUE_MAX: int = int(get_env("OCR_QUEUE_MAX", "16"))
+# Reject requests expected to wait longer than this for a slot, and give up
+# waiting after this long (in seconds; 0 = no limit)
+OCR_QUEUE_MAX_WAIT: float = float(get_env("OCR_QUEUE_MAX_WAIT", "30"))
+# Initial per-request service time estimate until real runs are measured (in seconds)
+OCR_SERVICE_TIME_ESTIMATE: float = float(get_env("OCR_SERVICE_TIME_ESTIMATE", "5"))
+
+
+def get_queue_max(engine_type: str) -> int:
+    """获取引擎排队请求数上限（0表示不限制）。"""
+    value = get_env(f"OCR_QUEUE_MAX_{engine_type.upper()}")
+    try:
+        return max(0, int(value)) if value else max(0, OCR_QUEUE_MAX)
+    except ValueError:
+        return max(0, OCR_QUEUE_MAX)
+
 # Dynamic timeout thresholds (in bytes)
 SMALL_IMAGE_SIZE: int = 1024 * 1024  # 1MB
 MEDIUM_IMAGE_SIZE: int = 5 * 1024 * 1024  # 5MB
@@ -76,5 +237,22 @@ def get_timeout_for_image(image_path: str) -> int:
         return OCR_TIMEOUT
 
 
+def resolve_deepseek_device(device: Optional[str] = None) -> str:
+    """解析DeepSeek OCR使用的设备。
+
+    会导入torch，因此只在创建DeepSeek引擎时调用；请求CUDA但不可用时回退到CPU。
 
+    Args:
+        device: 'auto'、'cuda' 或 'cpu'（默认: DEEPSEEK_DEVICE）
 
+    Returns:
+        'cuda' 或 'cpu'
+    """
+    device = (device or DEEPSEEK_DEVICE).lower()
+    if device == "cpu":
+        return "cpu"
+    try:
+        import torch
+    except ImportError:
+        return "cpu"
+    return "cuda" if torch.cuda.is_available() else "cpu"
@@ -0,0 +1,284 @@
+"""Multi-page document input: PDF and multi-frame TIFF, one page at a time."""
+
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+from PIL import Image
+
+from .image_input import LoadedImage, compute_scale
+from .models import DocumentResult, OCRResult, PageResult
+from .utils import validate_image_path
+from .logger import get_logger, log_progress
+from .streaming import get_progress_stream
+from .config import OCR_PDF_DPI
+
+_PDF_MAGIC = b"%PDF-"
+
+
+def _is_pdf(path: Path) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(_PDF_MAGIC)) == _PDF_MAGIC
+    except OSError:
+        return False
+
+
+def _import_pdfium():
+    try:
+        import pypdfium2
+    except ImportError:
+        raise ImportError(
+            "PDF input requires pypdfium2. Install with: pip install -e '.[pdf]'"
+        )
+    return pypdfium2
+
+
+def is_multipage_document(path: str) -> bool:
+    """Whether a file is a PDF or a TIFF with more than one frame.
+
+    Single-frame TIFFs and unreadable files are not documents; they take the
+    regular image path, which reports any error.
+    """
+    path = Path(path)
+    if not path.is_file():
+        return False
+    if _is_pdf(path):
+        return True
+    try:
+        with Image.open(path) as img:
+            return img.format == "TIFF" and getattr(img, "n_frames", 1) > 1
+    except Exception:
+        return False
+
+
+def count_pages(path: str) -> int:
+    """Number of pages of a PDF or frames of a TIFF."""
+    path = validate_image_path(path)
+    if _is_pdf(path):
+        pdf = _import_pdfium().PdfDocument(str(path))
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    try:
+        with Image.open(path) as img:
+            return getattr(img, "n_frames", 1)
+    except Exception:
+        raise ValueError(f"Invalid document file: {path}")
+
+
+def parse_page_range(spec: Optional[str], page_count: int) -> List[int]:
+    """Parse a page range such as ``"1-3,5,8-"`` into 1-based page numbers.
+
+    Open ranges run to the first/last page; pages past the end are ignored.
+
+    Args:
+        spec: Comma-separated pages and ranges (None or empty = all pages)
+        page_count: Number of pages in the document
+
+    Returns:
+        Sorted, de-duplicated page numbers
+
+    Raises:
+        ValueError: If the spec is malformed or selects no existing page
+    """
+    if spec is None or not str(spec).strip():
+        return list(range(1, page_count + 1))
+
+    selected = set()
+    for part in str(spec).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                start, end = part.split("-", 1)
+                first = int(start) if start.strip() else 1
+                last = int(end) if end.strip() else page_count
+            else:
+                first = last = int(part)
+        except ValueError:
+            raise ValueError(f"无效的页码范围: {spec}")
+        if first < 1 or last < first:
+            raise ValueError(f"无效的页码范围: {spec}")
+        selected.update(range(first, min(last, page_count) + 1))
+
+    if not selected:
+        raise ValueError(f"页码范围 {spec} 超出文档页数（共 {page_count} 页）")
+    return sorted(selected)
+
+
+def _iter_pdf_pages(
+    path: str, page_numbers: Optional[List[int]], dpi: int, max_side: int, max_pixels: int
+) -> Iterator[LoadedImage]:
+    pdfium = _import_pdfium()
+    pdf = pdfium.PdfDocument(path)
+    # pdfium is not thread-safe; a timed-out page may still be rendering
+    lock = threading.Lock()
+    try:
+        numbers = page_numbers or list(range(1, len(pdf) + 1))
+        for number in numbers:
+            with lock:
+                page = pdf[number - 1]
+                width_pt, height_pt = page.get_size()
+                page.close()
+            full = (max(1, round(width_pt * dpi / 72)), max(1, round(height_pt * dpi / 72)))
+            scale = compute_scale(full[0], full[1], max_side, max_pixels)
+            target = (max(1, round(full[0] * scale)), max(1, round(full[1] * scale)))
+
+            def render(size, number=number):
+                with lock:
+                    page = pdf[number - 1]
+                    try:
+                        # Render straight at the target size instead of downscaling later
+                        w_pt, h_pt = page.get_size()
+                        return page.render(scale=min(size[0] / w_pt, size[1] / h_pt)).to_pil()
+                    finally:
+                        page.close()
+
+            yield LoadedImage.lazy(render, full, target, path=path, format="PDF", page=number)
+    finally:
+        with lock:
+            pdf.close()
+
+
+def _iter_tiff_frames(
+    path: str, page_numbers: Optional[List[int]], max_side: int, max_pixels: int
+) -> Iterator[LoadedImage]:
+    with Image.open(path) as img:
+        numbers = page_numbers or list(range(1, getattr(img, "n_frames", 1) + 1))
+        sizes = {}
+        for number in numbers:
+            img.seek(number - 1)
+            sizes[number] = img.size
+
+    for number in numbers:
+        full = sizes[number]
+        scale = compute_scale(full[0], full[1], max_side, max_pixels)
+        target = (max(1, round(full[0] * scale)), max(1, round(full[1] * scale)))
+
+        def decode(size, number=number):
+            # Each frame reopens the file, so pages do not share decoder state
+            with Image.open(path) as frames:
+                frames.seek(number - 1)
+                return frames.convert("RGB")
+
+        yield LoadedImage.lazy(decode, full, target, path=path, format="TIFF", page=number)
+
+
+def iter_pages(
+    path: str,
+    page_numbers: Optional[List[int]] = None,
+    dpi: int = OCR_PDF_DPI,
+    max_side: int = 0,
+    max_pixels: int = 0,
+) -> Iterator[LoadedImage]:
+    """Yield the pages of a PDF or multi-frame TIFF one at a time.
+
+    Each page is a lazy LoadedImage: nothing is rasterized until its pixels
+    are accessed, and ``release()`` drops them again, so memory stays flat
+    regardless of the page count. PDF pages share the open document, so they
+    must be decoded before the generator is exhausted or closed.
+
+    Args:
+        path: Path to the PDF or TIFF file
+        page_numbers: 1-based pages to yield (None = all)
+        dpi: PDF rasterization resolution
+        max_side: Downscale limit for the longer side (0 = off)
+        max_pixels: Downscale limit for the pixel count (0 = off)
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ImportError: For PDFs when pypdfium2 is not installed
+    """
+    resolved = str(validate_image_path(path).resolve())
+    if _is_pdf(Path(resolved)):
+        return _iter_pdf_pages(resolved, page_numbers, dpi, max_side, max_pixels)
+    return _iter_tiff_frames(resolved, page_numbers, max_side, max_pixels)
+
+
+def recognize_document(
+    path: str,
+    recognize_page: Callable[[LoadedImage], OCRResult],
+    pages: Optional[str] = None,
+    dpi: int = OCR_PDF_DPI,
+    max_side: int = 0,
+    max_pixels: int = 0,
+    progress_callback: Optional[Callable[[PageResult, int, int], None]] = None,
+) -> DocumentResult:
+    """Recognize a PDF or multi-frame TIFF page by page.
+
+    Pages are rasterized, recognized and released one at a time. A failing
+    page is recorded in its PageResult and the remaining pages still run;
+    only when every page fails is the last error raised.
+
+    When the request has a progress stream, each page's progress is mapped
+    onto its share of the document and its text is streamed as it finishes.
+
+    Args:
+        path: Path to the document
+        recognize_page: Recognizes one page image
+        pages: Page range such as "1-3,5" (None = all pages)
+        dpi: PDF rasterization resolution
+        max_side: Downscale limit for the longer side (0 = off)
+        max_pixels: Downscale limit for the pixel count (0 = off)
+        progress_callback: Called as (page_result, done, total) after each page
+
+    Returns:
+        DocumentResult with one PageResult per selected page
+    """
+    logger = get_logger("document_input")
+    start_time = time.time()
+    page_count = count_pages(path)
+    page_numbers = parse_page_range(pages, page_count)
+    total = len(page_numbers)
+    logger.info(f"开始识别文档: {path}, 共 {page_count} 页, 识别 {total} 页")
+
+    stream = get_progress_stream()
+    results: List[PageResult] = []
+    last_error: Optional[Exception] = None
+    for done, image in enumerate(
+        iter_pages(path, page_numbers, dpi=dpi, max_side=max_side, max_pixels=max_pixels), 1
+    ):
+        streamed = len(stream.chunks) if stream is not None else 0
+        try:
+            if stream is not None:
+                with stream.span((done - 1) / total * 100, done / total * 100):
+                    page_result = PageResult(page=image.page, result=recognize_page(image))
+            else:
+                page_result = PageResult(page=image.page, result=recognize_page(image))
+        except Exception as e:
+            last_error = e
+            logger.warning(f"第 {image.page} 页识别失败: {type(e).__name__}: {e}")
+            page_result = PageResult(page=image.page, error=str(e), error_type=type(e).__name__)
+        finally:
+            image.release()
+        results.append(page_result)
+        if stream is not None:
+            # Send each page's text once it is done, unless its tiles already streamed it
+            if page_result.ok and len(stream.chunks) == streamed and page_result.result.text:
+                stream.emit_text(page_result.result.text.split("\n"))
+            stream.report(done / total * 100, f"第 {image.page} 页完成 ({done}/{total})")
+        log_progress(
+            "document_input",
+            done / total * 100,
+            f"第 {image.page} 页完成 ({done}/{total})",
+            stage="页面识别",
+            page=image.page,
+        )
+        if progress_callback is not None:
+            progress_callback(page_result, done, total)
+
+    if last_error is not None and not any(r.ok for r in results):
+        raise last_error
+
+    failed = sum(1 for r in results if not r.ok)
+    logger.info(f"文档识别完成: {path}, 成功 {total - failed} 页, 失败 {failed} 页")
+    return DocumentResult(
+        document_path=str(Path(path).resolve()),
+        page_count=page_count,
+        pages=results,
+        processing_time=time.time() - start_time,
+    )
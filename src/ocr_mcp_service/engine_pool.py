@@ -0,0 +1,169 @@
+"""Engine replica pool for concurrent recognition."""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+
+from .logger import get_logger
+
+
+class PoolClosedError(RuntimeError):
+    """Raised when checking out from a pool whose engine was unloaded."""
+
+
+class EnginePool:
+    """Bounded pool of engine replicas with checkout/checkin semantics.
+
+    The underlying predictors are not re-entrant, so each replica is handed to
+    exactly one caller at a time. Replicas are created lazily, one at a time,
+    until ``max_size`` is reached; after that callers wait for a checkin.
+    """
+
+    def __init__(
+        self,
+        engine_key: str,
+        create_replica: Callable[[], object],
+        max_size: int = 1,
+        initial: Optional[object] = None,
+    ):
+        """Initialize engine pool.
+
+        Args:
+            engine_key: Engine key this pool serves (for logging and stats)
+            create_replica: Callable that constructs a new engine replica
+            max_size: Maximum number of replicas
+            initial: Already-loaded replica to seed the pool with
+        """
+        self.engine_key = engine_key
+        self.max_size = max(1, max_size)
+        self._create_replica = create_replica
+        self._cond = threading.Condition()
+        self._create_lock = threading.Lock()  # Load replicas one at a time
+        self._replicas: List[object] = []
+        self._idle: deque = deque()
+        self._in_use = 0
+        self._creating = 0
+        self._waiters = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_wait_time = 0.0
+        self._closed = False
+        self.logger = get_logger("EnginePool")
+
+        if initial is not None:
+            self._replicas.append(initial)
+            self._idle.append(initial)
+
+    def checkout(self, timeout: Optional[float] = None):
+        """Check out a replica, waiting up to ``timeout`` seconds.
+
+        Args:
+            timeout: Maximum wait in seconds (None waits forever)
+
+        Returns:
+            Engine replica; must be returned with checkin()
+
+        Raises:
+            TimeoutError: If no replica became available in time
+            PoolClosedError: If the pool was closed
+        """
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+
+        with self._cond:
+            self._waiters += 1
+            try:
+                while True:
+                    if self._closed:
+                        raise PoolClosedError(f"引擎已卸载: {self.engine_key}")
+                    if self._idle:
+                        engine = self._idle.pop()
+                        self._in_use += 1
+                        self._checkouts += 1
+                        self._total_wait_time += time.monotonic() - start
+                        return engine
+                    if len(self._replicas) + self._creating < self.max_size:
+                        self._creating += 1
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self._timeouts += 1
+                        raise TimeoutError(
+                            f"等待可用引擎超时（{self.engine_key}，超过 {timeout} 秒）"
+                        )
+                    self._cond.wait(remaining)
+            finally:
+                self._waiters -= 1
+
+        # Grow the pool outside the condition so checkins are not blocked
+        try:
+            with self._create_lock:
+                self.logger.info(
+                    f"创建引擎副本: {self.engine_key} "
+                    f"({len(self._replicas) + 1}/{self.max_size})"
+                )
+                engine = self._create_replica()
+        except Exception:
+            with self._cond:
+                self._creating -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._creating -= 1
+            self._replicas.append(engine)
+            self._in_use += 1
+            self._checkouts += 1
+            self._total_wait_time += time.monotonic() - start
+        return engine
+
+    def checkin(self, engine):
+        """Return a replica to the pool."""
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append(engine)
+            self._cond.notify()
+
+    def close_if_idle(self) -> Optional[List[object]]:
+        """Close the pool if no replica is checked out, being created or awaited.
+
+        Returns:
+            The released replicas, or None if the pool is busy
+        """
+        with self._cond:
+            if self._in_use or self._creating or self._waiters:
+                return None
+            self._closed = True
+            replicas = self._replicas
+            self._replicas = []
+            self._idle.clear()
+            self._cond.notify_all()
+            return replicas
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[object]:
+        """Context manager wrapping checkout()/checkin()."""
+        engine = self.checkout(timeout)
+        try:
+            yield engine
+        finally:
+            self.checkin(engine)
+
+    def get_stats(self) -> dict:
+        """Get pool statistics."""
+        with self._cond:
+            return {
+                "size": len(self._replicas),
+                "max_size": self.max_size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiters": self._waiters,
+                "creating": self._creating,
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "avg_wait_time": (
+                    self._total_wait_time / self._checkouts if self._checkouts else 0.0
+                ),
+            }
@@ -0,0 +1,247 @@
+"""Out-of-process engine workers with killable timeouts."""
+
+import builtins
+import multiprocessing
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+from .models import OCRResult
+from .ocr_engine import OCREngine
+from .logger import get_logger
+from .config import ENGINE_WORKER_START_TIMEOUT
+from .utils import get_process_rss
+
+
+def _rebuild_exception(type_name: str, message: str) -> Exception:
+    """Rebuild an exception raised in the worker process.
+
+    Built-in exception types (FileNotFoundError, ValueError, TimeoutError, ...)
+    are re-raised as-is so callers keep their error handling; anything else
+    becomes a RuntimeError carrying the original type name.
+    """
+    exc_cls = getattr(builtins, type_name, None)
+    if isinstance(exc_cls, type) and issubclass(exc_cls, Exception):
+        return exc_cls(message)
+    return RuntimeError(f"{type_name}: {message}")
+
+
+def _worker_main(conn, engine_type: str, engine_kwargs: dict, engine_factory: Optional[Callable]):
+    """Worker process entry point: load one engine and serve requests from the pipe."""
+    try:
+        if engine_factory is None:
+            from .ocr_engine import OCREngineFactory
+            engine = OCREngineFactory._create_local_engine(engine_type, **engine_kwargs)
+        else:
+            engine = engine_factory(engine_type, **engine_kwargs)
+    except Exception as e:
+        conn.send(("init_error", type(e).__name__, str(e)))
+        conn.close()
+        return
+
+    conn.send(("ready",))
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        if request is None:  # Shutdown request
+            break
+
+        image_path, kwargs = request
+        try:
+            conn.send(("ok", engine.recognize_image(image_path, **kwargs)))
+        except Exception as e:
+            conn.send(("error", type(e).__name__, str(e)))
+    conn.close()
+
+
+class EngineWorker:
+    """A worker process that owns one loaded engine.
+
+    Requests are sent over a pipe and handled one at a time. When a request
+    exceeds its timeout, or the process dies, the worker is killed; a fresh
+    process is spawned on the next request.
+    """
+
+    def __init__(
+        self,
+        engine_type: str,
+        engine_kwargs: Optional[dict] = None,
+        engine_factory: Optional[Callable] = None,
+        start_timeout: float = ENGINE_WORKER_START_TIMEOUT,
+    ):
+        """Start the worker process and wait for its engine to load.
+
+        Args:
+            engine_type: Type of engine to load in the worker
+            engine_kwargs: Engine initialization arguments
+            engine_factory: Picklable callable (engine_type, **kwargs) -> OCREngine
+                           used instead of the built-in engines (for testing)
+            start_timeout: Maximum time to wait for the engine to load (in seconds)
+        """
+        self.engine_type = engine_type
+        self.engine_kwargs = engine_kwargs or {}
+        self.engine_factory = engine_factory
+        self.start_timeout = start_timeout
+        self.restarts = 0
+        self.logger = get_logger("EngineWorker")
+        # spawn works the same on all platforms and avoids forking loaded models/threads
+        self._ctx = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()  # One in-flight request per worker
+        self._process = None
+        self._conn = None
+        self._start()
+
+    @property
+    def pid(self) -> Optional[int]:
+        """PID of the current worker process."""
+        return self._process.pid if self._process is not None else None
+
+    def is_alive(self) -> bool:
+        """Check whether the worker process is running."""
+        return self._process is not None and self._process.is_alive()
+
+    def _start(self):
+        """Spawn the worker process and wait until its engine is ready."""
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.engine_type, self.engine_kwargs, self.engine_factory),
+            name=f"OCRWorker-{self.engine_type}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        self._process, self._conn = process, parent_conn
+
+        if not parent_conn.poll(self.start_timeout):
+            self._kill()
+            raise TimeoutError(
+                f"引擎工作进程启动超时（{self.engine_type}，超过 {self.start_timeout} 秒）"
+            )
+        try:
+            message = parent_conn.recv()
+        except EOFError:
+            process.join(timeout=5)
+            exitcode = process.exitcode
+            self._kill()
+            raise RuntimeError(f"引擎工作进程启动失败: {self.engine_type} (exitcode={exitcode})")
+        if message[0] == "init_error":
+            self._kill()
+            raise _rebuild_exception(message[1], message[2])
+
+        self.logger.info(f"引擎工作进程已启动: {self.engine_type} (pid={process.pid})")
+
+    def _kill(self):
+        """Kill the worker process and close the pipe."""
+        process, conn = self._process, self._conn
+        self._process, self._conn = None, None
+        if process is not None and process.is_alive():
+            process.kill()
+        if process is not None:
+            process.join(timeout=5)
+        if conn is not None:
+            conn.close()
+
+    def recognize_image(self, image_path: str, timeout: Optional[float] = None, **kwargs) -> OCRResult:
+        """Run recognition in the worker process.
+
+        Args:
+            image_path: Path to image file
+            timeout: Maximum time in seconds (None waits forever); on timeout
+                    the worker process is killed
+            **kwargs: Picklable arguments forwarded to the engine
+
+        Returns:
+            OCRResult from the worker
+
+        Raises:
+            TimeoutError: If the request exceeded timeout
+            RuntimeError: If the worker process crashed
+        """
+        with self._lock:
+            if not self.is_alive():
+                if self._process is not None or self._conn is not None:
+                    self._kill()
+                self.restarts += 1
+                self.logger.warning(f"重新启动引擎工作进程: {self.engine_type}")
+                self._start()
+
+            self._conn.send((image_path, kwargs))
+            if not self._conn.poll(timeout):
+                pid = self.pid
+                self._kill()
+                self.logger.error(
+                    f"引擎工作进程超时，已终止: {self.engine_type} (pid={pid})",
+                    extra={"image_path": image_path}
+                )
+                raise TimeoutError(
+                    f"OCR识别超时（超过 {timeout} 秒），工作进程已终止"
+                )
+            try:
+                message = self._conn.recv()
+            except (EOFError, OSError):
+                exitcode = None
+                if self._process is not None:
+                    self._process.join(timeout=5)
+                    exitcode = self._process.exitcode
+                self._kill()
+                self.logger.error(
+                    f"引擎工作进程异常退出: {self.engine_type} (exitcode={exitcode})",
+                    extra={"image_path": image_path}
+                )
+                raise RuntimeError(
+                    f"引擎工作进程异常退出: {self.engine_type} (exitcode={exitcode})"
+                )
+
+        if message[0] == "ok":
+            return message[1]
+        raise _rebuild_exception(message[1], message[2])
+
+    def close(self):
+        """Shut down the worker process."""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.send(None)
+                except (OSError, ValueError):
+                    pass
+            if self._process is not None:
+                self._process.join(timeout=2)
+            self._kill()
+
+
+class ProcessEngine(OCREngine):
+    """OCREngine backed by an out-of-process EngineWorker."""
+
+    supports_timeout = True
+
+    def __init__(self, engine_type: str, engine_factory: Optional[Callable] = None, **kwargs):
+        """Start a worker process for the given engine type.
+
+        Args:
+            engine_type: Type of engine to run in the worker
+            engine_factory: Optional picklable engine factory (for testing)
+            **kwargs: Engine initialization arguments
+        """
+        self.engine_type = engine_type
+        self.worker = EngineWorker(engine_type, kwargs, engine_factory=engine_factory)
+
+    def recognize_image(self, image_path: str, timeout: Optional[float] = None, **kwargs) -> OCRResult:
+        """Recognize text in an image in the worker process."""
+        image_path = str(Path(image_path).resolve())
+        return self.worker.recognize_image(image_path, timeout=timeout, **kwargs)
+
+    def get_memory_usage(self) -> Optional[int]:
+        """RSS of the worker process in bytes."""
+        pid = self.worker.pid
+        return get_process_rss(pid) if pid is not None else None
+
+    def unload(self):
+        """Shut down the worker process, freeing all of its memory."""
+        self.close()
+
+    def close(self):
+        """Shut down the worker process."""
+        self.worker.close()
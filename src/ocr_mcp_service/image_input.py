@@ -0,0 +1,364 @@
+"""Per-request image input: decode at most once, reuse the pixels everywhere."""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from .utils import validate_image_path
+from .config import OCR_MAX_SIDE, OCR_MAX_PIXELS, OCR_JPEG_DRAFT
+
+# EXIF orientation tag, and the orientations stored rotated by 90 or 270 degrees
+EXIF_ORIENTATION = 0x0112
+_TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def compute_scale(width: int, height: int, max_side: int = 0, max_pixels: int = 0) -> float:
+    """Compute the downscale factor that fits an image into the size limits.
+
+    Args:
+        width: Image width in pixels
+        height: Image height in pixels
+        max_side: Maximum length of the longer side (0 = no limit)
+        max_pixels: Maximum number of pixels (0 = no limit)
+
+    Returns:
+        Scale factor in (0, 1]; 1.0 means no downscaling
+    """
+    scale = 1.0
+    if max_side and max_side > 0 and max(width, height) > max_side:
+        scale = min(scale, max_side / max(width, height))
+    if max_pixels and max_pixels > 0 and width * height > max_pixels:
+        scale = min(scale, (max_pixels / (width * height)) ** 0.5)
+    return scale
+
+
+class LoadedImage:
+    """An image decoded at most once per request.
+
+    Carries the source path, dimensions and file format through validation,
+    the engine and later stages. Opening only reads the header (enough to
+    validate the file); the pixels are decoded on first access and cached,
+    so engines that read the file themselves never trigger a decode and
+    engines that take arrays never decode twice. ``array`` is RGB (EasyOCR,
+    PIL convention), ``bgr_array`` is BGR (PaddleOCR, OpenCV convention).
+    """
+
+    def __init__(self, image: Image.Image, path: Optional[str] = None, format: Optional[str] = None):
+        """Wrap an already decoded PIL image.
+
+        Args:
+            image: Decoded PIL image (converted to RGB if needed)
+            path: Source file path, if any
+            format: Source file format (e.g. 'JPEG', 'PNG')
+        """
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        self.path = path
+        self.format = format
+        self.width, self.height = image.size
+        self.original_width, self.original_height = image.size
+        self.page: Optional[int] = None
+        self._orientation = 1
+        self._jpeg_draft = False
+        self._loader = None
+        self._pil: Optional[Image.Image] = image
+        self._array: Optional[np.ndarray] = None
+        self._bgr_array: Optional[np.ndarray] = None
+
+    @classmethod
+    def open(
+        cls,
+        image_path: str,
+        max_side: int = 0,
+        max_pixels: int = 0,
+        jpeg_draft: bool = OCR_JPEG_DRAFT,
+    ) -> "LoadedImage":
+        """Validate an image file by reading its header; pixels are decoded lazily.
+
+        Images larger than ``max_side``/``max_pixels`` are decoded downscaled;
+        ``size`` is then the decoded size and ``scale_x``/``scale_y`` map it
+        back to the original. Images with an EXIF orientation are decoded
+        upright, and all sizes are those of the upright image.
+
+        Args:
+            image_path: Path to image file
+            max_side: Maximum length of the longer side (0 = no limit)
+            max_pixels: Maximum number of pixels (0 = no limit)
+            jpeg_draft: Let the JPEG decoder itself decode at 1/2, 1/4 or 1/8 size
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the path is not a file or is not a readable image
+        """
+        path = validate_image_path(image_path)
+        try:
+            with Image.open(path) as img:
+                img_format, size = img.format, img.size
+                orientation = img.getexif().get(EXIF_ORIENTATION, 1)
+        except Exception:
+            raise ValueError(f"Invalid image file: {image_path}")
+        if orientation in _TRANSPOSED_ORIENTATIONS:
+            size = (size[1], size[0])
+
+        loaded = cls.__new__(cls)
+        loaded.path = str(path.resolve())
+        loaded.format = img_format
+        loaded.original_width, loaded.original_height = size
+        loaded.width, loaded.height = size
+        loaded.page = None
+        loaded._orientation = orientation
+        loaded._jpeg_draft = jpeg_draft
+        loaded._loader = None
+        loaded._pil = None
+        loaded._array = None
+        loaded._bgr_array = None
+
+        scale = compute_scale(size[0], size[1], max_side, max_pixels)
+        if scale < 1.0:
+            loaded.width = max(1, round(size[0] * scale))
+            loaded.height = max(1, round(size[1] * scale))
+        return loaded
+
+    @classmethod
+    def from_array(cls, array: np.ndarray, path: Optional[str] = None) -> "LoadedImage":
+        """Wrap an RGB (or grayscale) uint8 array without copying it."""
+        if array.ndim == 2:
+            array = np.stack([array] * 3, axis=-1)
+        loaded = cls.__new__(cls)
+        loaded.path = path
+        loaded.format = None
+        loaded.height, loaded.width = array.shape[:2]
+        loaded.original_width, loaded.original_height = loaded.width, loaded.height
+        loaded.page = None
+        loaded._orientation = 1
+        loaded._jpeg_draft = False
+        loaded._loader = None
+        loaded._pil = None
+        loaded._array = array
+        loaded._bgr_array = None
+        return loaded
+
+    @classmethod
+    def lazy(
+        cls,
+        loader: Callable[[Tuple[int, int]], Image.Image],
+        size: Tuple[int, int],
+        target_size: Optional[Tuple[int, int]] = None,
+        path: Optional[str] = None,
+        format: Optional[str] = None,
+        page: Optional[int] = None,
+    ) -> "LoadedImage":
+        """Wrap an image whose pixels are produced on demand, e.g. a document page.
+
+        Args:
+            loader: Called with the target (width, height); returns a PIL image,
+                    ideally already at that size
+            size: Full (width, height) of the image
+            target_size: Decoded (width, height) if downscaled (default: full size)
+            path: Source document path
+            format: Source document format (e.g. 'PDF', 'TIFF')
+            page: 1-based page number within the document
+        """
+        loaded = cls.__new__(cls)
+        loaded.path = path
+        loaded.format = format
+        loaded.original_width, loaded.original_height = size
+        loaded.width, loaded.height = target_size or size
+        loaded.page = page
+        loaded._orientation = 1
+        loaded._jpeg_draft = False
+        loaded._loader = loader
+        loaded._pil = None
+        loaded._array = None
+        loaded._bgr_array = None
+        return loaded
+
+    @property
+    def size(self) -> tuple:
+        """(width, height) in pixels."""
+        return self.width, self.height
+
+    @property
+    def scale_x(self) -> float:
+        """Decoded width divided by original width."""
+        return self.width / self.original_width
+
+    @property
+    def scale_y(self) -> float:
+        """Decoded height divided by original height."""
+        return self.height / self.original_height
+
+    @property
+    def scale(self) -> float:
+        """Applied downscale factor (1.0 when decoded at full size)."""
+        return min(self.scale_x, self.scale_y)
+
+    @property
+    def source_file(self) -> Optional[str]:
+        """Path of a file holding exactly this image, if there is one.
+
+        None for arrays, pages of a multi-page document, downscaled images and
+        images with an EXIF orientation (engines may not apply it).
+        """
+        full_size = self.size == (self.original_width, self.original_height)
+        upright = self._orientation == 1
+        if self._loader is None and self.page is None and self.format is not None and full_size and upright:
+            return self.path
+        return None
+
+    @property
+    def is_decoded(self) -> bool:
+        """Whether the pixels have been decoded."""
+        return self._pil is not None or self._array is not None
+
+    def _decode(self) -> Image.Image:
+        """Decode the source file to an upright RGB PIL image at the target size."""
+        target = self.size
+        downscale = target != (self.original_width, self.original_height)
+        if self._loader is not None:
+            image = self._loader(target)
+            image = image if image.mode == "RGB" else image.convert("RGB")
+            if image.size != target:
+                image = image.resize(target, Image.Resampling.LANCZOS, reducing_gap=3.0)
+            return image
+        try:
+            with Image.open(self.path) as img:
+                if downscale and self._jpeg_draft and img.format == "JPEG":
+                    # The decoder skips detail it would throw away anyway; the
+                    # file is stored before the EXIF rotation
+                    stored = target[::-1] if self._orientation in _TRANSPOSED_ORIENTATIONS else target
+                    img.draft("RGB", stored)
+                img.load()
+                image = ImageOps.exif_transpose(img) if self._orientation != 1 else img
+                image = image if image.mode == "RGB" else image.convert("RGB")
+                if image.size != target:
+                    image = image.resize(target, Image.Resampling.LANCZOS, reducing_gap=3.0)
+                return image
+        except Exception as e:
+            raise ValueError(f"Invalid image file: {self.path} ({e})")
+
+    @property
+    def pil_image(self) -> Image.Image:
+        """RGB PIL image."""
+        if self._pil is None:
+            self._pil = Image.fromarray(self._array) if self._array is not None else self._decode()
+        return self._pil
+
+    @property
+    def array(self) -> np.ndarray:
+        """RGB uint8 array of shape (height, width, 3)."""
+        if self._array is None:
+            self._array = np.asarray(self.pil_image)
+            # The array now owns the pixels; drop the PIL copy
+            self._pil = None
+        return self._array
+
+    @property
+    def bgr_array(self) -> np.ndarray:
+        """Contiguous BGR uint8 array of shape (height, width, 3)."""
+        if self._bgr_array is None:
+            self._bgr_array = np.ascontiguousarray(self.array[..., ::-1])
+        return self._bgr_array
+
+    def release(self):
+        """Drop the decoded pixels."""
+        self._pil = None
+        self._array = None
+        self._bgr_array = None
+
+
+ImageInput = Union[LoadedImage, np.ndarray]
+
+
+def to_rgb_array(image: ImageInput) -> np.ndarray:
+    """Get an RGB array from a LoadedImage or an RGB ndarray."""
+    return image.array if isinstance(image, LoadedImage) else image
+
+
+def to_bgr_array(image: ImageInput) -> np.ndarray:
+    """Get a BGR array from a LoadedImage or an RGB ndarray."""
+    if isinstance(image, LoadedImage):
+        return image.bgr_array
+    return np.ascontiguousarray(image[..., ::-1])
+
+
+@contextmanager
+def image_file(image: LoadedImage) -> Iterator[str]:
+    """Yield a path to a file holding the image, for engines that read files.
+
+    The image's own source file when it has one, otherwise a temporary
+    lossless PNG that is removed afterwards.
+    """
+    if image.source_file is not None:
+        yield image.source_file
+        return
+    fd, temp_path = tempfile.mkstemp(prefix="ocr_page_", suffix=".png")
+    os.close(fd)
+    try:
+        image.pil_image.save(temp_path, format="PNG")
+        yield temp_path
+    finally:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+
+def recognize_loaded(engine, image: LoadedImage, **kwargs):
+    """Run an OCREngine on a LoadedImage in the form the engine accepts.
+
+    Engines taking arrays get the decoded pixels; the others get a file.
+
+    Args:
+        engine: OCREngine instance
+        image: Image to recognize
+        **kwargs: Arguments forwarded to recognize_image()
+
+    Returns:
+        OCRResult in the coordinates of the image's decoded size
+    """
+    if engine.accepts_arrays:
+        return engine.recognize_image(image.path or "<array>", image=image, **kwargs)
+    with image_file(image) as path:
+        return engine.recognize_image(path, **kwargs)
+
+
+def load_image(
+    image_path: str, max_side: Optional[int] = None, max_pixels: Optional[int] = None
+) -> LoadedImage:
+    """Validate an image file for a request; its pixels are decoded at most once.
+
+    Args:
+        image_path: Path to image file
+        max_side: Downscale limit for the longer side (None = OCR_MAX_SIDE, 0 = off)
+        max_pixels: Downscale limit for the pixel count (None = OCR_MAX_PIXELS, 0 = off)
+    """
+    return LoadedImage.open(
+        image_path,
+        max_side=OCR_MAX_SIDE if max_side is None else max_side,
+        max_pixels=OCR_MAX_PIXELS if max_pixels is None else max_pixels,
+    )
+
+
+def rescale_boxes(boxes: list, scale_x: float, scale_y: float) -> list:
+    """Map BoundingBox coordinates from a downscaled image back to the original.
+
+    Args:
+        boxes: BoundingBox list in downscaled coordinates
+        scale_x: Downscaled width / original width
+        scale_y: Downscaled height / original height
+
+    Returns:
+        New BoundingBox list in original image coordinates
+    """
+    from .models import BoundingBox
+
+    if not boxes or (scale_x == 1.0 and scale_y == 1.0):
+        return boxes
+    coords = np.array([[b.x1, b.y1, b.x2, b.y2] for b in boxes], dtype=np.float64)
+    coords /= np.array([scale_x, scale_y, scale_x, scale_y])
+    return [BoundingBox(*row) for row in coords.tolist()]
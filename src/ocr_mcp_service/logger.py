@@ -1,8 +1,13 @@
 """Logging configuration for OCR MCP Service."""
 
+import atexit
+import json
 import logging
 import logging.handlers
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
 from typing import Optional, Callable, Any
 from datetime import datetime
@@ -31,6 +36,48 @@ PYTHON_TO_MCP_LEVEL = {
 }
 
 
+# LogRecord attributes that are not "extra" context (taskName exists on 3.12+;
+# message and asctime are added by formatters)
+_RECORD_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "taskName"}
+
+
+# File log formats (LOG_FORMAT)
+LOG_FORMAT_TEXT = "text"
+LOG_FORMAT_JSON = "json"
+LOG_FORMATS = (LOG_FORMAT_TEXT, LOG_FORMAT_JSON)
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as JSON lines for machine consumption.
+
+    Each line is one object with ``timestamp``, ``level``, ``logger`` and
+    ``message``, followed by the record's ``extra`` fields (``processing_time``,
+    ``text_count``, ``image_path``, ``stage``, ``progress``, ...) with their
+    JSON types preserved, and ``exc_info`` / ``stack_info`` when present.
+    Values JSON cannot represent are written as strings.
+    """
+
+    default_time_format = "%Y-%m-%dT%H:%M:%S"
+    default_msec_format = "%s.%03d"
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key in record.__dict__.keys() - _RECORD_ATTRS:
+            data[key] = record.__dict__[key]
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc_info"] = record.exc_text
+        if record.stack_info:
+            data["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
 class MCPLogHandler(logging.Handler):
     """Custom logging handler that sends logs via MCP notifications."""
 
@@ -78,16 +125,9 @@ class MCPLogHandler(logging.Handler):
                     data["image_path"] = record.image_path
                 
                 # Add any other extra fields
-                for key, value in record.__dict__.items():
-                    if key not in [
-                        "name", "msg", "args", "created", "filename",
-                        "funcName", "levelname", "levelno", "lineno",
-                        "module", "msecs", "message", "pathname",
-                        "process", "processName", "relativeCreated",
-                        "thread", "threadName", "exc_info", "exc_text",
-                        "stack_info", "progress", "stage", "image_path"
-                    ]:
-                        data[key] = value
+                for key in record.__dict__.keys() - _RECORD_ATTRS:
+                    if key not in data:
+                        data[key] = record.__dict__[key]
 
                 self.mcp_callback(
                     level=mcp_level,
@@ -99,11 +139,48 @@ class MCPLogHandler(logging.Handler):
                 pass
 
 
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler for a bounded queue that drops records when the queue is full.
+
+    Logging never blocks the caller: records are handed to a QueueListener
+    thread that does the file I/O and MCP notifications. ``dropped`` counts
+    the records lost because the listener could not keep up.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Make the record safe to hand to another thread.
+
+        The message is merged with its arguments and any exception is
+        rendered to ``exc_text``; the original extra fields are kept.
+        """
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
 class OCRLogger:
     """OCR service logger with file and MCP support."""
 
     _instance: Optional["OCRLogger"] = None
     _initialized = False
+    _listener: Optional[logging.handlers.QueueListener] = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -119,6 +196,8 @@ class OCRLogger:
         log_file = get_env("LOG_FILE", "logs/ocr_service.log")
         log_max_bytes = int(get_env("LOG_MAX_BYTES", "10485760"))  # 10MB
         log_backup_count = int(get_env("LOG_BACKUP_COUNT", "5"))
+        log_queue_size = int(get_env("LOG_QUEUE_SIZE", "10000"))
+        log_format = get_env("LOG_FORMAT", LOG_FORMAT_TEXT).lower()
 
         # Create logs directory
         log_path = Path(log_file)
@@ -139,19 +218,83 @@ class OCRLogger:
             backupCount=log_backup_count,
             encoding="utf-8"
         )
-        file_formatter = logging.Formatter(
-            "[%(asctime)s] %(levelname)s [%(name)s] %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        )
+        if log_format == LOG_FORMAT_JSON:
+            file_formatter = JSONFormatter()
+        else:
+            file_formatter = logging.Formatter(
+                "[%(asctime)s] %(levelname)s [%(name)s] %(message)s",
+                datefmt="%Y-%m-%d %H:%M:%S"
+            )
         file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(file_handler)
+        self.file_handler = file_handler
 
         # MCP handler (callback will be set later)
         self.mcp_handler = MCPLogHandler()
-        self.logger.addHandler(self.mcp_handler)
+
+        # Stop the listener of a previous instance before replacing its handlers
+        OCRLogger._stop_listener()
+
+        # Handlers run on a listener thread behind a bounded queue, so logging
+        # never blocks a request on file I/O or MCP notifications
+        self.queue_handler: Optional[DroppingQueueHandler] = None
+        if log_queue_size > 0:
+            self.queue_handler = DroppingQueueHandler(queue.Queue(maxsize=log_queue_size))
+            self.logger.addHandler(self.queue_handler)
+            OCRLogger._listener = logging.handlers.QueueListener(
+                self.queue_handler.queue,
+                file_handler,
+                self.mcp_handler,
+                respect_handler_level=True,
+            )
+            OCRLogger._listener.start()
+        else:
+            self.logger.addHandler(file_handler)
+            self.logger.addHandler(self.mcp_handler)
 
         self._initialized = True
 
+        if log_format not in LOG_FORMATS:
+            self.logger.warning(
+                f"未知的日志格式: {log_format}，使用 {LOG_FORMAT_TEXT}（可选: {', '.join(LOG_FORMATS)}）"
+            )
+
+    @classmethod
+    def _stop_listener(cls):
+        """Stop the queue listener, writing out all records still queued."""
+        listener, cls._listener = cls._listener, None
+        if listener is not None:
+            listener.stop()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until the listener has handled every queued record.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if the queue was drained, False on timeout
+        """
+        if self.queue_handler is None:
+            return True
+        log_queue = self.queue_handler.queue
+        deadline = time.monotonic() + timeout
+        while log_queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def get_stats(self) -> dict:
+        """Logging queue statistics: capacity, records waiting and records dropped."""
+        if self.queue_handler is None:
+            return {"queue_size": 0, "queued": 0, "dropped": 0}
+        log_queue = self.queue_handler.queue
+        return {
+            "queue_size": log_queue.maxsize,
+            "queued": log_queue.qsize(),
+            "dropped": self.queue_handler.dropped,
+        }
+
     def set_mcp_callback(self, callback: Callable):
         """Set MCP notification callback."""
         self.mcp_handler.set_mcp_callback(callback)
@@ -275,3 +418,26 @@ def set_mcp_log_level(level: str):
         _logger_instance = OCRLogger()
     _logger_instance.set_mcp_log_level(level)
 
+
+
+def flush_logs(timeout: float = 5.0) -> bool:
+    """Wait until all queued log records have been written.
+
+    Args:
+        timeout: Maximum time to wait in seconds
+    """
+    if _logger_instance is None:
+        return True
+    return _logger_instance.flush(timeout)
+
+
+def get_logging_stats() -> dict:
+    """Get logging queue statistics (capacity, queued and dropped records)."""
+    global _logger_instance
+    if _logger_instance is None:
+        _logger_instance = OCRLogger()
+    return _logger_instance.get_stats()
+
+
+# Write out queued records on interpreter exit
+atexit.register(OCRLogger._stop_listener)
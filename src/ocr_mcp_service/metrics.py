@@ -0,0 +1,338 @@
+"""Per-tool, per-engine request metrics with latency histograms and Prometheus export."""
+
+import functools
+import inspect
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .logger import get_logger
+from .config import METRICS_PROMETHEUS_FILE, METRICS_PROMETHEUS_INTERVAL
+
+# Histogram bucket upper bounds in seconds (Prometheus "le" labels)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+QUEUE_WAIT_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Metrics of the request running in this context (tool, engine, bytes); worker
+# threads started with a copy of the context add to the same record
+_current_request: ContextVar[Optional["_RequestRecord"]] = ContextVar("ocr_request_metrics", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram, as in Prometheus.
+
+    Quantiles are estimated by linear interpolation inside the bucket that
+    contains them (like PromQL's histogram_quantile), so memory stays
+    constant however many observations are recorded.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # One count per bucket plus the +Inf bucket (not cumulative)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        """Record one observation. Not thread-safe: the registry holds its lock."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile (0 < q < 1), or None without observations."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                # Observations above the last bound: the largest one seen is the best estimate
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                upper = min(upper, self.max)
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, sum, average, max and p50/p95/p99 in seconds."""
+        data = {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "avg": round(self.sum / self.count, 6) if self.count else None,
+            "max": round(self.max, 6) if self.count else None,
+        }
+        for q in QUANTILES:
+            value = self.quantile(q)
+            data[f"p{round(q * 100)}"] = round(value, 6) if value is not None else None
+        return data
+
+    def cumulative_counts(self) -> List[Tuple[str, int]]:
+        """(le label, cumulative count) pairs including +Inf."""
+        pairs = []
+        cumulative = 0
+        for bound, count in zip(list(self.buckets) + [None], self.counts):
+            cumulative += count
+            pairs.append(("+Inf" if bound is None else repr(float(bound)), cumulative))
+        return pairs
+
+
+class _RequestRecord:
+    """Labels and input size of one tool call, filled in while it runs."""
+
+    __slots__ = ("tool", "engine", "bytes")
+
+    def __init__(self, tool: str, engine: str):
+        self.tool = tool
+        self.engine = engine
+        self.bytes = 0
+
+
+class _Series:
+    """Metrics of one (tool, engine) pair."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors: Dict[str, int] = {}
+        self.bytes = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels.items())
+
+
+class MetricsRegistry:
+    """Request counts, errors by type, latency, queue wait and bytes processed.
+
+    Requests are keyed by (tool, engine); queue wait, which is measured by
+    the engine limiter before a request gets a slot, is keyed by engine.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._queue_wait: Dict[str, Histogram] = {}
+
+    def observe_request(
+        self,
+        tool: str,
+        engine: str,
+        duration: float,
+        error_type: Optional[str] = None,
+        bytes_processed: int = 0,
+    ):
+        """Record a finished tool call.
+
+        Args:
+            tool: MCP tool name
+            engine: OCR engine type
+            duration: Wall-clock time of the call in seconds
+            error_type: Error type of a failed call (None = success)
+            bytes_processed: Size of the input files read
+        """
+        with self._lock:
+            series = self._series.get((tool, engine))
+            if series is None:
+                series = self._series[(tool, engine)] = _Series()
+            series.requests += 1
+            series.bytes += bytes_processed
+            series.latency.observe(duration)
+            if error_type:
+                series.errors[error_type] = series.errors.get(error_type, 0) + 1
+
+    def observe_queue_wait(self, engine: str, seconds: float):
+        """Record how long a request waited for a free engine slot."""
+        with self._lock:
+            histogram = self._queue_wait.get(engine)
+            if histogram is None:
+                histogram = self._queue_wait[engine] = Histogram(QUEUE_WAIT_BUCKETS)
+            histogram.observe(seconds)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Snapshot of all metrics.
+
+        Returns:
+            Dictionary with uptime_seconds, requests (engine -> tool -> requests,
+            errors by error_type, bytes_processed and latency summary) and
+            queue_wait (engine -> wait summary); times are in seconds
+        """
+        with self._lock:
+            requests: Dict[str, Dict[str, Any]] = {}
+            for (tool, engine), series in sorted(self._series.items(), key=lambda item: (item[0][1], item[0][0])):
+                requests.setdefault(engine, {})[tool] = {
+                    "requests": series.requests,
+                    "errors": dict(series.errors),
+                    "error_count": sum(series.errors.values()),
+                    "bytes_processed": series.bytes,
+                    "latency": series.latency.summary(),
+                }
+            return {
+                "uptime_seconds": round(time.time() - self._started, 1),
+                "requests": requests,
+                "queue_wait": {
+                    engine: histogram.summary() for engine, histogram in sorted(self._queue_wait.items())
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def header(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name: str, labels: Dict[str, str], hist: Histogram):
+            for le, count in hist.cumulative_counts():
+                lines.append(f"{name}_bucket{{{_labels(**labels, le=le)}}} {count}")
+            lines.append(f"{name}_sum{{{_labels(**labels)}}} {hist.sum!r}")
+            lines.append(f"{name}_count{{{_labels(**labels)}}} {hist.count}")
+
+        with self._lock:
+            series = sorted(self._series.items())
+            header("ocr_requests_total", "counter", "OCR tool calls.")
+            for (tool, engine), s in series:
+                lines.append(f"ocr_requests_total{{{_labels(tool=tool, engine=engine)}}} {s.requests}")
+            header("ocr_request_errors_total", "counter", "Failed OCR tool calls by error type.")
+            for (tool, engine), s in series:
+                for error_type, count in sorted(s.errors.items()):
+                    labels = _labels(tool=tool, engine=engine, error_type=error_type)
+                    lines.append(f"ocr_request_errors_total{{{labels}}} {count}")
+            header("ocr_bytes_processed_total", "counter", "Bytes of input files recognized.")
+            for (tool, engine), s in series:
+                lines.append(f"ocr_bytes_processed_total{{{_labels(tool=tool, engine=engine)}}} {s.bytes}")
+            header("ocr_request_duration_seconds", "histogram", "OCR tool call latency.")
+            for (tool, engine), s in series:
+                histogram("ocr_request_duration_seconds", {"tool": tool, "engine": engine}, s.latency)
+            header("ocr_queue_wait_seconds", "histogram", "Time spent waiting for a free engine slot.")
+            for engine, hist in sorted(self._queue_wait.items()):
+                histogram("ocr_queue_wait_seconds", {"engine": engine}, hist)
+        return "\n".join(lines) + "\n"
+
+
+_registry = MetricsRegistry()
+_bytes_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry."""
+    return _registry
+
+
+def add_bytes_processed(path: str):
+    """Count an input file towards the bytes processed by the current request."""
+    record = _current_request.get()
+    if record is None:
+        return
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return
+    # Batch items add from several threads at once
+    with _bytes_lock:
+        record.bytes += size
+
+
+def track_request(tool: str, engine: Optional[str] = None):
+    """Decorator recording a tool call's latency, outcome and bytes processed.
+
+    A call counts as failed when it raises or returns a dictionary with an
+    ``error_type`` (the tools' structured error responses).
+
+    Args:
+        tool: Tool name used as the metric label
+        engine: Engine label; None takes it from the call's ``engine`` argument
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        def engine_for(args, kwargs) -> str:
+            if engine is not None:
+                return engine
+            bound = signature.bind_partial(*args, **kwargs)
+            bound.apply_defaults()
+            return str(bound.arguments.get("engine"))
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            record = _RequestRecord(tool, engine_for(args, kwargs))
+            token = _current_request.set(record)
+            start = time.monotonic()
+            error_type = None
+            try:
+                response = await func(*args, **kwargs)
+                if isinstance(response, dict):
+                    error_type = response.get("error_type")
+                return response
+            except BaseException as e:
+                error_type = type(e).__name__
+                raise
+            finally:
+                _current_request.reset(token)
+                _registry.observe_request(
+                    record.tool, record.engine, time.monotonic() - start, error_type, record.bytes
+                )
+
+        return wrapper
+
+    return decorator
+
+
+def write_prometheus_file(path: str, registry: Optional[MetricsRegistry] = None):
+    """Write the metrics to a Prometheus text file atomically (node exporter textfile collector)."""
+    registry = registry or _registry
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    temp.write_text(registry.to_prometheus(), encoding="utf-8")
+    os.replace(temp, target)
+
+
+def start_prometheus_writer(
+    path: Optional[str] = METRICS_PROMETHEUS_FILE,
+    interval: float = METRICS_PROMETHEUS_INTERVAL,
+    registry: Optional[MetricsRegistry] = None,
+) -> Optional[threading.Event]:
+    """Rewrite the Prometheus text file every ``interval`` seconds in a daemon thread.
+
+    Args:
+        path: Output file (default: METRICS_PROMETHEUS_FILE; None or empty = disabled)
+        interval: Seconds between writes
+        registry: Registry to export (default: the process-wide one)
+
+    Returns:
+        Event that stops the writer when set, or None if disabled
+    """
+    if not path:
+        return None
+    logger = get_logger("metrics")
+    stop = threading.Event()
+
+    def run():
+        while True:
+            try:
+                write_prometheus_file(path, registry)
+            except OSError as e:
+                logger.warning(f"写入Prometheus指标文件失败: {path}, 错误: {e}")
+            if stop.wait(interval):
+                return
+
+    threading.Thread(target=run, name="MetricsWriter", daemon=True).start()
+    logger.info(f"Prometheus指标文件: {path}，每 {interval} 秒更新")
+    return stop
@@ -4,6 +4,32 @@ from typing import List, Optional, Dict, Any
 from dataclasses import dataclass, field
 
 
+# Response detail levels for to_dict(), smallest first:
+# text only, text + confidence, or everything (boxes, analysis, ...)
+DETAIL_TEXT = "text"
+DETAIL_CONFIDENCE = "confidence"
+DETAIL_FULL = "full"
+DETAIL_LEVELS = (DETAIL_TEXT, DETAIL_CONFIDENCE, DETAIL_FULL)
+
+# Box encodings: one {"x1", "y1", "x2", "y2"} dict per box, or one flat list of
+# rounded integers [x1, y1, x2, y2, x1, y1, ...]
+BOX_FORMAT_DICT = "dict"
+BOX_FORMAT_FLAT = "flat"
+BOX_FORMATS = (BOX_FORMAT_DICT, BOX_FORMAT_FLAT)
+
+
+def check_response_options(detail: str, box_format: str):
+    """Validate to_dict() options.
+
+    Raises:
+        ValueError: If detail or box_format is not supported
+    """
+    if detail not in DETAIL_LEVELS:
+        raise ValueError(f"无效的 detail: {detail}（可选: {', '.join(DETAIL_LEVELS)}）")
+    if box_format not in BOX_FORMATS:
+        raise ValueError(f"无效的 box_format: {box_format}（可选: {', '.join(BOX_FORMATS)}）")
+
+
 @dataclass
 class BoundingBox:
     """Bounding box for text detection."""
@@ -14,6 +40,20 @@ class BoundingBox:
     y2: float
 
 
+def encode_boxes(boxes: List[BoundingBox], box_format: str = BOX_FORMAT_DICT) -> list:
+    """Encode boxes for a response in the given format."""
+    if box_format == BOX_FORMAT_FLAT:
+        return [round(v) for b in boxes for v in (b.x1, b.y1, b.x2, b.y2)]
+    return [{"x1": b.x1, "y1": b.y1, "x2": b.x2, "y2": b.y2} for b in boxes]
+
+
+def decode_boxes(boxes: list, box_format: str = BOX_FORMAT_DICT) -> List[BoundingBox]:
+    """Decode boxes produced by encode_boxes()."""
+    if box_format == BOX_FORMAT_FLAT:
+        return [BoundingBox(*map(float, boxes[i:i + 4])) for i in range(0, len(boxes), 4)]
+    return [BoundingBox(**b) for b in boxes]
+
+
 @dataclass
 class OCRResult:
     """OCR recognition result."""
@@ -26,27 +66,70 @@ class OCRResult:
     analysis: Optional[str] = None
     progress_history: List[Dict[str, Any]] = field(default_factory=list)
     prompt_suggestion: Optional[Dict[str, Any]] = None
+    # True when served from the result cache; processing_time is then the original run's
+    cache_hit: bool = False
+    # Downscale factor applied before recognition; boxes are in original coordinates
+    scale: float = 1.0
+    # Per-box text and confidence aligned with boxes (empty if the engine has none);
+    # used internally, e.g. to merge tiles, and not included in to_dict()
+    box_texts: List[str] = field(default_factory=list)
+    box_scores: List[float] = field(default_factory=list)
 
-    def to_dict(self) -> dict:
-        """Convert to dictionary."""
-        result = {
-            "text": self.text,
-            "boxes": [
-                {"x1": b.x1, "y1": b.y1, "x2": b.x2, "y2": b.y2}
-                for b in self.boxes
-            ],
-            "confidence": self.confidence,
-            "engine": self.engine,
-            "processing_time": self.processing_time,
-        }
+    def to_dict(
+        self,
+        detail: str = DETAIL_FULL,
+        box_format: str = BOX_FORMAT_DICT,
+        include_progress_history: bool = True,
+    ) -> dict:
+        """Convert to dictionary.
+
+        Args:
+            detail: 'text' (text and run metadata), 'confidence' (adds confidence
+                    and scale) or 'full' (adds boxes, analysis, progress history
+                    and prompt suggestion)
+            box_format: 'dict' or 'flat' (see encode_boxes()); flat results carry
+                        box_format = 'flat'
+            include_progress_history: Include progress_history at 'full' detail
+        """
+        result = {"text": self.text}
+        if detail == DETAIL_FULL:
+            result["boxes"] = encode_boxes(self.boxes, box_format)
+            if box_format != BOX_FORMAT_DICT:
+                result["box_format"] = box_format
+        if detail != DETAIL_TEXT:
+            result["confidence"] = self.confidence
+        result["engine"] = self.engine
+        result["processing_time"] = self.processing_time
+        result["cache_hit"] = self.cache_hit
+        if detail == DETAIL_TEXT:
+            return result
+        result["scale"] = self.scale
+        if detail != DETAIL_FULL:
+            return result
         if self.analysis:
             result["analysis"] = self.analysis
-        if self.progress_history:
+        if self.progress_history and include_progress_history:
             result["progress_history"] = self.progress_history
         if self.prompt_suggestion:
             result["prompt_suggestion"] = self.prompt_suggestion
         return result
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "OCRResult":
+        """Create from a dictionary produced by to_dict() at full detail."""
+        return cls(
+            text=data["text"],
+            boxes=decode_boxes(data.get("boxes", []), data.get("box_format", BOX_FORMAT_DICT)),
+            confidence=data["confidence"],
+            engine=data["engine"],
+            processing_time=data["processing_time"],
+            analysis=data.get("analysis"),
+            progress_history=data.get("progress_history", []),
+            prompt_suggestion=data.get("prompt_suggestion"),
+            cache_hit=data.get("cache_hit", False),
+            scale=data.get("scale", 1.0),
+        )
+
     def get_text_with_analysis(self) -> str:
         """Get text with analysis appended."""
         parts = [self.text]
@@ -57,7 +140,110 @@ class OCRResult:
         return "\n".join(parts)
 
 
+@dataclass
+class BatchItemResult:
+    """Result of one image in a batch recognition call."""
+
+    image_path: str
+    result: Optional[OCRResult] = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
 
+    @property
+    def ok(self) -> bool:
+        """Whether the image was recognized successfully."""
+        return self.result is not None
 
+    def to_dict(self, **options) -> dict:
+        """Convert to dictionary; options are passed to the result's to_dict()."""
+        item = {"image_path": self.image_path, "ok": self.ok}
+        if self.result is not None:
+            item["result"] = self.result.to_dict(**options)
+        if self.error is not None:
+            item["error"] = self.error
+            item["error_type"] = self.error_type
+        return item
 
 
+@dataclass
+class PageResult:
+    """Result of one page of a multi-page document."""
+
+    page: int
+    result: Optional[OCRResult] = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the page was recognized successfully."""
+        return self.result is not None
+
+    def to_dict(self, **options) -> dict:
+        """Convert to dictionary; options are passed to OCRResult.to_dict()."""
+        item = {"page": self.page, "ok": self.ok}
+        if self.result is not None:
+            item.update(self.result.to_dict(**options))
+        if self.error is not None:
+            item["error"] = self.error
+            item["error_type"] = self.error_type
+        return item
+
+
+@dataclass
+class DocumentResult:
+    """OCR result of a multi-page document (PDF or multi-frame TIFF)."""
+
+    document_path: str
+    page_count: int
+    pages: List[PageResult]
+    processing_time: float
+
+    @property
+    def text(self) -> str:
+        """Text of all recognized pages, separated by blank lines."""
+        return "\n\n".join(p.result.text for p in self.pages if p.ok and p.result.text)
+
+    @property
+    def confidence(self) -> float:
+        """Average confidence of the recognized pages."""
+        scores = [p.result.confidence for p in self.pages if p.ok]
+        return sum(scores) / len(scores) if scores else 0.0
+
+    @property
+    def engine(self) -> str:
+        """Engine name reported by the recognized pages."""
+        return next((p.result.engine for p in self.pages if p.ok), "unknown")
+
+    def to_dict(
+        self,
+        detail: str = DETAIL_FULL,
+        box_format: str = BOX_FORMAT_DICT,
+        include_progress_history: bool = True,
+    ) -> dict:
+        """Convert to dictionary (options as for OCRResult.to_dict(), applied per page).
+
+        Boxes are per page (each in its own page's coordinates), so the
+        top-level ``boxes`` list is empty.
+        """
+        result = {"text": self.text}
+        if detail == DETAIL_FULL:
+            result["boxes"] = []
+        if detail != DETAIL_TEXT:
+            result["confidence"] = self.confidence
+        result.update(
+            engine=self.engine,
+            processing_time=self.processing_time,
+            cache_hit=bool(self.pages) and all(p.ok and p.result.cache_hit for p in self.pages),
+            document_path=self.document_path,
+            page_count=self.page_count,
+            pages=[
+                p.to_dict(
+                    detail=detail,
+                    box_format=box_format,
+                    include_progress_history=include_progress_history,
+                )
+                for p in self.pages
+            ],
+        )
+        return result
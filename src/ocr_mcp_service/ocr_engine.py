@@ -1,25 +1,42 @@
 """OCR engine implementations."""
 
+import gc
+import importlib.util
 import time
 import subprocess
 import json
 import sys
+import threading
 from abc import ABC, abstractmethod
-from typing import Optional
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, List, Optional
 from pathlib import Path
 
-from .models import OCRResult, BoundingBox
+from .models import BatchItemResult, OCRResult
 from .analysis_generator import AnalysisGenerator
 from .progress_tracker import ProgressTracker
 from .logger import get_logger
 from .mcp_server import send_mcp_log
+from .engine_pool import EnginePool, PoolClosedError
+from .utils import get_process_rss
 from .config import (
     PADDLEOCR_MODEL_DIR,
     PADDLEOCR_LANG,
     DEEPSEEK_MODEL_NAME,
-    DEEPSEEK_DEVICE,
+    ENGINE_BACKEND,
+    ENGINE_MEMORY_BUDGET_MB,
+    ENGINE_REAPER_INTERVAL,
+    OCR_BATCH_SIZE,
+    OCR_PROGRESS_HISTORY,
+    OCR_PROGRESS_MIN_INTERVAL,
+    get_idle_ttl,
+    get_pool_size,
+    resolve_deepseek_device,
 )
 
+if TYPE_CHECKING:
+    from .image_input import ImageInput
+
 # Global analysis generator instance
 _analysis_generator = AnalysisGenerator()
 
@@ -36,36 +53,168 @@ def _add_analysis_to_result(ocr_result: OCRResult, layout_info: Optional[dict] =
     return ocr_result
 
 
+def _batch_error(image_path: str, error: Exception) -> BatchItemResult:
+    """Build a failed batch item from an exception."""
+    return BatchItemResult(str(image_path), error=str(error), error_type=type(error).__name__)
+
+
+def _batch_result(image_path: str, parsed, engine: str, processing_time: float) -> BatchItemResult:
+    """Build a successful batch item from a ParsedOCR."""
+    result = OCRResult(
+        text=parsed.text,
+        boxes=parsed.boxes,
+        confidence=parsed.confidence,
+        box_texts=parsed.texts,
+        box_scores=parsed.scores,
+        engine=engine,
+        processing_time=processing_time,
+    )
+    return BatchItemResult(str(image_path), result=_add_analysis_to_result(result))
+
+
+def _recognize_paddle_batch(
+    engine: "OCREngine", engine_name: str, image_paths: List[str], batch_size: int, **kwargs
+) -> List[BatchItemResult]:
+    """Run PaddleOCR predict() on chunks of images and parse each page.
+
+    Args:
+        engine: Engine owning a PaddleOCR predictor as ``engine.ocr``
+        engine_name: Engine name recorded in the results
+        image_paths: Image file paths
+        batch_size: Maximum number of images per predict() call
+        **kwargs: Arguments for the per-image fallback
+
+    Returns:
+        One BatchItemResult per input path, in input order
+    """
+    from .result_parser import parse_paddle_page
+
+    items: List[Optional[BatchItemResult]] = [None] * len(image_paths)
+    pending = []  # (index, resolved path)
+    for i, path in enumerate(image_paths):
+        resolved = Path(path).resolve()
+        if resolved.is_file():
+            pending.append((i, str(resolved)))
+        else:
+            items[i] = _batch_error(path, FileNotFoundError(f"Image file not found: {path}"))
+
+    batch_size = max(1, batch_size)
+    for start in range(0, len(pending), batch_size):
+        chunk = pending[start:start + batch_size]
+        engine.logger.info(f"开始批量OCR识别: {len(chunk)} 张图片", extra={"batch_size": len(chunk)})
+        chunk_start = time.time()
+        try:
+            pages = list(engine.ocr.predict([path for _, path in chunk]))
+            if len(pages) != len(chunk):
+                raise RuntimeError(f"predict() returned {len(pages)} results for {len(chunk)} images")
+        except Exception as e:
+            # One bad image fails the whole call; retry the chunk image by image
+            engine.logger.warning(f"批量识别失败，改为逐张识别: {e}")
+            for i, path in chunk:
+                items[i] = engine._recognize_one(image_paths[i], **kwargs)
+            continue
+
+        per_image_time = (time.time() - chunk_start) / len(chunk)
+        for (i, _), page in zip(chunk, pages):
+            try:
+                items[i] = _batch_result(
+                    image_paths[i], parse_paddle_page(page), engine_name, per_image_time
+                )
+            except Exception as e:
+                items[i] = _batch_error(image_paths[i], e)
+    return items
+
+
 class OCREngine(ABC):
     """Abstract base class for OCR engines."""
 
+    # Whether recognize_image() accepts a ``timeout`` keyword and enforces it itself
+    supports_timeout: bool = False
+    # Whether recognize_image() accepts already decoded pixels via ``image=``
+    # (a LoadedImage or an RGB ndarray) instead of reading image_path again
+    accepts_arrays: bool = False
+
     @abstractmethod
     def recognize_image(self, image_path: str, **kwargs) -> OCRResult:
         """Recognize text in an image."""
         pass
 
+    def unload(self):
+        """Release loaded models; the engine must not be used afterwards.
+
+        Engines drop their model references here so that gc can free them.
+        """
+        pass
+
+    def get_memory_usage(self) -> Optional[int]:
+        """Memory held by this engine in bytes, if it can be measured directly.
+
+        None means the factory uses the process RSS growth during loading.
+        """
+        return None
+
+    def recognize_images(
+        self, image_paths: List[str], batch_size: int = OCR_BATCH_SIZE, **kwargs
+    ) -> List[BatchItemResult]:
+        """Recognize text in several images.
+
+        The default implementation calls recognize_image() once per image;
+        engines with native batched inference override it.
+
+        Args:
+            image_paths: Image file paths
+            batch_size: Maximum number of images per native batch call
+            **kwargs: Arguments forwarded to recognize_image()
+
+        Returns:
+            One BatchItemResult per input path, in input order. A failing
+            image is reported on its own item and does not abort the batch.
+        """
+        return [self._recognize_one(path, **kwargs) for path in image_paths]
+
+    def _recognize_one(self, image_path: str, **kwargs) -> BatchItemResult:
+        """Recognize one image, capturing any error in the returned item."""
+        try:
+            return BatchItemResult(str(image_path), result=self.recognize_image(str(image_path), **kwargs))
+        except Exception as e:
+            return _batch_error(image_path, e)
+
 
 class PaddleOCREngine(OCREngine):
     """PaddleOCR engine implementation."""
 
-    def __init__(self):
-        """Initialize PaddleOCR engine."""
+    accepts_arrays = True
+
+    def __init__(self, lang: Optional[str] = None):
+        """Initialize PaddleOCR engine.
+
+        Args:
+            lang: Recognition language code (default: PADDLEOCR_LANG)
+        """
         self.logger = get_logger("PaddleOCREngine")
+        self.lang = lang or PADDLEOCR_LANG
         try:
             from paddleocr import PaddleOCR
 
             self.ocr = PaddleOCR(
                 use_textline_orientation=True,
-                lang=PADDLEOCR_LANG,
+                lang=self.lang,
             )
-            self.logger.info("PaddleOCR engine initialized successfully")
+            self.logger.info(f"PaddleOCR engine initialized successfully, 语言: {self.lang}")
         except ImportError:
             raise ImportError(
                 "PaddleOCR not installed. Install with: pip install -e '.[paddleocr]'"
             )
 
-    def recognize_image(self, image_path: str, **kwargs) -> OCRResult:
-        """Recognize text in an image using PaddleOCR."""
+    def recognize_image(
+        self, image_path: str, image: Optional["ImageInput"] = None, **kwargs
+    ) -> OCRResult:
+        """Recognize text in an image using PaddleOCR.
+
+        Args:
+            image_path: Path to image file
+            image: Already decoded image; when given, the file is not read again
+        """
         start_time = time.time()
         image_path = str(Path(image_path).resolve())
         
@@ -74,7 +223,9 @@ class PaddleOCREngine(OCREngine):
         progress_tracker = ProgressTracker(
             on_progress=lambda p, s, m: log_progress(
                 "PaddleOCREngine", p, m, stage=s, image_path=image_path
-            )
+            ),
+            min_interval=OCR_PROGRESS_MIN_INTERVAL,
+            record_history=OCR_PROGRESS_HISTORY,
         )
         
         self.logger.info(f"开始OCR识别: {image_path}", extra={"image_path": image_path})
@@ -88,7 +239,10 @@ class PaddleOCREngine(OCREngine):
             progress_tracker.update(20, "OCR引擎调用", "调用PaddleOCR引擎...")
             
             try:
-                result = self.ocr.ocr(image_path)
+                # PaddleOCR takes BGR arrays (OpenCV convention)
+                from .image_input import to_bgr_array
+                source = to_bgr_array(image) if image is not None else image_path
+                result = self.ocr.ocr(source)
                 progress_tracker.update(80, "结果解析", "OCR完成，开始解析结果")
             finally:
                 # 确保心跳在操作完成后停止
@@ -97,102 +251,17 @@ class PaddleOCREngine(OCREngine):
             self.logger.error(f"OCR引擎调用失败: {e}", exc_info=True)
             raise
 
-        # Parse PaddleOCR 3.x result format
-        # Result is a list of dicts, each dict contains:
-        # - rec_texts: list of recognized texts
-        # - rec_scores: list of confidence scores
-        # - rec_polys: list of polygons (4 points) for each text
-        text_parts = []
-        boxes = []
-        confidences = []
-
-        if result and len(result) > 0:
-            page_result = result[0]  # First page result
-            
-            # Determine total items for progress tracking
-            total_items = 0
-            if isinstance(page_result, dict):
-                total_items = len(page_result.get('rec_texts', []))
-            elif isinstance(page_result, (list, tuple)):
-                total_items = len(page_result)
-            
-            # PaddleOCR 3.x returns a dict with rec_texts, rec_scores, rec_polys
-            if isinstance(page_result, dict):
-                rec_texts = page_result.get('rec_texts', [])
-                rec_scores = page_result.get('rec_scores', [])
-                rec_polys = page_result.get('rec_polys', [])
-                
-                for i, text in enumerate(rec_texts):
-                    if text:  # Skip empty texts
-                        text_parts.append(text)
-                        confidence = rec_scores[i] if i < len(rec_scores) else 1.0
-                        confidences.append(float(confidence))
-                        
-                        # Extract bounding box from polygon (4 points)
-                        if i < len(rec_polys):
-                            poly = rec_polys[i]
-                            if poly is not None and len(poly) >= 4:
-                                # Get min/max coordinates from polygon
-                                x_coords = [p[0] for p in poly]
-                                y_coords = [p[1] for p in poly]
-                                boxes.append(
-                                    BoundingBox(
-                                        x1=float(min(x_coords)),
-                                        y1=float(min(y_coords)),
-                                        x2=float(max(x_coords)),
-                                        y2=float(max(y_coords)),
-                                    )
-                                )
-                            else:
-                                boxes.append(BoundingBox(0, 0, 0, 0))
-                        else:
-                            boxes.append(BoundingBox(0, 0, 0, 0))
-                    
-                    # Update progress during parsing
-                    if total_items > 0:
-                        progress = 80 + (i + 1) / total_items * 15
-                        if (i + 1) % max(1, total_items // 10) == 0 or i == total_items - 1:
-                            progress_tracker.update(
-                                progress,
-                                "结果解析",
-                                f"已解析 {i + 1}/{total_items} 个文本块"
-                            )
-            # Fallback for old format (list of tuples)
-            elif isinstance(page_result, (list, tuple)):
-                for idx, detection in enumerate(page_result):
-                    if detection and len(detection) >= 2:
-                        box, text_info = detection[0], detection[1]
-                        if isinstance(text_info, (list, tuple)) and len(text_info) >= 2:
-                            text, confidence = text_info[0], text_info[1]
-                        else:
-                            text, confidence = str(text_info), 1.0
-                        
-                        if text and box and len(box) >= 4:
-                            text_parts.append(text)
-                            boxes.append(
-                                BoundingBox(
-                                    x1=float(box[0][0]),
-                                    y1=float(box[0][1]),
-                                    x2=float(box[2][0]),
-                                    y2=float(box[2][1]),
-                                )
-                            )
-                            confidences.append(float(confidence))
-                    
-                    # Update progress during parsing
-                    if total_items > 0:
-                        progress = 80 + (idx + 1) / total_items * 15
-                        if (idx + 1) % max(1, total_items // 10) == 0 or idx == total_items - 1:
-                            progress_tracker.update(
-                                progress,
-                                "结果解析",
-                                f"已解析 {idx + 1}/{total_items} 个文本块"
-                            )
+        # Parse PaddleOCR result (3.x dict format or legacy list of tuples)
+        from .result_parser import parse_paddle_result
+        parsed = parse_paddle_result(result)
+        text_parts = parsed.texts
+        boxes = parsed.boxes
+        progress_tracker.update(
+            90, "结果解析", f"已解析 {len(text_parts)}/{len(text_parts)} 个文本块"
+        )
 
         full_text = "\n".join(text_parts)
-        avg_confidence = (
-            sum(confidences) / len(confidences) if confidences else 0.0
-        )
+        avg_confidence = parsed.confidence
         processing_time = time.time() - start_time
 
         progress_tracker.update(95, "后处理", "生成技术分析和视觉分析...")
@@ -201,6 +270,8 @@ class PaddleOCREngine(OCREngine):
             text=full_text,
             boxes=boxes,
             confidence=avg_confidence,
+            box_texts=parsed.texts,
+            box_scores=parsed.scores,
             engine="paddleocr",
             processing_time=processing_time,
             progress_history=progress_tracker.get_history(),
@@ -219,6 +290,19 @@ class PaddleOCREngine(OCREngine):
         
         return result
 
+    def unload(self):
+        """Release the PaddleOCR predictor."""
+        self.ocr = None
+
+    def recognize_images(
+        self, image_paths: List[str], batch_size: int = OCR_BATCH_SIZE, **kwargs
+    ) -> List[BatchItemResult]:
+        """Recognize several images with one PaddleOCR predict() call per chunk."""
+        if not hasattr(self.ocr, "predict"):
+            # PaddleOCR 2.x has no batched predict()
+            return super().recognize_images(image_paths, batch_size, **kwargs)
+        return _recognize_paddle_batch(self, "paddleocr", image_paths, batch_size, **kwargs)
+
 
 class DeepSeekOCREngine(OCREngine):
     """DeepSeek OCR engine implementation."""
@@ -251,12 +335,7 @@ class DeepSeekOCREngine(OCREngine):
                 modeling_llama.LlamaFlashAttention2 = LlamaFlashAttention2
 
             # Determine device: use CUDA if available, unless explicitly set to CPU
-            if DEEPSEEK_DEVICE == "cpu":
-                device = "cpu"
-            elif torch.cuda.is_available():
-                device = "cuda"  # Use CUDA if available
-            else:
-                device = "cpu"
+            device = resolve_deepseek_device()
             
             # Try to disable flash attention by setting environment variable
             os.environ.setdefault("TRANSFORMERS_ATTN_IMPLEMENTATION", "eager")
@@ -349,6 +428,22 @@ class DeepSeekOCREngine(OCREngine):
                 )
             raise
 
+    def unload(self):
+        """Release the model and tokenizer and free cached GPU memory."""
+        self.model = None
+        self.tokenizer = None
+        self.processor = None
+        if getattr(self, "device", "cpu") != "cpu":
+            try:
+                import torch
+                torch.cuda.empty_cache()
+            except Exception:
+                pass
+        temp_output_dir = getattr(self, "temp_output_dir", None)
+        if temp_output_dir:
+            import shutil
+            shutil.rmtree(temp_output_dir, ignore_errors=True)
+
     def recognize_image(self, image_path: str, **kwargs) -> OCRResult:
         """Recognize text in an image using DeepSeek OCR."""
         start_time = time.time()
@@ -359,7 +454,9 @@ class DeepSeekOCREngine(OCREngine):
         progress_tracker = ProgressTracker(
             on_progress=lambda p, s, m: log_progress(
                 "DeepSeekOCREngine", p, m, stage=s, image_path=image_path
-            )
+            ),
+            min_interval=OCR_PROGRESS_MIN_INTERVAL,
+            record_history=OCR_PROGRESS_HISTORY,
         )
         
         self.logger.info(f"开始OCR识别: {image_path}", extra={"image_path": image_path})
@@ -396,65 +493,67 @@ class DeepSeekOCREngine(OCREngine):
                 
                 progress_tracker.update(20, "OCR引擎调用", "调用DeepSeek OCR模型...")
             
-            try:
-                # Call model.infer() method (official API)
-                # Parameters: base_size, image_size, crop_mode based on official examples
-                result = self.model.infer(
-                    self.tokenizer,
-                    prompt=prompt,
-                    image_file=image_path,
-                    output_path=temp_output,
-                    base_size=1024,
-                    image_size=640,
-                    crop_mode=True,
-                    save_results=True,
-                    test_compress=False  # Set to False for faster inference
-                )
+                try:
+                    # Call model.infer() method (official API)
+                    # Parameters: base_size, image_size, crop_mode based on official examples
+                    result = self.model.infer(
+                        self.tokenizer,
+                        prompt=prompt,
+                        image_file=image_path,
+                        output_path=temp_output,
+                        base_size=1024,
+                        image_size=640,
+                        crop_mode=True,
+                        save_results=True,
+                        test_compress=False  # Set to False for faster inference
+                    )
                 
-                # Read the result file
-                result_file = os.path.join(temp_output, "result.mmd")
-                if not os.path.exists(result_file):
-                    result_file = os.path.join(temp_output, "result.txt")
+                    # Read the result file
+                    result_file = os.path.join(temp_output, "result.mmd")
+                    if not os.path.exists(result_file):
+                        result_file = os.path.join(temp_output, "result.txt")
                 
-                progress_tracker.update(80, "结果解析", "读取OCR结果文件...")
+                    progress_tracker.update(80, "结果解析", "读取OCR结果文件...")
                 
-                if os.path.exists(result_file):
-                    with open(result_file, "r", encoding="utf-8") as f:
-                        text = f.read().strip()
-                else:
-                    # If no result file, try to get text from return value
-                    if isinstance(result, str):
-                        text = result
-                    elif isinstance(result, dict) and "text" in result:
-                        text = result["text"]
+                    if os.path.exists(result_file):
+                        with open(result_file, "r", encoding="utf-8") as f:
+                            text = f.read().strip()
                     else:
-                        text = str(result) if result else ""
+                        # If no result file, try to get text from return value
+                        if isinstance(result, str):
+                            text = result
+                        elif isinstance(result, dict) and "text" in result:
+                            text = result["text"]
+                        else:
+                            text = str(result) if result else ""
                 
-            except Exception as e:
-                # Clean up temp directory on error
-                import shutil
-                try:
-                    shutil.rmtree(temp_output, ignore_errors=True)
-                except:
-                    pass
-                self.logger.error(f"DeepSeek OCR推理失败: {e}", exc_info=True)
-                raise RuntimeError(f"DeepSeek OCR inference failed: {e}")
-            finally:
-                # Clean up temp directory
-                import shutil
-                try:
-                    shutil.rmtree(temp_output, ignore_errors=True)
-                except:
-                    pass
-                # 确保心跳在操作完成后停止
-                progress_tracker.stop_heartbeat()
+                except Exception as e:
+                    # Clean up temp directory on error
+                    import shutil
+                    try:
+                        shutil.rmtree(temp_output, ignore_errors=True)
+                    except:
+                        pass
+                    self.logger.error(f"DeepSeek OCR推理失败: {e}", exc_info=True)
+                    raise RuntimeError(f"DeepSeek OCR inference failed: {e}")
+                finally:
+                    # Clean up temp directory
+                    import shutil
+                    try:
+                        shutil.rmtree(temp_output, ignore_errors=True)
+                    except:
+                        pass
+        finally:
+            # 确保心跳在操作完成后停止
+            progress_tracker.stop_heartbeat()
 
         processing_time = time.time() - start_time
         
+        text = text.strip()
         progress_tracker.update(95, "后处理", "生成技术分析和视觉分析...")
 
         result = OCRResult(
-            text=text.strip(),
+            text=text,
             boxes=[],  # DeepSeek OCR doesn't provide bounding boxes
             confidence=1.0,  # Default confidence
             engine="deepseek",
@@ -477,26 +576,44 @@ class DeepSeekOCREngine(OCREngine):
 
 
 class PaddleOCRMCPEngine(OCREngine):
-    """paddleocr-mcp engine implementation (subprocess call)."""
+    """paddleocr-mcp engine implementation (persistent PaddleOCR predictor)."""
+
+    accepts_arrays = True
 
     def __init__(self):
-        """Initialize paddleocr-mcp engine."""
+        """Initialize paddleocr-mcp engine.
+
+        paddleocr-mcp wraps PaddleOCR, so a single long-lived PaddleOCR predictor
+        is created here and reused for every call instead of reloading the
+        detection and recognition models per image.
+        """
         self.logger = get_logger("PaddleOCRMCPEngine")
-        # Check if paddleocr-mcp package is available
-        try:
-            import paddleocr_mcp
-            # paddleocr-mcp is an MCP server, we'll use subprocess to call it
-            # Check if we can import it (it's installed)
-            self.package_available = True
-            self.logger.info("paddleocr-mcp engine initialized successfully")
-        except ImportError:
+        # Check if paddleocr-mcp package is available (it is never imported)
+        if importlib.util.find_spec("paddleocr_mcp") is None:
             raise RuntimeError(
                 "paddleocr-mcp not installed. "
                 "Install with: pip install paddleocr-mcp"
             )
+        self.package_available = True
+        try:
+            from paddleocr import PaddleOCR
+        except ImportError:
+            raise RuntimeError(
+                "paddleocr-mcp requires PaddleOCR. "
+                "Install with: pip install -e '.[paddleocr]'"
+            )
+        self.ocr = PaddleOCR()
+        self.logger.info("paddleocr-mcp engine initialized successfully")
 
-    def recognize_image(self, image_path: str, **kwargs) -> OCRResult:
-        """Recognize text in an image using paddleocr-mcp via subprocess."""
+    def recognize_image(
+        self, image_path: str, image: Optional["ImageInput"] = None, **kwargs
+    ) -> OCRResult:
+        """Recognize text in an image using the persistent PaddleOCR predictor.
+
+        Args:
+            image_path: Path to image file
+            image: Already decoded image; when given, the file is not read again
+        """
         start_time = time.time()
         image_path = str(Path(image_path).resolve())
         
@@ -505,7 +622,9 @@ class PaddleOCRMCPEngine(OCREngine):
         progress_tracker = ProgressTracker(
             on_progress=lambda p, s, m: log_progress(
                 "PaddleOCRMCPEngine", p, m, stage=s, image_path=image_path
-            )
+            ),
+            min_interval=OCR_PROGRESS_MIN_INTERVAL,
+            record_history=OCR_PROGRESS_HISTORY,
         )
         
         self.logger.info(f"开始OCR识别: {image_path}", extra={"image_path": image_path})
@@ -515,83 +634,26 @@ class PaddleOCRMCPEngine(OCREngine):
         progress_tracker.start_heartbeat()
         
         try:
-            # paddleocr-mcp is an MCP server, we need to call it via Python module
-            # Try to use it as a Python module first, fallback to subprocess
             try:
-                import sys
-                import importlib.util
-                
-                # Try to use paddleocr-mcp's internal API if available
-                # Since paddleocr-mcp is an MCP server, we'll use subprocess to call it
-                # as a standalone MCP server process
-                
-                # Use python -m paddleocr_mcp to start the MCP server and communicate via stdio
-                # For now, we'll use a simplified approach: use PaddleOCR directly
-                # since paddleocr-mcp wraps PaddleOCR
-                
-                # Fallback: use PaddleOCR directly (paddleocr-mcp uses PaddleOCR internally)
                 progress_tracker.update(20, "OCR引擎调用", "调用PaddleOCR引擎...")
                 
-                from paddleocr import PaddleOCR
-                ocr = PaddleOCR()
-                result = ocr.ocr(image_path)
+                from .image_input import to_bgr_array
+                source = to_bgr_array(image) if image is not None else image_path
+                result = self.ocr.ocr(source)
                 
                 progress_tracker.update(80, "结果解析", "OCR完成，开始解析结果")
                 
                 # Parse result (same as PaddleOCREngine)
-                text_parts = []
-                boxes = []
-                confidences = []
-                
-                if result and len(result) > 0:
-                    page_result = result[0]
-                    total_items = 0
-                    if isinstance(page_result, dict):
-                        total_items = len(page_result.get('rec_texts', []))
-                    
-                    if isinstance(page_result, dict):
-                        rec_texts = page_result.get('rec_texts', [])
-                        rec_scores = page_result.get('rec_scores', [])
-                        rec_polys = page_result.get('rec_polys', [])
-                        
-                        for i, text in enumerate(rec_texts):
-                            if text:
-                                text_parts.append(text)
-                                confidence = rec_scores[i] if i < len(rec_scores) else 1.0
-                                confidences.append(float(confidence))
-                                
-                                if i < len(rec_polys):
-                                    poly = rec_polys[i]
-                                    if poly is not None and len(poly) >= 4:
-                                        x_coords = [p[0] for p in poly]
-                                        y_coords = [p[1] for p in poly]
-                                        boxes.append(
-                                            BoundingBox(
-                                                x1=float(min(x_coords)),
-                                                y1=float(min(y_coords)),
-                                                x2=float(max(x_coords)),
-                                                y2=float(max(y_coords)),
-                                            )
-                                        )
-                                    else:
-                                        boxes.append(BoundingBox(0, 0, 0, 0))
-                                else:
-                                    boxes.append(BoundingBox(0, 0, 0, 0))
-                            
-                            # Update progress during parsing
-                            if total_items > 0:
-                                progress = 80 + (i + 1) / total_items * 15
-                                if (i + 1) % max(1, total_items // 10) == 0 or i == total_items - 1:
-                                    progress_tracker.update(
-                                        progress,
-                                        "结果解析",
-                                        f"已解析 {i + 1}/{total_items} 个文本块"
-                                    )
+                from .result_parser import parse_paddle_result
+                parsed = parse_paddle_result(result)
+                text_parts = parsed.texts
+                boxes = parsed.boxes
+                progress_tracker.update(
+                    90, "结果解析", f"已解析 {len(text_parts)}/{len(text_parts)} 个文本块"
+                )
                 
                 full_text = "\n".join(text_parts)
-                avg_confidence = (
-                    sum(confidences) / len(confidences) if confidences else 0.0
-                )
+                avg_confidence = parsed.confidence
                 
             except Exception as e:
                 self.logger.error(f"paddleocr-mcp识别失败: {e}", exc_info=True)
@@ -608,6 +670,8 @@ class PaddleOCRMCPEngine(OCREngine):
             text=full_text,
             boxes=boxes,
             confidence=avg_confidence,
+            box_texts=parsed.texts,
+            box_scores=parsed.scores,
             engine="paddleocr_mcp",
             processing_time=processing_time,
             progress_history=progress_tracker.get_history(),
@@ -626,10 +690,25 @@ class PaddleOCRMCPEngine(OCREngine):
         
         return result
 
+    def unload(self):
+        """Release the PaddleOCR predictor."""
+        self.ocr = None
+
+    def recognize_images(
+        self, image_paths: List[str], batch_size: int = OCR_BATCH_SIZE, **kwargs
+    ) -> List[BatchItemResult]:
+        """Recognize several images with one PaddleOCR predict() call per chunk."""
+        if not hasattr(self.ocr, "predict"):
+            # PaddleOCR 2.x has no batched predict()
+            return super().recognize_images(image_paths, batch_size, **kwargs)
+        return _recognize_paddle_batch(self, "paddleocr_mcp", image_paths, batch_size, **kwargs)
+
 
 class EasyOCREngine(OCREngine):
     """EasyOCR engine implementation."""
 
+    accepts_arrays = True
+
     def __init__(self, languages: Optional[list] = None):
         """Initialize EasyOCR engine.
         
@@ -653,8 +732,15 @@ class EasyOCREngine(OCREngine):
         self.languages = languages
         self.logger.info(f"EasyOCR engine initialized with languages: {languages}")
 
-    def recognize_image(self, image_path: str, **kwargs) -> OCRResult:
-        """Recognize text in an image using EasyOCR."""
+    def recognize_image(
+        self, image_path: str, image: Optional["ImageInput"] = None, **kwargs
+    ) -> OCRResult:
+        """Recognize text in an image using EasyOCR.
+
+        Args:
+            image_path: Path to image file
+            image: Already decoded image; when given, the file is not read again
+        """
         start_time = time.time()
         image_path = Path(image_path).resolve()
         
@@ -663,7 +749,9 @@ class EasyOCREngine(OCREngine):
         progress_tracker = ProgressTracker(
             on_progress=lambda p, s, m: log_progress(
                 "EasyOCREngine", p, m, stage=s, image_path=str(image_path)
-            )
+            ),
+            min_interval=OCR_PROGRESS_MIN_INTERVAL,
+            record_history=OCR_PROGRESS_HISTORY,
         )
         
         self.logger.info(f"开始OCR识别: {image_path}", extra={"image_path": str(image_path)})
@@ -676,13 +764,18 @@ class EasyOCREngine(OCREngine):
             # Use PIL to read image (handles Unicode paths better than OpenCV)
             # Then convert to numpy array for EasyOCR
             try:
-                from PIL import Image
-                import numpy as np
-                
-                # Read image with PIL (supports Unicode paths)
-                pil_image = Image.open(str(image_path)).convert('RGB')
-                # Convert to numpy array
-                img_array = np.array(pil_image)
+                if image is not None:
+                    # Pixels were already decoded once by the caller (RGB)
+                    from .image_input import to_rgb_array
+                    img_array = to_rgb_array(image)
+                else:
+                    from PIL import Image
+                    import numpy as np
+                    
+                    # Read image with PIL (supports Unicode paths)
+                    pil_image = Image.open(str(image_path)).convert('RGB')
+                    # Convert to numpy array
+                    img_array = np.array(pil_image)
                 progress_tracker.update(20, "OCR引擎调用", "调用EasyOCR引擎...")
                 
                 # EasyOCR readtext returns: [[bbox, text, confidence], ...]
@@ -699,45 +792,16 @@ class EasyOCREngine(OCREngine):
             # 确保心跳在操作完成后停止
             progress_tracker.stop_heartbeat()
 
-        text_parts = []
-        boxes = []
-        confidences = []
-        total_items = len(results)
-
-        for idx, detection in enumerate(results):
-            if len(detection) >= 3:
-                bbox, text, confidence = detection[0], detection[1], detection[2]
-                
-                if text and bbox and len(bbox) >= 4:
-                    text_parts.append(text)
-                    confidences.append(float(confidence))
-                    
-                    # Convert 4-point polygon to bounding box (x1, y1, x2, y2)
-                    x_coords = [point[0] for point in bbox]
-                    y_coords = [point[1] for point in bbox]
-                    boxes.append(
-                        BoundingBox(
-                            x1=float(min(x_coords)),
-                            y1=float(min(y_coords)),
-                            x2=float(max(x_coords)),
-                            y2=float(max(y_coords)),
-                        )
-                    )
-            
-            # Update progress during parsing
-            if total_items > 0:
-                progress = 80 + (idx + 1) / total_items * 15
-                if (idx + 1) % max(1, total_items // 10) == 0 or idx == total_items - 1:
-                    progress_tracker.update(
-                        progress,
-                        "结果解析",
-                        f"已解析 {idx + 1}/{total_items} 个文本块"
-                    )
+        from .result_parser import parse_easyocr_result
+        parsed = parse_easyocr_result(results)
+        text_parts = parsed.texts
+        boxes = parsed.boxes
+        progress_tracker.update(
+            90, "结果解析", f"已解析 {len(text_parts)}/{len(results)} 个文本块"
+        )
 
         full_text = "\n".join(text_parts)
-        avg_confidence = (
-            sum(confidences) / len(confidences) if confidences else 0.0
-        )
+        avg_confidence = parsed.confidence
         processing_time = time.time() - start_time
         
         progress_tracker.update(95, "后处理", "生成技术分析和视觉分析...")
@@ -746,6 +810,8 @@ class EasyOCREngine(OCREngine):
             text=full_text,
             boxes=boxes,
             confidence=avg_confidence,
+            box_texts=parsed.texts,
+            box_scores=parsed.scores,
             engine="easyocr",
             processing_time=processing_time,
             progress_history=progress_tracker.get_history(),
@@ -764,12 +830,186 @@ class EasyOCREngine(OCREngine):
         
         return result
 
+    def unload(self):
+        """Release the EasyOCR reader."""
+        self.reader = None
+
+    def recognize_images(
+        self, image_paths: List[str], batch_size: int = OCR_BATCH_SIZE, **kwargs
+    ) -> List[BatchItemResult]:
+        """Recognize several images with EasyOCR readtext_batched().
+
+        readtext_batched() needs same-sized inputs, so images are grouped by
+        size (read from the file header) and each group is decoded and sent
+        in chunks of ``batch_size``.
+        """
+        from PIL import Image
+        import numpy as np
+        from .result_parser import parse_easyocr_result
+
+        items: List[Optional[BatchItemResult]] = [None] * len(image_paths)
+        groups = {}  # (width, height) -> [(index, resolved path)]
+        for i, path in enumerate(image_paths):
+            resolved = str(Path(path).resolve())
+            try:
+                with Image.open(resolved) as img:
+                    size = img.size
+            except Exception as e:
+                items[i] = _batch_error(path, e)
+                continue
+            groups.setdefault(size, []).append((i, resolved))
+
+        batch_size = max(1, batch_size)
+        for members in groups.values():
+            for start in range(0, len(members), batch_size):
+                chunk = members[start:start + batch_size]
+                self.logger.info(
+                    f"开始批量OCR识别: {len(chunk)} 张图片", extra={"batch_size": len(chunk)}
+                )
+                chunk_start = time.time()
+                try:
+                    arrays = []
+                    for _, path in chunk:
+                        with Image.open(path) as img:
+                            arrays.append(np.array(img.convert("RGB")))
+                    results = self.reader.readtext_batched(arrays, batch_size=batch_size)
+                    if len(results) != len(chunk):
+                        raise RuntimeError(
+                            f"readtext_batched() returned {len(results)} results for {len(chunk)} images"
+                        )
+                except Exception as e:
+                    # One bad image fails the whole call; retry the chunk image by image
+                    self.logger.warning(f"批量识别失败，改为逐张识别: {e}")
+                    for i, _ in chunk:
+                        items[i] = self._recognize_one(image_paths[i], **kwargs)
+                    continue
+
+                per_image_time = (time.time() - chunk_start) / len(chunk)
+                for (i, _), image_results in zip(chunk, results):
+                    try:
+                        items[i] = _batch_result(
+                            image_paths[i], parse_easyocr_result(image_results), "easyocr", per_image_time
+                        )
+                    except Exception as e:
+                        items[i] = _batch_error(image_paths[i], e)
+        return items
+
 
 class OCREngineFactory:
-    """Factory for creating OCR engines with lazy loading and resource management."""
+    """Factory for creating OCR engines with lazy loading and resource management.
+
+    Engine construction is single-flight: each engine key has its own lock, so
+    concurrent callers during a cold start wait for the in-progress load instead
+    of loading the same model several times.
+
+    get_engine() returns the shared primary instance. Callers that may run
+    concurrently should use acquire_engine(), which checks out a replica from
+    the engine's pool (size from ENGINE_POOL_SIZE / ENGINE_POOL_SIZE_<ENGINE>).
+
+    Loaded engines are unloaded again when idle for longer than their TTL
+    (ENGINE_IDLE_TTL / ENGINE_IDLE_TTL_<ENGINE>) or, least recently used first,
+    when their measured footprint exceeds ENGINE_MEMORY_BUDGET_MB. Engines
+    with a replica checked out are never unloaded.
+    """
 
     _engines: dict[str, OCREngine] = {}
     _engine_usage_count: dict[str, int] = {}  # Track usage count for each engine
+    _lock = threading.Lock()  # Guards _engine_locks, _pools, _engine_usage_count and _engine_info
+    _engine_locks: dict[str, threading.Lock] = {}  # Per-key initialization locks
+    _pools: dict[str, EnginePool] = {}  # Replica pools, seeded with the primary engine
+    # Resident engine bookkeeping: engine_type, loaded_at, last_used, memory_bytes
+    _engine_info: dict[str, dict] = {}
+    _reaper: Optional[threading.Thread] = None
+
+    @staticmethod
+    def get_engine_key(engine_type: str, **kwargs) -> str:
+        """Get the cache key for an engine type and its init arguments."""
+        # For easyocr, use languages as part of the key to support different language configs
+        if engine_type == "easyocr" and kwargs.get("languages"):
+            # Create a unique key for each language combination
+            return f"{engine_type}_{','.join(sorted(kwargs['languages']))}"
+        # PaddleOCR loads one language per engine; the configured one keeps the plain key
+        if engine_type == "paddleocr" and kwargs.get("lang") and kwargs["lang"] != PADDLEOCR_LANG:
+            return f"{engine_type}_{kwargs['lang']}"
+        return engine_type
+
+    @classmethod
+    def _create_engine(cls, engine_type: str, **kwargs) -> OCREngine:
+        """Construct a new engine instance (no caching) for the configured backend."""
+        if ENGINE_BACKEND == "process":
+            from .engine_worker import ProcessEngine
+            if engine_type not in ("paddleocr", "deepseek", "paddleocr_mcp", "easyocr"):
+                raise ValueError(f"Unknown engine type: {engine_type}")
+            return ProcessEngine(engine_type, **kwargs)
+        return cls._create_local_engine(engine_type, **kwargs)
+
+    @classmethod
+    def _create_local_engine(cls, engine_type: str, **kwargs) -> OCREngine:
+        """Construct a new in-process engine instance."""
+        if engine_type == "paddleocr":
+            return PaddleOCREngine(lang=kwargs.get("lang"))
+        elif engine_type == "deepseek":
+            return DeepSeekOCREngine()
+        elif engine_type == "paddleocr_mcp":
+            return PaddleOCRMCPEngine()
+        elif engine_type == "easyocr":
+            return EasyOCREngine(languages=kwargs.get("languages", None))
+        raise ValueError(f"Unknown engine type: {engine_type}")
+
+    @classmethod
+    def _get_engine_lock(cls, engine_key: str) -> threading.Lock:
+        """Get (or create) the initialization lock for an engine key."""
+        with cls._lock:
+            lock = cls._engine_locks.get(engine_key)
+            if lock is None:
+                lock = threading.Lock()
+                cls._engine_locks[engine_key] = lock
+            return lock
+
+    @classmethod
+    def _record_usage(cls, engine_key: str):
+        """Atomically increment the usage counter for an engine key."""
+        with cls._lock:
+            cls._engine_usage_count[engine_key] = cls._engine_usage_count.get(engine_key, 0) + 1
+            info = cls._engine_info.get(engine_key)
+            if info is not None:
+                info["last_used"] = time.monotonic()
+
+    @classmethod
+    def _touch(cls, engine_key: str):
+        """Mark an engine as used now (without counting a new use)."""
+        with cls._lock:
+            info = cls._engine_info.get(engine_key)
+            if info is not None:
+                info["last_used"] = time.monotonic()
+
+    @classmethod
+    def _create_measured(cls, engine_type: str, **kwargs) -> tuple:
+        """Construct an engine and measure its memory footprint.
+
+        Returns:
+            (engine, memory_bytes); the footprint is the engine's own report
+            or the process RSS growth during loading (0 if unmeasurable)
+        """
+        rss_before = get_process_rss()
+        engine = cls._create_engine(engine_type, **kwargs)
+        memory = engine.get_memory_usage()
+        if memory is None:
+            rss_after = get_process_rss()
+            if rss_before is not None and rss_after is not None:
+                memory = max(0, rss_after - rss_before)
+        return engine, memory or 0
+
+    @classmethod
+    def _create_replica(cls, engine_key: str, engine_type: str, **kwargs) -> OCREngine:
+        """Construct a pool replica and add its footprint to the engine's total."""
+        engine, memory = cls._create_measured(engine_type, **kwargs)
+        with cls._lock:
+            info = cls._engine_info.get(engine_key)
+            if info is not None:
+                info["memory_bytes"] += memory
+        cls.enforce_memory_budget(keep=engine_key)
+        return engine
 
     @classmethod
     def get_engine(cls, engine_type: str, **kwargs) -> OCREngine:
@@ -782,43 +1022,255 @@ class OCREngineFactory:
         Returns:
             OCREngine instance
         """
-        # For easyocr, use languages as part of the key to support different language configs
-        if engine_type == "easyocr" and "languages" in kwargs:
-            languages = kwargs.get('languages', None)
-            if languages:
-                # Create a unique key for each language combination
-                engine_key = f"{engine_type}_{','.join(sorted(languages))}"
-            else:
-                engine_key = engine_type
-        else:
-            engine_key = engine_type
-        
-        if engine_key not in cls._engines:
-            logger = get_logger("OCREngineFactory")
-            logger.info(f"初始化OCR引擎: {engine_type}")
-            try:
-                if engine_type == "paddleocr":
-                    cls._engines[engine_key] = PaddleOCREngine()
-                elif engine_type == "deepseek":
-                    cls._engines[engine_key] = DeepSeekOCREngine()
-                elif engine_type == "paddleocr_mcp":
-                    cls._engines[engine_key] = PaddleOCRMCPEngine()
-                elif engine_type == "easyocr":
-                    languages = kwargs.get('languages', None)
-                    cls._engines[engine_key] = EasyOCREngine(languages=languages)
+        engine_key = cls.get_engine_key(engine_type, **kwargs)
+
+        engine = cls._engines.get(engine_key)
+        if engine is None:
+            # Only one caller builds the engine; the others wait on the lock
+            # and pick up the finished instance.
+            with cls._get_engine_lock(engine_key):
+                engine = cls._engines.get(engine_key)
+                if engine is None:
+                    logger = get_logger("OCREngineFactory")
+                    logger.info(f"初始化OCR引擎: {engine_type}")
+                    try:
+                        engine, memory = cls._create_measured(engine_type, **kwargs)
+                    except Exception as e:
+                        logger.error(f"OCR引擎初始化失败: {engine_type}, 错误: {e}", exc_info=True)
+                        raise
+                    now = time.monotonic()
+                    with cls._lock:
+                        cls._engine_usage_count.setdefault(engine_key, 0)
+                        cls._engine_info[engine_key] = {
+                            "engine_type": engine_type,
+                            "loaded_at": now,
+                            "last_used": now,
+                            "memory_bytes": memory,
+                        }
+                        cls._engines[engine_key] = engine
+                    logger.info(
+                        f"OCR引擎初始化成功: {engine_type}, 内存占用约 {memory / 1024 / 1024:.1f} MB"
+                    )
+                    loaded = True
                 else:
-                    raise ValueError(f"Unknown engine type: {engine_type}")
-                
-                cls._engine_usage_count[engine_key] = 0
-                logger.info(f"OCR引擎初始化成功: {engine_type}")
-            except Exception as e:
-                logger.error(f"OCR引擎初始化失败: {engine_type}, 错误: {e}", exc_info=True)
-                raise
+                    loaded = False
+            if loaded:
+                cls.enforce_memory_budget(keep=engine_key)
+                cls._ensure_reaper(engine_type)
         
         # Track usage
-        cls._engine_usage_count[engine_key] = cls._engine_usage_count.get(engine_key, 0) + 1
-        return cls._engines[engine_key]
+        cls._record_usage(engine_key)
+        return engine
     
+    @classmethod
+    def _get_pool(
+        cls, engine_type: str, engine_key: str, primary: OCREngine, **kwargs
+    ) -> Optional[EnginePool]:
+        """Get (or create) the replica pool for an engine key.
+
+        Returns None if ``primary`` was unloaded in the meantime.
+        """
+        with cls._lock:
+            if cls._engines.get(engine_key) is not primary:
+                return None
+            pool = cls._pools.get(engine_key)
+            if pool is None:
+                pool = EnginePool(
+                    engine_key,
+                    create_replica=lambda: cls._create_replica(engine_key, engine_type, **kwargs),
+                    max_size=get_pool_size(engine_type),
+                    initial=primary,
+                )
+                cls._pools[engine_key] = pool
+            return pool
+
+    @classmethod
+    @contextmanager
+    def acquire_engine(
+        cls, engine_type: str, timeout: Optional[float] = None, **kwargs
+    ) -> Iterator[OCREngine]:
+        """Check out an engine replica for exclusive use.
+
+        Args:
+            engine_type: Type of engine ('paddleocr', 'easyocr', 'deepseek', 'paddleocr_mcp')
+            timeout: Maximum time to wait for a free replica (None waits forever)
+            **kwargs: Additional arguments for engine initialization
+
+        Yields:
+            OCREngine replica, returned to the pool on exit
+
+        Raises:
+            TimeoutError: If no replica became available within timeout
+        """
+        engine_key = cls.get_engine_key(engine_type, **kwargs)
+        while True:
+            primary = cls.get_engine(engine_type, **kwargs)
+            pool = cls._get_pool(engine_type, engine_key, primary, **kwargs)
+            if pool is None:
+                continue  # Unloaded between get_engine() and _get_pool(); reload
+            try:
+                engine = pool.checkout(timeout)
+                break
+            except PoolClosedError:
+                continue
+        try:
+            yield engine
+        finally:
+            pool.checkin(engine)
+            cls._touch(engine_key)
+
+    @classmethod
+    def unload_engine(cls, engine_key: str, reason: str = "manual") -> bool:
+        """Unload an engine and all of its replicas.
+
+        Args:
+            engine_key: Engine key (see get_engine_key())
+            reason: Reason recorded in the log ('manual', 'idle', 'memory')
+
+        Returns:
+            True if the engine was unloaded; False if it is not loaded, is
+            being loaded, or has a replica checked out
+        """
+        lock = cls._get_engine_lock(engine_key)
+        if not lock.acquire(blocking=False):
+            return False  # Being loaded right now
+        try:
+            with cls._lock:
+                engine = cls._engines.get(engine_key)
+                if engine is None:
+                    return False
+                pool = cls._pools.get(engine_key)
+                if pool is not None:
+                    replicas = pool.close_if_idle()
+                    if replicas is None:
+                        return False  # In use
+                else:
+                    replicas = [engine]
+                del cls._engines[engine_key]
+                cls._pools.pop(engine_key, None)
+                info = cls._engine_info.pop(engine_key, {})
+        finally:
+            lock.release()
+
+        logger = get_logger("OCREngineFactory")
+        for replica in replicas:
+            try:
+                replica.unload()
+            except Exception as e:
+                logger.warning(f"卸载引擎副本失败: {engine_key}, 错误: {e}", exc_info=True)
+        del engine, replicas
+        gc.collect()
+        logger.info(
+            f"已卸载OCR引擎: {engine_key} (原因: {reason}, "
+            f"释放约 {info.get('memory_bytes', 0) / 1024 / 1024:.1f} MB)"
+        )
+        return True
+
+    @classmethod
+    def evict_idle_engines(cls, now: Optional[float] = None) -> list[str]:
+        """Unload engines idle for longer than their TTL.
+
+        Args:
+            now: Current time.monotonic() value (for testing)
+
+        Returns:
+            Keys of the unloaded engines
+        """
+        now = time.monotonic() if now is None else now
+        with cls._lock:
+            candidates = [(key, dict(info)) for key, info in cls._engine_info.items()]
+        evicted = []
+        for key, info in candidates:
+            ttl = get_idle_ttl(info["engine_type"])
+            if ttl > 0 and now - info["last_used"] >= ttl and cls.unload_engine(key, reason="idle"):
+                evicted.append(key)
+        return evicted
+
+    @classmethod
+    def enforce_memory_budget(cls, keep: Optional[str] = None) -> list[str]:
+        """Unload least recently used engines until the footprint fits the budget.
+
+        Args:
+            keep: Engine key that must not be unloaded (the one just loaded)
+
+        Returns:
+            Keys of the unloaded engines
+        """
+        budget = ENGINE_MEMORY_BUDGET_MB * 1024 * 1024
+        if budget <= 0:
+            return []
+        with cls._lock:
+            candidates = sorted(
+                ((key, dict(info)) for key, info in cls._engine_info.items()),
+                key=lambda item: item[1]["last_used"],
+            )
+        total = sum(info["memory_bytes"] for _, info in candidates)
+        evicted = []
+        for key, info in candidates:
+            if total <= budget:
+                break
+            if key != keep and cls.unload_engine(key, reason="memory"):
+                total -= info["memory_bytes"]
+                evicted.append(key)
+        if total > budget:
+            get_logger("OCREngineFactory").warning(
+                f"引擎内存占用 {total / 1024 / 1024:.1f} MB 超过预算 "
+                f"{ENGINE_MEMORY_BUDGET_MB:.0f} MB，但其余引擎正在使用中"
+            )
+        return evicted
+
+    @classmethod
+    def _ensure_reaper(cls, engine_type: str):
+        """Start the background idle/budget reaper thread if configured."""
+        if get_idle_ttl(engine_type) <= 0 and ENGINE_MEMORY_BUDGET_MB <= 0:
+            return
+        with cls._lock:
+            if cls._reaper is not None and cls._reaper.is_alive():
+                return
+            cls._reaper = threading.Thread(
+                target=cls._reaper_loop, name="OCREngineReaper", daemon=True
+            )
+            cls._reaper.start()
+
+    @classmethod
+    def _reaper_loop(cls):
+        """Periodically unload idle engines and enforce the memory budget."""
+        logger = get_logger("OCREngineFactory")
+        while True:
+            time.sleep(ENGINE_REAPER_INTERVAL)
+            try:
+                cls.evict_idle_engines()
+                cls.enforce_memory_budget()
+            except Exception as e:
+                logger.error(f"引擎回收检查失败: {e}", exc_info=True)
+
+    @classmethod
+    def get_resident_engines(cls) -> dict:
+        """Get resident engines with their footprint and idle time."""
+        now = time.monotonic()
+        with cls._lock:
+            info = {key: dict(value) for key, value in cls._engine_info.items()}
+            pools = dict(cls._pools)
+        resident = {}
+        for key, value in info.items():
+            pool = pools.get(key)
+            resident[key] = {
+                "engine_type": value["engine_type"],
+                "memory_mb": round(value["memory_bytes"] / 1024 / 1024, 1),
+                "replicas": pool.get_stats()["size"] if pool is not None else 1,
+                "loaded_seconds": round(now - value["loaded_at"], 1),
+                "idle_seconds": round(now - value["last_used"], 1),
+                "idle_ttl": get_idle_ttl(value["engine_type"]),
+            }
+        return resident
+
+    @classmethod
+    def get_pool_stats(cls) -> dict:
+        """Get replica pool statistics for all engines."""
+        with cls._lock:
+            pools = dict(cls._pools)
+        return {key: pool.get_stats() for key, pool in pools.items()}
+
     @classmethod
     def get_engine_count(cls) -> int:
         """Get total number of loaded engines."""
@@ -827,9 +1279,13 @@ class OCREngineFactory:
     @classmethod
     def get_usage_stats(cls) -> dict:
         """Get usage statistics for all engines."""
+        with cls._lock:
+            usage_count = cls._engine_usage_count.copy()
         return {
             "total_engines": len(cls._engines),
             "engines": list(cls._engines.keys()),
-            "usage_count": cls._engine_usage_count.copy()
+            "usage_count": usage_count,
+            "pools": cls.get_pool_stats(),
+            "resident": cls.get_resident_engines(),
+            "memory_budget_mb": ENGINE_MEMORY_BUDGET_MB,
         }
-
@@ -0,0 +1,188 @@
+"""Background engine preloading, warm-up and per-engine readiness."""
+
+import threading
+import time
+from typing import Dict, List, Optional
+
+from PIL import Image, ImageDraw
+
+from .logger import get_logger
+from .config import PRELOAD_ENGINES, PRELOAD_WARMUP
+
+# Readiness states, in order
+PENDING = "pending"
+LOADING = "loading"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+_WARMUP_LINES = ("OCR warm-up 0123456789", "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def make_warmup_image():
+    """Build the synthetic image used for warm-up runs: a few lines of black text on white."""
+    from .image_input import LoadedImage
+
+    image = Image.new("RGB", (480, 40 * len(_WARMUP_LINES) + 20), "white")
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(_WARMUP_LINES):
+        draw.text((20, 20 + 40 * i), line, fill="black")
+    return LoadedImage(image, format="PNG")
+
+
+def _new_entry() -> dict:
+    return {"state": PENDING, "error": None, "load_time": None, "warmup_time": None}
+
+
+class EngineReadiness:
+    """Tracks which engines are being preloaded and whether they are ready.
+
+    Engines that were never scheduled for preloading have no entry; they are
+    loaded on first use as before.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states: Dict[str, dict] = {}
+        self._events: Dict[str, threading.Event] = {}
+
+    def schedule(self, engine_type: str):
+        """Register an engine as waiting to be preloaded."""
+        with self._lock:
+            self._states[engine_type] = _new_entry()
+            self._events[engine_type] = threading.Event()
+
+    def set_state(self, engine_type: str, state: str, error: Optional[str] = None, **timings: float):
+        """Move an engine to a new state; READY and FAILED wake up waiters."""
+        with self._lock:
+            entry = self._states.setdefault(engine_type, _new_entry())
+            entry["state"] = state
+            entry["error"] = error
+            entry.update({name: round(value, 3) for name, value in timings.items()})
+            event = self._events.setdefault(engine_type, threading.Event())
+        if state in (READY, FAILED):
+            event.set()
+
+    def get_state(self, engine_type: str) -> Optional[str]:
+        """Current state of an engine, or None if it is not being preloaded."""
+        with self._lock:
+            entry = self._states.get(engine_type)
+            return entry["state"] if entry is not None else None
+
+    def wait(self, engine_type: str, timeout: Optional[float] = None) -> Optional[str]:
+        """Wait until a preloading engine is ready or has failed.
+
+        Args:
+            engine_type: Engine to wait for
+            timeout: Maximum time to wait in seconds (None waits forever)
+
+        Returns:
+            The engine's state afterwards (None if it is not being preloaded)
+        """
+        with self._lock:
+            event = self._events.get(engine_type)
+        if event is not None:
+            event.wait(timeout)
+        return self.get_state(engine_type)
+
+    def get_status(self) -> Dict[str, dict]:
+        """Per-engine state, error, load time and warm-up time (seconds)."""
+        with self._lock:
+            return {engine: dict(entry) for engine, entry in sorted(self._states.items())}
+
+
+_readiness = EngineReadiness()
+
+
+def get_engine_readiness() -> EngineReadiness:
+    """Get the process-wide engine readiness registry."""
+    return _readiness
+
+
+def warm_up_engine(engine_type: str):
+    """Run one recognition on the synthetic image so one-time costs are paid up front.
+
+    The engine is checked out like for a request, so a concurrent request
+    never shares it with the warm-up run.
+    """
+    from .image_input import recognize_loaded
+    from .ocr_engine import OCREngineFactory
+
+    image = make_warmup_image()
+    try:
+        with OCREngineFactory.acquire_engine(engine_type) as engine:
+            recognize_loaded(engine, image)
+    finally:
+        image.release()
+
+
+def preload_engine(
+    engine_type: str, warmup: bool = PRELOAD_WARMUP, readiness: Optional[EngineReadiness] = None
+):
+    """Load an engine, optionally warm it up, and record its readiness.
+
+    Errors are logged and recorded, never raised: the engine is then loaded
+    on demand by the first request, as without preloading.
+    """
+    from .ocr_engine import OCREngineFactory
+
+    readiness = readiness or _readiness
+    logger = get_logger("preload")
+    readiness.set_state(engine_type, LOADING)
+    start = time.monotonic()
+    try:
+        OCREngineFactory.get_engine(engine_type)
+    except Exception as e:
+        logger.warning(f"预加载引擎失败: {engine_type}, 错误: {e}", exc_info=True)
+        readiness.set_state(engine_type, FAILED, error=f"{type(e).__name__}: {e}")
+        return
+    load_time = time.monotonic() - start
+    logger.info(f"预加载引擎成功: {engine_type}, 耗时 {load_time:.2f} 秒")
+
+    if not warmup:
+        readiness.set_state(engine_type, READY, load_time=load_time)
+        return
+
+    readiness.set_state(engine_type, WARMING, load_time=load_time)
+    start = time.monotonic()
+    try:
+        warm_up_engine(engine_type)
+    except Exception as e:
+        # The engine itself loaded fine; a failed warm-up only means the first request stays slow
+        logger.warning(f"引擎预热失败: {engine_type}, 错误: {e}", exc_info=True)
+    warmup_time = time.monotonic() - start
+    logger.info(f"引擎预热完成: {engine_type}, 耗时 {warmup_time:.2f} 秒")
+    readiness.set_state(engine_type, READY, load_time=load_time, warmup_time=warmup_time)
+
+
+def start_preload(
+    engine_types: Optional[List[str]] = None,
+    warmup: bool = PRELOAD_WARMUP,
+    readiness: Optional[EngineReadiness] = None,
+) -> List[threading.Thread]:
+    """Preload engines in parallel background threads and return immediately.
+
+    Args:
+        engine_types: Engines to preload (default: PRELOAD_ENGINES)
+        warmup: Run a warm-up recognition after loading (default: PRELOAD_WARMUP)
+        readiness: Registry to record states in (default: the process-wide one)
+
+    Returns:
+        The started (daemon) threads
+    """
+    engine_types = PRELOAD_ENGINES if engine_types is None else engine_types
+    readiness = readiness or _readiness
+    threads = []
+    for engine_type in dict.fromkeys(engine_types):
+        readiness.schedule(engine_type)
+        thread = threading.Thread(
+            target=preload_engine,
+            args=(engine_type, warmup, readiness),
+            name=f"OCRPreload-{engine_type}",
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+    if threads:
+        get_logger("preload").info(f"后台预加载引擎: {', '.join(dict.fromkeys(engine_types))}")
+    return threads
@@ -1,10 +1,14 @@
 """Progress tracking for OCR processing."""
 
+import heapq
+import itertools
 import time
 import threading
 from typing import Optional, Callable, List, Dict
 from dataclasses import dataclass
 
+from .streaming import ProgressStream, get_progress_stream
+
 
 @dataclass
 class ProgressUpdate:
@@ -16,13 +20,146 @@ class ProgressUpdate:
     message: str
 
 
+class _Heartbeat:
+    """A registered periodic callback; cancelled entries stay in the heap until popped."""
+
+    __slots__ = ("callback", "interval", "cancelled")
+
+    def __init__(self, callback: Callable[[], None], interval: float):
+        self.callback = callback
+        self.interval = interval
+        self.cancelled = False
+
+
+class HeartbeatScheduler:
+    """Drives the heartbeats of all active trackers from one thread.
+
+    Registered callbacks sit in a heap ordered by their next due time, so
+    registering is O(log n) and the thread sleeps until the earliest one is
+    due. Unregistering only marks the entry cancelled (it is dropped when it
+    reaches the top, or in a rebuild once cancelled entries dominate), so
+    stopping a heartbeat never waits for the thread.
+
+    Callbacks run on the scheduler thread and must be quick.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap: List[tuple] = []  # (due, sequence, _Heartbeat)
+        self._sequence = itertools.count()
+        self._cancelled = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, callback: Callable[[], None], interval: float) -> _Heartbeat:
+        """Call ``callback`` every ``interval`` seconds until unregistered.
+
+        Returns:
+            Handle to pass to unregister()
+        """
+        entry = _Heartbeat(callback, interval)
+        with self._cond:
+            heapq.heappush(self._heap, (time.monotonic() + interval, next(self._sequence), entry))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, daemon=True, name="ProgressHeartbeat"
+                )
+                self._thread.start()
+            elif self._heap[0][2] is entry:
+                self._cond.notify()  # Due before whatever the thread is waiting for
+        return entry
+
+    def unregister(self, entry: _Heartbeat):
+        """Stop a heartbeat; returns immediately."""
+        with self._cond:
+            if entry.cancelled:
+                return
+            entry.cancelled = True
+            self._cancelled += 1
+            if self._cancelled > len(self._heap) // 2:
+                self._heap = [item for item in self._heap if not item[2].cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+
+    def active_count(self) -> int:
+        """Number of registered heartbeats."""
+        with self._cond:
+            return len(self._heap) - self._cancelled
+
+    def _next_due(self) -> Optional[_Heartbeat]:
+        """Wait for and reschedule the next due heartbeat. Caller holds the condition."""
+        while True:
+            while self._heap and self._heap[0][2].cancelled:
+                heapq.heappop(self._heap)
+                self._cancelled -= 1
+            if not self._heap:
+                self._cond.wait()
+                continue
+            due, _, entry = self._heap[0]
+            delay = due - time.monotonic()
+            if delay > 0:
+                self._cond.wait(delay)
+                continue
+            # Next run counts from now, so a late tick never causes a burst
+            heapq.heapreplace(
+                self._heap, (time.monotonic() + entry.interval, next(self._sequence), entry)
+            )
+            return entry
+
+    def _run(self):
+        while True:
+            with self._cond:
+                entry = self._next_due()
+            try:
+                entry.callback()
+            except Exception:
+                # 忽略心跳错误，继续运行
+                pass
+
+
+_heartbeat_scheduler = HeartbeatScheduler()
+
+
+def get_heartbeat_scheduler() -> HeartbeatScheduler:
+    """Get the process-wide heartbeat scheduler."""
+    return _heartbeat_scheduler
+
+
+# Process-wide progress counters: updates received, emitted, and coalesced away
+_stats_lock = threading.Lock()
+_stats = {"updates": 0, "emitted": 0, "suppressed": 0}
+
+
+def _count(name: str):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def get_progress_stats() -> Dict[str, int]:
+    """Get process-wide counts of progress updates received, emitted and suppressed."""
+    with _stats_lock:
+        return dict(_stats)
+
+
 class ProgressTracker:
-    """Track OCR processing progress with heartbeat support."""
+    """Track OCR processing progress with heartbeat support.
+
+    Updates, heartbeats and recognized text are also forwarded to the MCP
+    client when the request has a progress stream.
+
+    With ``min_interval`` set, updates arriving sooner than that after the
+    last emitted one are coalesced: only the latest is kept, and it is
+    emitted by the next update or heartbeat once the interval has passed.
+    Updates that never get emitted count as suppressed. The final update
+    (100%) is always emitted.
+    """
 
     def __init__(
         self,
         on_progress: Optional[Callable[[float, str, str], None]] = None,
-        heartbeat_interval: float = 5.0
+        heartbeat_interval: float = 5.0,
+        stream: Optional[ProgressStream] = None,
+        min_interval: float = 0.0,
+        record_history: bool = True,
     ):
         """Initialize progress tracker.
         
@@ -30,8 +167,14 @@ class ProgressTracker:
             on_progress: Callback function called on progress updates.
                        Signature: (percentage: float, stage: str, message: str) -> None
             heartbeat_interval: 心跳间隔（秒），用于在长时间操作中保持连接活跃
+            stream: Client progress stream (default: the current request's, if any)
+            min_interval: Minimum seconds between emitted updates (0 = emit every update)
+            record_history: Keep every update in ``history`` (False = no history)
         """
         self.on_progress = on_progress
+        self.stream = stream or get_progress_stream()
+        self.min_interval = min_interval
+        self.record_history = record_history
         self.history: List[ProgressUpdate] = []
         self._current_percentage = 0.0
         self._current_stage = ""
@@ -39,8 +182,35 @@ class ProgressTracker:
         self.heartbeat_interval = heartbeat_interval
         self.last_heartbeat = time.time()
         self._last_update_time = time.time()
-        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._heartbeat: Optional[_Heartbeat] = None
         self._heartbeat_active = False
+        self._lock = threading.Lock()
+        self._pending: Optional[tuple] = None  # Coalesced update waiting to be emitted
+        self._last_emit: Optional[float] = None
+        self.updates = 0
+        self.emitted = 0
+        self.suppressed = 0
+
+    def _emit(self, percentage: float, stage: str, message: str):
+        """Send an update to the stream and the callback."""
+        self.last_heartbeat = time.time()
+        self._last_emit = time.monotonic()
+        self.emitted += 1
+        _count("emitted")
+
+        if self.stream is not None:
+            self.stream.report(percentage, f"{stage}: {message}" if message else stage)
+
+        if self.on_progress:
+            try:
+                self.on_progress(percentage, stage, message)
+            except Exception:
+                # Silently ignore callback errors
+                pass
+
+    def _due(self) -> bool:
+        """Whether the minimum interval since the last emitted update has passed."""
+        return self._last_emit is None or time.monotonic() - self._last_emit >= self.min_interval
 
     def update(
         self,
@@ -55,42 +225,65 @@ class ProgressTracker:
             stage: Current stage name
             message: Progress message
         """
-        self._current_percentage = max(0.0, min(100.0, percentage))
-        self._current_stage = stage
-        self._current_message = message
-        self._last_update_time = time.time()
-        
-        update = ProgressUpdate(
-            timestamp=time.time(),
-            percentage=self._current_percentage,
-            stage=stage,
-            message=message
-        )
-        self.history.append(update)
+        percentage = max(0.0, min(100.0, percentage))
+        with self._lock:
+            self._current_percentage = percentage
+            self._current_stage = stage
+            self._current_message = message
+            self._last_update_time = time.time()
+            self.updates += 1
+            _count("updates")
 
-        if self.on_progress:
-            try:
-                self.on_progress(
-                    self._current_percentage,
-                    stage,
-                    message
-                )
-                self.last_heartbeat = time.time()
-            except Exception:
-                # Silently ignore callback errors
-                pass
+            if self.record_history:
+                self.history.append(ProgressUpdate(
+                    timestamp=time.time(),
+                    percentage=percentage,
+                    stage=stage,
+                    message=message
+                ))
+
+            if not self.on_progress and self.stream is None:
+                return
+            if self._pending is not None:
+                # Superseded before it was emitted
+                self._pending = None
+                self.suppressed += 1
+                _count("suppressed")
+            if percentage < 100.0 and not self._due():
+                self._pending = (percentage, stage, message)
+                return
+            self._emit(percentage, stage, message)
+
+    def flush(self):
+        """Emit the coalesced update, if any, regardless of the minimum interval."""
+        with self._lock:
+            if self._pending is not None:
+                pending, self._pending = self._pending, None
+                self._emit(*pending)
     
     def send_heartbeat(self):
         """发送心跳进度更新，用于在长时间操作中保持连接活跃。
         
         即使进度没有变化，也会定期发送进度更新，防止客户端超时。
+        有被合并的进度更新且已过最小间隔时，先发送该更新。
         """
-        if not self.on_progress:
+        if not self.on_progress and self.stream is None:
             return
-        
+
+        with self._lock:
+            if self._pending is not None and self._due():
+                pending, self._pending = self._pending, None
+                self._emit(*pending)
+                return
+
         now = time.time()
         # 如果距离上次更新超过心跳间隔，发送心跳
         if now - self.last_heartbeat >= self.heartbeat_interval:
+            if self.stream is not None:
+                self.stream.report(self._current_percentage, f"处理中... ({self._current_message})")
+                if not self.on_progress:
+                    self.last_heartbeat = now
+                    return
             try:
                 # 发送当前进度作为心跳
                 self.on_progress(
@@ -104,39 +297,29 @@ class ProgressTracker:
                 pass
     
     def start_heartbeat(self):
-        """启动自动心跳线程，确保在长时间操作中持续发送心跳。
+        """启动自动心跳，确保在长时间操作中持续发送心跳。
         
+        心跳由进程级的 HeartbeatScheduler 统一调度，不为每个请求创建线程。
         防止连接因长时间无响应而中断。
         """
-        if self._heartbeat_active or not self.on_progress:
+        if self._heartbeat_active or (not self.on_progress and self.stream is None):
             return
         
         self._heartbeat_active = True
-        
-        def heartbeat_loop():
-            """心跳循环，定期发送进度更新。"""
-            while self._heartbeat_active:
-                try:
-                    time.sleep(self.heartbeat_interval)
-                    if self._heartbeat_active:
-                        self.send_heartbeat()
-                except Exception:
-                    # 忽略心跳错误，继续运行
-                    pass
-        
-        self._heartbeat_thread = threading.Thread(
-            target=heartbeat_loop,
-            daemon=True,  # 守护线程，主线程退出时自动退出
-            name="ProgressHeartbeat"
+        self._heartbeat = get_heartbeat_scheduler().register(
+            self._heartbeat_tick, self.heartbeat_interval
         )
-        self._heartbeat_thread.start()
+
+    def _heartbeat_tick(self):
+        if self._heartbeat_active:
+            self.send_heartbeat()
     
     def stop_heartbeat(self):
-        """停止自动心跳线程。"""
+        """停止自动心跳（立即返回）。"""
         self._heartbeat_active = False
-        if self._heartbeat_thread and self._heartbeat_thread.is_alive():
-            # 等待线程结束（最多等待1秒）
-            self._heartbeat_thread.join(timeout=1.0)
+        if self._heartbeat is not None:
+            get_heartbeat_scheduler().unregister(self._heartbeat)
+            self._heartbeat = None
 
     def get_history(self) -> List[Dict]:
         """Get progress history as list of dicts.
@@ -165,9 +348,15 @@ class ProgressTracker:
             "stage": self._current_stage
         }
 
+    def get_stats(self) -> Dict[str, int]:
+        """Get counts of updates received, emitted and suppressed (coalesced away)."""
+        return {"updates": self.updates, "emitted": self.emitted, "suppressed": self.suppressed}
+
     def reset(self):
         """Reset progress tracker."""
         self.stop_heartbeat()
+        with self._lock:
+            self._pending = None
         self.history.clear()
         self._current_percentage = 0.0
         self._current_stage = ""
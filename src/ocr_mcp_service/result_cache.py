@@ -0,0 +1,228 @@
+"""Content-addressed OCR result cache with an LRU memory tier and a disk tier."""
+
+import dataclasses
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from .models import OCRResult
+from .logger import get_logger
+from .config import (
+    OCR_CACHE_ENABLED,
+    OCR_CACHE_MAX_ENTRIES,
+    OCR_CACHE_DIR,
+    OCR_CACHE_DISK_MAX_ENTRIES,
+)
+
+# Read size when hashing image files
+_HASH_CHUNK_SIZE = 1024 * 1024
+# Call arguments that do not change the recognition result
+_IGNORED_PARAMS = {"timeout"}
+
+
+def hash_file(path: str) -> str:
+    """Compute the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Two-tier OCR result cache.
+
+    Keys combine the SHA-256 of the image bytes with the engine key and the
+    recognition parameters, so renamed or copied files still hit and edited
+    files miss. The memory tier is a size-bounded LRU; the optional disk tier
+    stores one JSON file per result and survives server restarts.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = OCR_CACHE_MAX_ENTRIES,
+        disk_dir: Optional[str] = OCR_CACHE_DIR,
+        max_disk_entries: int = OCR_CACHE_DISK_MAX_ENTRIES,
+    ):
+        """Initialize result cache.
+
+        Args:
+            max_entries: Maximum number of results kept in memory
+            disk_dir: Directory for the disk tier (None disables it)
+            max_disk_entries: Maximum number of results kept on disk
+        """
+        self.max_entries = max(0, max_entries)
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.max_disk_entries = max(1, max_disk_entries)
+        self._memory: "OrderedDict[str, OCRResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_count: Optional[int] = None  # Counted lazily on first disk write
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self.logger = get_logger("ResultCache")
+
+    @staticmethod
+    def make_key(
+        image_path: str, engine_key: str, params: Optional[dict] = None, file_hash: Optional[str] = None
+    ) -> str:
+        """Build a cache key for an image, engine and recognition parameters.
+
+        Args:
+            image_path: Path to the image file
+            engine_key: Engine cache key
+            params: Recognition parameters that affect the result
+            file_hash: Precomputed hash_file() digest, e.g. shared by the pages of one document
+
+        Raises:
+            OSError: If the image cannot be read
+        """
+        params = {k: v for k, v in (params or {}).items() if k not in _IGNORED_PARAMS}
+        meta = json.dumps([engine_key, params], sort_keys=True, default=str)
+        return hashlib.sha256(f"{file_hash or hash_file(image_path)}:{meta}".encode("utf-8")).hexdigest()
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[OCRResult]:
+        """Look up a result.
+
+        Returns:
+            Copy of the cached result with ``cache_hit=True``, or None
+        """
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self._hits += 1
+                return dataclasses.replace(result, cache_hit=True)
+
+        result = self._read_disk(key)
+        with self._lock:
+            if result is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._disk_hits += 1
+            self._put_memory(key, result)
+        return dataclasses.replace(result, cache_hit=True)
+
+    def put(self, key: str, result: OCRResult):
+        """Store a result in both tiers."""
+        result = dataclasses.replace(result, cache_hit=False)
+        with self._lock:
+            self._put_memory(key, result)
+        self._write_disk(key, result)
+
+    def _put_memory(self, key: str, result: OCRResult):
+        """Insert into the LRU tier (caller holds the lock)."""
+        if self.max_entries == 0:
+            return
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._evictions += 1
+
+    def _read_disk(self, key: str) -> Optional[OCRResult]:
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = OCRResult.from_dict(json.load(f))
+            os.utime(path)  # Refresh mtime so pruning removes least recently used entries
+            return result
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"读取磁盘缓存失败，已忽略: {path}: {e}")
+            return None
+
+    def _write_disk(self, key: str, result: OCRResult):
+        if self.disk_dir is None:
+            return
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            is_new = not path.exists()
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(result.to_dict(), f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.warning(f"写入磁盘缓存失败，已忽略: {path}: {e}")
+            return
+
+        with self._lock:
+            if self._disk_count is None:
+                self._disk_count = sum(1 for _ in self.disk_dir.glob("*/*.json"))
+            elif is_new:
+                self._disk_count += 1
+            prune = self._disk_count > self.max_disk_entries
+        if prune:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        """Remove the least recently used disk entries down to 90% of the limit."""
+        files = []
+        for path in self.disk_dir.glob("*/*.json"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        files.sort()
+        target = int(self.max_disk_entries * 0.9)
+        removed = 0
+        for _, path in files[:max(0, len(files) - target)]:
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                continue
+        with self._lock:
+            self._disk_count = len(files) - removed
+            self._evictions += removed
+        self.logger.info(f"清理磁盘缓存: 删除 {removed} 个条目")
+
+    def clear(self):
+        """Drop all memory entries (disk entries are kept)."""
+        with self._lock:
+            self._memory.clear()
+
+    def get_stats(self) -> dict:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "disk_dir": str(self.disk_dir) if self.disk_dir else None,
+                "disk_entries": self._disk_count,
+            }
+
+
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Get the shared result cache, or None when caching is disabled."""
+    global _result_cache
+    if not OCR_CACHE_ENABLED:
+        return None
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                _result_cache = ResultCache()
+    return _result_cache
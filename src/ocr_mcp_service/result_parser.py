@@ -0,0 +1,189 @@
+"""Shared, vectorized parsers for PaddleOCR and EasyOCR raw results."""
+
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+from .models import BoundingBox
+
+
+@dataclass
+class ParsedOCR:
+    """Parsed engine output: one entry per kept text block."""
+
+    texts: List[str]
+    scores: List[float]
+    boxes: List[BoundingBox]
+    confidence: float
+    # (N, 4) float array of x1, y1, x2, y2 aligned with texts
+    box_array: Optional[np.ndarray] = field(default=None, repr=False)
+
+    @property
+    def text(self) -> str:
+        """Full text, one line per text block."""
+        return "\n".join(self.texts)
+
+
+def _empty_boxes(n: int = 0) -> np.ndarray:
+    return np.zeros((n, 4), dtype=np.float64)
+
+
+def polys_to_boxes(polys: Sequence[Any]) -> np.ndarray:
+    """Convert polygons to axis-aligned boxes.
+
+    Args:
+        polys: Sequence of polygons, each a sequence of (x, y) points
+
+    Returns:
+        (N, 4) array of x1, y1, x2, y2. Polygons that are None or have fewer
+        than 4 points map to an all-zero box.
+    """
+    n = len(polys)
+    if n == 0:
+        return _empty_boxes()
+
+    # Fast path: all polygons have the same number of points
+    arr = None
+    if isinstance(polys[0], (list, tuple)) and all(
+        poly is not None and len(poly) == 4 for poly in polys
+    ):
+        # Nested Python lists (EasyOCR): flattening is much cheaper than np.asarray
+        try:
+            flat = np.fromiter(
+                chain.from_iterable(chain.from_iterable(polys)), dtype=np.float64, count=n * 8
+            )
+            arr = flat.reshape(n, 4, 2)
+        except (ValueError, TypeError):
+            arr = None
+    if arr is None:
+        try:
+            arr = np.asarray(polys, dtype=np.float64)
+        except (ValueError, TypeError):
+            arr = None
+    if arr is not None and arr.ndim == 3 and arr.shape[0] == n and arr.shape[2] >= 2:
+        if arr.shape[1] < 4:
+            return _empty_boxes(n)
+        points = arr[..., :2]
+        return np.concatenate([points.min(axis=1), points.max(axis=1)], axis=1)
+
+    # Ragged input (mixed point counts or missing polygons)
+    boxes = _empty_boxes(n)
+    for i, poly in enumerate(polys):
+        if poly is not None and len(poly) >= 4:
+            points = np.asarray(poly, dtype=np.float64).reshape(-1, 2)
+            boxes[i, :2] = points.min(axis=0)
+            boxes[i, 2:] = points.max(axis=0)
+    return boxes
+
+
+def _build(texts: List[str], scores: np.ndarray, boxes: np.ndarray) -> ParsedOCR:
+    """Assemble a ParsedOCR from aligned texts, scores and boxes."""
+    box_list = [BoundingBox(*row) for row in boxes.tolist()]
+    return ParsedOCR(
+        texts=texts,
+        scores=scores.tolist(),
+        boxes=box_list,
+        confidence=float(scores.mean()) if len(texts) else 0.0,
+        box_array=boxes,
+    )
+
+
+def _parse_paddle_dict(page: dict) -> ParsedOCR:
+    """Parse PaddleOCR 3.x page dict (rec_texts, rec_scores, rec_polys)."""
+    rec_texts = list(page.get("rec_texts", []) or [])
+    rec_scores = page.get("rec_scores", [])
+    rec_polys = page.get("rec_polys", [])
+    if rec_scores is None:
+        rec_scores = []
+    if rec_polys is None:
+        rec_polys = []
+    n = len(rec_texts)
+
+    # Missing scores default to 1.0, missing polygons to an all-zero box
+    scores = np.ones(n, dtype=np.float64)
+    m = min(n, len(rec_scores))
+    if m:
+        scores[:m] = np.asarray(rec_scores[:m], dtype=np.float64)
+
+    boxes = _empty_boxes(n)
+    m = min(n, len(rec_polys))
+    if m:
+        boxes[:m] = polys_to_boxes(rec_polys[:m])
+
+    # Skip empty texts
+    keep = np.fromiter((bool(t) for t in rec_texts), dtype=bool, count=n)
+    texts = [t for t in rec_texts if t]
+    return _build(texts, scores[keep], boxes[keep])
+
+
+def _parse_paddle_legacy(page: Sequence[Any]) -> ParsedOCR:
+    """Parse legacy PaddleOCR page: list of (box, (text, confidence))."""
+    texts = []
+    scores = []
+    polys = []
+    for detection in page:
+        if not detection or len(detection) < 2:
+            continue
+        box, text_info = detection[0], detection[1]
+        if isinstance(text_info, (list, tuple)) and len(text_info) >= 2:
+            text, confidence = text_info[0], text_info[1]
+        else:
+            text, confidence = str(text_info), 1.0
+        if text and box is not None and len(box) >= 4:
+            texts.append(text)
+            scores.append(confidence)
+            polys.append(box)
+
+    if not texts:
+        return _build([], np.zeros(0), _empty_boxes())
+
+    # Legacy boxes use the top-left (point 0) and bottom-right (point 2) corners
+    try:
+        arr = np.asarray(polys, dtype=np.float64)
+        corners = np.concatenate([arr[:, 0, :2], arr[:, 2, :2]], axis=1)
+    except (ValueError, TypeError, IndexError):
+        corners = np.array(
+            [[b[0][0], b[0][1], b[2][0], b[2][1]] for b in polys], dtype=np.float64
+        )
+    return _build(texts, np.asarray(scores, dtype=np.float64), corners)
+
+
+def parse_paddle_result(result: Any) -> ParsedOCR:
+    """Parse PaddleOCR ``ocr()``/``predict()`` output for the first page.
+
+    Supports the 3.x format (a dict per page with rec_texts, rec_scores and
+    rec_polys) and the legacy format (a list of (box, (text, confidence))).
+    """
+    if not result or len(result) == 0:
+        return _build([], np.zeros(0), _empty_boxes())
+    return parse_paddle_page(result[0])
+
+
+def parse_paddle_page(page: Any) -> ParsedOCR:
+    """Parse a single PaddleOCR page result (3.x dict or legacy list)."""
+    if isinstance(page, dict):
+        return _parse_paddle_dict(page)
+    if isinstance(page, (list, tuple)):
+        return _parse_paddle_legacy(page)
+    return _build([], np.zeros(0), _empty_boxes())
+
+
+def parse_easyocr_result(results: Sequence[Any]) -> ParsedOCR:
+    """Parse EasyOCR ``readtext`` output: list of (bbox, text, confidence)."""
+    texts = []
+    scores = []
+    polys = []
+    for detection in results:
+        if len(detection) < 3:
+            continue
+        bbox, text, confidence = detection[0], detection[1], detection[2]
+        if text and bbox is not None and len(bbox) >= 4:
+            texts.append(text)
+            scores.append(confidence)
+            polys.append(bbox)
+
+    if not texts:
+        return _build([], np.zeros(0), _empty_boxes())
+    return _build(texts, np.asarray(scores, dtype=np.float64), polys_to_boxes(polys))
@@ -0,0 +1,178 @@
+"""Stream a request's progress and partial OCR text to the MCP client."""
+
+import asyncio
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterator, List, Optional, Sequence
+
+from .logger import get_logger
+from .config import OCR_STREAM_CHUNK_LINES
+
+# Smallest step between two notifications; MCP requires progress to increase
+_MIN_STEP = 1e-3
+
+_current_stream: ContextVar[Optional["ProgressStream"]] = ContextVar(
+    "ocr_progress_stream", default=None
+)
+
+
+class ProgressStream:
+    """Sends one request's progress and recognized text as MCP progress notifications.
+
+    Engines run on worker threads, so notifications are scheduled onto the
+    event loop that owns the request. Progress is reported on a 0-100 scale;
+    ``span()`` maps a sub-task (e.g. one page) onto part of that scale.
+    Reported values only ever increase, as MCP requires.
+
+    Text is sent in chunks of lines, each as a message of the form
+    ``"[文本 N]\\n<lines>"``; ``chunks`` keeps every chunk sent, in order.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[float, Optional[float], str], Awaitable[Any]],
+        loop: asyncio.AbstractEventLoop,
+        chunk_lines: int = OCR_STREAM_CHUNK_LINES,
+    ):
+        """Initialize the stream.
+
+        Args:
+            send: Coroutine function sending one notification as (progress, total, message)
+            loop: Event loop the request runs on
+            chunk_lines: Lines of recognized text per notification
+        """
+        self._send = send
+        self._loop = loop
+        self.chunk_lines = max(1, chunk_lines)
+        self._lock = threading.Lock()
+        self._last = 0.0
+        self._span = (0.0, 100.0)
+        self.chunks: List[str] = []
+        self.notifications = 0
+
+    @classmethod
+    def from_context(cls, ctx: Any) -> Optional["ProgressStream"]:
+        """Create a stream for a FastMCP Context, or None if the client sent no progress token.
+
+        Must be called on the request's event loop.
+        """
+        request = getattr(ctx, "request_context", None) if ctx is not None else None
+        meta = getattr(request, "meta", None)
+        if getattr(meta, "progressToken", None) is None:
+            return None
+        return cls(ctx.report_progress, asyncio.get_running_loop())
+
+    def _dispatch(self, progress: float, message: str):
+        def log_failure(future):
+            if not future.cancelled() and future.exception() is not None:
+                get_logger("streaming").debug(f"发送进度通知失败: {future.exception()}")
+
+        coro = self._send(progress, 100.0, message)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._loop.create_task(coro).add_done_callback(log_failure)
+        else:
+            try:
+                asyncio.run_coroutine_threadsafe(coro, self._loop).add_done_callback(log_failure)
+            except RuntimeError:
+                # The loop is closed: the request is gone
+                coro.close()
+
+    def _notify(self, progress: Optional[float], message: str):
+        """Send a notification at an absolute progress (None = where the last one was)."""
+        with self._lock:
+            if progress is None:
+                progress = self._last
+            if self.notifications:
+                progress = max(progress, self._last + _MIN_STEP)
+            self._last = progress
+            self.notifications += 1
+            # Dispatch under the lock so notifications are scheduled in progress order
+            self._dispatch(progress, message)
+
+    def report(self, percentage: float, message: str = ""):
+        """Send a progress notification.
+
+        Args:
+            percentage: Progress of the current span (0-100)
+            message: Human-readable status
+        """
+        with self._lock:
+            low, high = self._span
+        self._notify(low + (high - low) * min(max(percentage, 0.0), 100.0) / 100.0, message)
+
+    def emit_text(self, texts: Sequence[str]) -> str:
+        """Send recognized lines in chunks and return the text assembled from those chunks.
+
+        Args:
+            texts: Recognized lines, in reading order
+
+        Returns:
+            The chunks joined with newlines (equal to "\\n".join(texts))
+        """
+        chunks = [
+            "\n".join(texts[i:i + self.chunk_lines]) for i in range(0, len(texts), self.chunk_lines)
+        ]
+        for chunk in chunks:
+            with self._lock:
+                self.chunks.append(chunk)
+                number = len(self.chunks)
+            self._notify(None, f"[文本 {number}]\n{chunk}")
+        return "\n".join(chunks)
+
+    @contextmanager
+    def span(self, start: float, end: float) -> Iterator[None]:
+        """Map progress reported inside the block onto [start, end] of the current span.
+
+        Args:
+            start: Start of the sub-task, as a percentage of the current span
+            end: End of the sub-task, as a percentage of the current span
+        """
+        with self._lock:
+            outer = self._span
+            low, high = outer
+            self._span = (low + (high - low) * start / 100.0, low + (high - low) * end / 100.0)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._span = outer
+
+
+def get_progress_stream() -> Optional[ProgressStream]:
+    """Get the progress stream of the current request, if any."""
+    return _current_stream.get()
+
+
+@contextmanager
+def streaming(stream: Optional[ProgressStream]) -> Iterator[Optional[ProgressStream]]:
+    """Make ``stream`` the current request's progress stream inside the block.
+
+    Work started inside the block inherits it as long as the context is
+    propagated to worker threads (run_ocr and with_timeout do this).
+    """
+    token = _current_stream.set(stream)
+    try:
+        yield stream
+    finally:
+        _current_stream.reset(token)
+
+
+def emit_text(texts: Sequence[str], stream: Optional[ProgressStream] = None) -> str:
+    """Stream recognized lines to the client (if a stream is active) and return the full text.
+
+    Args:
+        texts: Recognized lines, in reading order
+        stream: Stream to use (default: the current request's)
+
+    Returns:
+        "\\n".join(texts), assembled from the streamed chunks
+    """
+    stream = stream or get_progress_stream()
+    if stream is None:
+        return "\n".join(texts)
+    return stream.emit_text(list(texts))
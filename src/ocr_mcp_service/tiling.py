@@ -0,0 +1,296 @@
+"""Tiled recognition for very large images."""
+
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from .image_input import LoadedImage
+from .models import BoundingBox, OCRResult
+from .ocr_engine import _add_analysis_to_result
+from .logger import get_logger
+from .streaming import get_progress_stream
+from .config import (
+    OCR_TILE_SIZE,
+    OCR_TILE_OVERLAP,
+    OCR_TILE_WORKERS,
+    OCR_TILE_IOU_THRESHOLD,
+)
+
+# A box covering this much of a smaller box from another tile is the same text
+# cut at a tile edge, even when their IoU is low
+_CONTAINMENT_THRESHOLD = 0.8
+
+
+def plan_tiles(width: int, height: int, tile_size: int, overlap: int) -> List[Tuple[int, int, int, int]]:
+    """Split an image into overlapping tiles.
+
+    Args:
+        width: Image width in pixels
+        height: Image height in pixels
+        tile_size: Maximum tile side length
+        overlap: Overlap between neighbouring tiles in pixels
+
+    Returns:
+        Tiles as (x0, y0, x1, y1), row by row
+    """
+    tile_size = max(1, tile_size)
+    overlap = min(max(0, overlap), tile_size // 2)
+
+    def starts(length: int) -> List[int]:
+        if length <= tile_size:
+            return [0]
+        # Fewest tiles that keep at least ``overlap``, spread evenly so the
+        # last tile ends flush with the edge
+        count = -(-(length - overlap) // (tile_size - overlap))
+        span = length - tile_size
+        return [round(i * span / (count - 1)) for i in range(count)]
+
+    return [
+        (x, y, min(x + tile_size, width), min(y + tile_size, height))
+        for y in starts(height)
+        for x in starts(width)
+    ]
+
+
+def box_iou(boxes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Pairwise IoU and intersection-over-smaller-area for (N, 4) boxes.
+
+    Returns:
+        (iou, ios) matrices of shape (N, N)
+    """
+    x1, y1, x2, y2 = boxes.T
+    areas = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    iw = np.clip(np.minimum(x2[:, None], x2) - np.maximum(x1[:, None], x1), 0, None)
+    ih = np.clip(np.minimum(y2[:, None], y2) - np.maximum(y1[:, None], y1), 0, None)
+    inter = iw * ih
+    with np.errstate(divide="ignore", invalid="ignore"):
+        iou = np.nan_to_num(inter / (areas[:, None] + areas - inter))
+        ios = np.nan_to_num(inter / np.minimum(areas[:, None], areas))
+    return iou, ios
+
+
+def dedupe_boxes(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    tile_ids: np.ndarray,
+    overlap_mask: np.ndarray,
+    iou_threshold: float = OCR_TILE_IOU_THRESHOLD,
+) -> np.ndarray:
+    """Drop duplicate detections of the same text from neighbouring tiles.
+
+    Only boxes touching an overlap zone are compared, and only against boxes
+    from other tiles. Of a duplicate pair the larger box is kept (the copy not
+    cut by a tile edge), then the more confident one.
+
+    Args:
+        boxes: (N, 4) boxes in image coordinates
+        scores: (N,) confidences
+        tile_ids: (N,) index of the tile each box came from
+        overlap_mask: (N,) whether each box touches an overlap zone
+        iou_threshold: IoU at or above which two boxes are duplicates
+
+    Returns:
+        (N,) boolean mask of boxes to keep
+    """
+    keep = np.ones(len(boxes), dtype=bool)
+    candidates = np.flatnonzero(overlap_mask)
+    if len(candidates) < 2:
+        return keep
+
+    cand = boxes[candidates]
+    iou, ios = box_iou(cand)
+    duplicate = (iou >= iou_threshold) | (ios >= _CONTAINMENT_THRESHOLD)
+    duplicate &= tile_ids[candidates][:, None] != tile_ids[candidates]
+
+    areas = (cand[:, 2] - cand[:, 0]) * (cand[:, 3] - cand[:, 1])
+    order = np.lexsort((-scores[candidates], -areas))
+    suppressed = np.zeros(len(candidates), dtype=bool)
+    for i in order:
+        if not suppressed[i]:
+            suppressed |= duplicate[i]
+            suppressed[i] = False
+    keep[candidates[suppressed]] = False
+    return keep
+
+
+def reading_order(boxes: np.ndarray) -> np.ndarray:
+    """Sort boxes top-to-bottom by line, then left-to-right.
+
+    Boxes whose vertical centers are within half a median box height of the
+    line's first box are treated as one line.
+
+    Returns:
+        Index array giving the reading order
+    """
+    if len(boxes) == 0:
+        return np.zeros(0, dtype=int)
+    centers = (boxes[:, 1] + boxes[:, 3]) / 2
+    tolerance = max(1.0, float(np.median(boxes[:, 3] - boxes[:, 1])) / 2)
+    by_y = np.argsort(centers, kind="stable")
+    line_ids = np.empty(len(boxes), dtype=int)
+    line, line_start = 0, centers[by_y[0]]
+    for idx in by_y:
+        if centers[idx] - line_start > tolerance:
+            line += 1
+            line_start = centers[idx]
+        line_ids[idx] = line
+    return np.lexsort((boxes[:, 0], line_ids))
+
+
+def _tile_blocks(result: OCRResult, tile: Tuple[int, int, int, int]):
+    """Extract (boxes, texts, scores) from a tile result, in tile coordinates.
+
+    Engines without per-box texts get them from the text lines when the
+    counts match; engines without boxes yield one block covering the tile.
+    """
+    boxes = [[b.x1, b.y1, b.x2, b.y2] for b in result.boxes]
+    if boxes:
+        texts = list(result.box_texts)
+        if len(texts) != len(boxes):
+            lines = result.text.split("\n")
+            texts = lines if len(lines) == len(boxes) else [""] * len(boxes)
+        scores = list(result.box_scores)
+        if len(scores) != len(boxes):
+            scores = [result.confidence] * len(boxes)
+        return boxes, texts, scores
+    if result.text.strip():
+        x0, y0, x1, y1 = tile
+        return [[0, 0, x1 - x0, y1 - y0]], [result.text.strip()], [result.confidence]
+    return [], [], []
+
+
+def recognize_tiled(
+    acquire_engine: Callable[[], AbstractContextManager],
+    image: LoadedImage,
+    tile_size: int = OCR_TILE_SIZE,
+    overlap: int = OCR_TILE_OVERLAP,
+    max_workers: int = OCR_TILE_WORKERS,
+    timeout: Optional[float] = None,
+    **kwargs,
+) -> OCRResult:
+    """Recognize an image tile by tile and merge the results.
+
+    Tiles are recognized in parallel, each on a replica checked out with
+    ``acquire_engine`` (so concurrency is bounded by the engine pool), then
+    merged into one OCRResult: boxes are shifted to image coordinates,
+    duplicates in the overlap zones are removed and the text is rebuilt in
+    reading order. Works with any OCREngine that returns boxes.
+
+    With an active progress stream, each tile's text is sent as soon as it
+    and all tiles before it are done (tiles are planned row by row). Lines
+    in overlap zones may be sent twice; the returned text is deduplicated.
+
+    Args:
+        acquire_engine: Callable returning a context manager that yields an engine
+        image: Image to recognize (coordinates are in its decoded size)
+        tile_size: Maximum tile side length in pixels
+        overlap: Overlap between neighbouring tiles in pixels
+        max_workers: Maximum number of tiles recognized at once
+        timeout: Per-tile timeout for engines that enforce one themselves
+        **kwargs: Arguments forwarded to recognize_image()
+
+    Returns:
+        Merged OCRResult
+    """
+    logger = get_logger("tiling")
+    start_time = time.time()
+    tiles = plan_tiles(image.width, image.height, tile_size, overlap)
+    logger.info(
+        f"分块识别: {image.width}x{image.height} -> {len(tiles)} 个分块 "
+        f"(分块 {tile_size}px, 重叠 {overlap}px)"
+    )
+    pixels = image.array
+    temp_dir = tempfile.TemporaryDirectory(prefix="ocr_tiles_")
+    # Tile threads do not inherit the request context, so the stream is passed on explicitly
+    stream = get_progress_stream()
+    finished: List[Optional[OCRResult]] = [None] * len(tiles)
+    streamed = 0
+    stream_lock = threading.Lock()
+
+    def stream_finished(index: int, result: OCRResult):
+        """Send the text of every tile whose predecessors are all done."""
+        nonlocal streamed
+        with stream_lock:
+            finished[index] = result
+            while streamed < len(tiles) and finished[streamed] is not None:
+                text = finished[streamed].text.strip()
+                if text:
+                    stream.emit_text(text.split("\n"))
+                streamed += 1
+
+    def run_tile(index: int) -> OCRResult:
+        x0, y0, x1, y1 = tiles[index]
+        crop = np.ascontiguousarray(pixels[y0:y1, x0:x1])
+        with acquire_engine() as engine:
+            tile_kwargs = dict(kwargs)
+            if engine.supports_timeout and timeout is not None:
+                tile_kwargs["timeout"] = timeout
+            if engine.accepts_arrays:
+                tile_kwargs["image"] = LoadedImage.from_array(crop)
+                tile_path = image.path or f"tile_{index}"
+            else:
+                # Engines reading files get the tile as a lossless temporary file
+                tile_path = str(Path(temp_dir.name) / f"tile_{index}.png")
+                Image.fromarray(crop).save(tile_path)
+            result = engine.recognize_image(tile_path, **tile_kwargs)
+        if stream is not None:
+            stream_finished(index, result)
+        return result
+
+    try:
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(tiles))), thread_name_prefix="OCRTile"
+        ) as executor:
+            results = list(executor.map(run_tile, range(len(tiles))))
+    finally:
+        temp_dir.cleanup()
+
+    all_boxes, texts, scores, tile_ids = [], [], [], []
+    for index, (tile, result) in enumerate(zip(tiles, results)):
+        boxes, tile_texts, tile_scores = _tile_blocks(result, tile)
+        all_boxes.extend(boxes)
+        texts.extend(tile_texts)
+        scores.extend(tile_scores)
+        tile_ids.extend([index] * len(boxes))
+
+    boxes = np.asarray(all_boxes, dtype=np.float64).reshape(-1, 4)
+    tile_rects = np.asarray(tiles, dtype=np.float64)
+    tile_ids = np.asarray(tile_ids, dtype=int)
+    if len(boxes):
+        origins = tile_rects[tile_ids, :2]
+        boxes += np.concatenate([origins, origins], axis=1)
+
+    # A box is in an overlap zone if it intersects any tile other than its own
+    in_other_tile = (
+        (boxes[:, None, 0] < tile_rects[:, 2])
+        & (boxes[:, None, 2] > tile_rects[:, 0])
+        & (boxes[:, None, 1] < tile_rects[:, 3])
+        & (boxes[:, None, 3] > tile_rects[:, 1])
+    )
+    in_other_tile[np.arange(len(boxes)), tile_ids] = False
+    scores_arr = np.asarray(scores, dtype=np.float64)
+    keep = dedupe_boxes(boxes, scores_arr, tile_ids, in_other_tile.any(axis=1))
+
+    kept = np.flatnonzero(keep)
+    order = kept[reading_order(boxes[kept])]
+    merged_texts = [texts[i] for i in order]
+    merged_scores = scores_arr[order]
+    logger.info(f"分块合并完成: {len(boxes)} 个文本框，去重后 {len(order)} 个")
+
+    merged = OCRResult(
+        text="\n".join(t for t in merged_texts if t),
+        boxes=[BoundingBox(*row) for row in boxes[order].tolist()],
+        confidence=float(merged_scores.mean()) if len(order) else 0.0,
+        engine=results[0].engine if results else "unknown",
+        processing_time=time.time() - start_time,
+        box_texts=merged_texts,
+        box_scores=merged_scores.tolist(),
+    )
+    return _add_analysis_to_result(merged)
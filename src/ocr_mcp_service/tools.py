@@ -1,50 +1,297 @@
 """MCP tool definitions."""
 
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+from fastmcp import Context
 from .mcp_server import mcp
 from .ocr_engine import OCREngineFactory
-from .utils import validate_image, with_timeout
-from .logger import get_logger
+from .utils import with_timeout, get_timeout_stats
+from .result_cache import get_result_cache
+from .concurrency import run_ocr, get_engine_limiter, OverloadedError
+from .streaming import ProgressStream, emit_text, get_progress_stream, streaming
+from .models import check_response_options
+from .progress_tracker import get_progress_stats
+from .preload import LOADING, PENDING, WARMING, get_engine_readiness
+from .logger import get_logger, get_logging_stats
+from .metrics import add_bytes_processed, get_metrics_registry, track_request
 from .prompt_loader import get_scenario_template
-from .config import OCR_TIMEOUT, get_timeout_for_image
+from .config import (
+    OCR_TIMEOUT,
+    ENGINE_POOL_TIMEOUT,
+    OCR_MAX_SIDE,
+    OCR_MAX_PIXELS,
+    OCR_PDF_DPI,
+    OCR_BATCH_MAX_IMAGES,
+    ENGINE_TYPES,
+    get_timeout_for_image,
+)
 import re
+import time
 
 
-def _recognize_with_engine(engine_type: str, image_path: str, **kwargs):
+def _recognize_loaded(engine_type: str, engine_kwargs: dict, image, timeout: int, tiled: bool, **kwargs):
+    """Recognize a LoadedImage on a pooled engine; boxes come back in original coordinates."""
+    from .image_input import rescale_boxes, recognize_loaded
+
+    if tiled:
+        from .tiling import recognize_tiled
+
+        # Tiles check out replicas themselves, so none is held here
+        result = recognize_tiled(
+            lambda: OCREngineFactory.acquire_engine(
+                engine_type, timeout=ENGINE_POOL_TIMEOUT, **engine_kwargs
+            ),
+            image,
+            timeout=timeout,
+            **kwargs,
+        )
+    else:
+        # Check out a replica so concurrent calls never share a predictor
+        with OCREngineFactory.acquire_engine(
+            engine_type, timeout=ENGINE_POOL_TIMEOUT, **engine_kwargs
+        ) as engine:
+            if engine.supports_timeout:
+                # Out-of-process engines kill the run themselves on timeout
+                kwargs["timeout"] = timeout
+            if (
+                not engine.accepts_arrays
+                and image.path is not None
+                and image.page is None
+                and image.scale >= 1.0
+            ):
+                # Nothing to downscale: the engine reads the original file itself
+                return engine.recognize_image(image.path, **kwargs)
+            # Downscaled images reach file-reading engines as a temporary PNG
+            result = recognize_loaded(engine, image, **kwargs)
+
+    if image.scale < 1.0:
+        # Report boxes in original image coordinates
+        result.boxes = rescale_boxes(result.boxes, image.scale_x, image.scale_y)
+        result.scale = image.scale
+        get_logger("tools").info(
+            f"图片已缩小识别: {image.original_width}x{image.original_height} -> "
+            f"{image.width}x{image.height} (scale={image.scale:.3f})"
+        )
+    return result
+
+
+def _recognize_document(
+    engine_type: str,
+    engine_key: str,
+    engine_kwargs: dict,
+    document_path: str,
+    pages: Optional[str],
+    max_side: int,
+    max_pixels: int,
+    tiled: bool,
+    **kwargs,
+):
+    """Recognize a PDF or multi-frame TIFF page by page.
+
+    Each page gets its own timeout and its own result cache entry.
+    """
+    from .document_input import recognize_document
+    from .result_cache import hash_file
+
+    cache = get_result_cache()
+    file_hash = hash_file(document_path) if cache is not None else None
+
+    def recognize_page(image):
+        page_key = None
+        if cache is not None:
+            page_key = cache.make_key(
+                document_path,
+                engine_key,
+                {
+                    **kwargs,
+                    "page": image.page,
+                    "dpi": OCR_PDF_DPI,
+                    "max_side": max_side,
+                    "max_pixels": max_pixels,
+                    "tiled": tiled,
+                },
+                file_hash=file_hash,
+            )
+            cached = cache.get(page_key)
+            if cached is not None:
+                return cached
+
+        @with_timeout(OCR_TIMEOUT, key=engine_key)
+        def _do_recognize_page():
+            return _recognize_loaded(engine_type, engine_kwargs, image, OCR_TIMEOUT, tiled, **dict(kwargs))
+
+        result = _do_recognize_page()
+        if page_key is not None:
+            cache.put(page_key, result)
+        return result
+
+    return recognize_document(
+        document_path,
+        recognize_page,
+        pages=pages,
+        dpi=OCR_PDF_DPI,
+        max_side=max_side,
+        max_pixels=max_pixels,
+    )
+
+
+def _wait_for_preload(engine_type: str, timeout: float):
+    """Wait (up to timeout) for an engine that is still being preloaded or warmed up."""
+    readiness = get_engine_readiness()
+    state = readiness.get_state(engine_type)
+    if state not in (PENDING, LOADING, WARMING):
+        return
+    logger = get_logger("tools")
+    logger.info(f"引擎 {engine_type} 正在预加载（{state}），等待就绪")
+    stream = get_progress_stream()
+    if stream is not None:
+        stream.report(0, f"等待引擎 {engine_type} 预加载完成...")
+    start = time.monotonic()
+    state = readiness.wait(engine_type, timeout)
+    logger.info(f"引擎 {engine_type} 预加载等待结束: {state}, 等待 {time.monotonic() - start:.2f} 秒")
+
+
+def _recognize_with_engine(
+    engine_type: str,
+    image_path: str,
+    max_side: Optional[int] = None,
+    max_pixels: Optional[int] = None,
+    tiled: bool = False,
+    pages: Optional[str] = None,
+    **kwargs,
+):
     """Internal function to recognize image with timeout protection.
     
-    使用动态超时：根据图片大小自动调整超时时间。
+    使用动态超时：根据图片大小自动调整超时时间。PDF和多帧TIFF按页识别，每页单独超时。
     
     Args:
         engine_type: Type of OCR engine
-        image_path: Path to image file
+        image_path: Path to image file, PDF or multi-frame TIFF
+        max_side: Downscale images whose longer side exceeds this (None = OCR_MAX_SIDE, 0 = off)
+        max_pixels: Downscale images with more pixels than this (None = OCR_MAX_PIXELS, 0 = off)
+        tiled: Recognize overlapping tiles in parallel and merge them (for huge images)
+        pages: Page range for multi-page documents, e.g. "1-3,5" (None = all pages)
         **kwargs: Additional arguments for engine recognition
     
     Returns:
-        OCRResult object
+        OCRResult object, or DocumentResult for multi-page documents
     """
-    from .utils import with_timeout
-    
+    from .document_input import is_multipage_document
+
     # 根据图片大小动态设置超时
     timeout = get_timeout_for_image(image_path)
-    
-    @with_timeout(timeout)
+
+    # EasyOCR languages and the PaddleOCR language are chosen when the engine is created
+    engine_kwargs = {}
+    if engine_type == "easyocr" and "languages" in kwargs:
+        engine_kwargs["languages"] = kwargs.pop("languages")
+    if engine_type == "paddleocr" and "lang" in kwargs:
+        engine_kwargs["lang"] = kwargs.pop("lang")
+    engine_key = OCREngineFactory.get_engine_key(engine_type, **engine_kwargs)
+    max_side = OCR_MAX_SIDE if max_side is None else max_side
+    max_pixels = OCR_MAX_PIXELS if max_pixels is None else max_pixels
+
+    if is_multipage_document(image_path):
+        _wait_for_preload(engine_type, timeout)
+        result = _recognize_document(
+            engine_type, engine_key, engine_kwargs, image_path, pages, max_side, max_pixels, tiled, **kwargs
+        )
+        add_bytes_processed(image_path)
+        return result
+
+    # Same image bytes + engine + parameters -> reuse the previous result
+    cache = get_result_cache()
+    cache_key = None
+    if cache is not None:
+        try:
+            cache_key = cache.make_key(
+                image_path, engine_key, {**kwargs, "max_side": max_side, "max_pixels": max_pixels, "tiled": tiled}
+            )
+        except OSError:
+            cache_key = None  # Unreadable file: let load_image() report it
+        if cache_key is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                get_logger("tools").info(f"命中OCR结果缓存: {image_path}")
+                if cached.text:
+                    emit_text(cached.text.split("\n"))
+                add_bytes_processed(image_path)
+                return cached
+
+    _wait_for_preload(engine_type, timeout)
+
+    # 超时后立即返回；仍在运行的任务按引擎计为僵尸任务
+    @with_timeout(timeout, key=engine_key)
     def _do_recognize():
-        validate_image(image_path)
-        # Handle special case for easyocr which needs languages parameter during engine creation
-        if engine_type == "easyocr" and "languages" in kwargs:
-            languages = kwargs.pop("languages")
-            engine = OCREngineFactory.get_engine(engine_type, languages=languages)
-        else:
-            engine = OCREngineFactory.get_engine(engine_type)
-        return engine.recognize_image(image_path, **kwargs)
+        from .image_input import load_image
+
+        # Validate once; engines that take arrays decode the pixels once and reuse them
+        image = load_image(image_path, max_side=max_side, max_pixels=max_pixels)
+        try:
+            return _recognize_loaded(engine_type, engine_kwargs, image, timeout, tiled, **kwargs)
+        finally:
+            image.release()
     
-    return _do_recognize()
+    result = _do_recognize()
+    if not tiled and result.text:
+        # Engines return a whole image's text at once; tiled runs streamed theirs per tile
+        emit_text(result.text.split("\n"))
+    if cache_key is not None:
+        cache.put(cache_key, result)
+    add_bytes_processed(image_path)
+    return result
+
+
+def _invalid_options_response(tool_name: str, engine: str, detail: str, box_format: str) -> Optional[dict]:
+    """Check the response-mode arguments before any work; the error response if they are invalid."""
+    try:
+        check_response_options(detail, box_format)
+    except ValueError as e:
+        get_logger(f"tools.{tool_name}").error(f"MCP工具调用失败: {tool_name}, 参数无效: {e}")
+        return {
+            "error": f"参数无效: {e}",
+            "error_type": "InvalidArgumentError",
+            "text": "",
+            "boxes": [],
+            "confidence": 0.0,
+            "engine": engine,
+            "processing_time": 0.0,
+        }
+    return None
+
+
+def _overloaded_response(tool_name: str, engine: str, error: OverloadedError) -> dict:
+    """Build the structured error returned when admission control refuses a request."""
+    get_logger(f"tools.{tool_name}").warning(f"MCP工具调用被拒绝: {tool_name}, {error}")
+    return {
+        "error": str(error),
+        "error_type": "OverloadedError",
+        "error_recovery": f"服务繁忙，请在 {error.retry_after} 秒后重试",
+        "retry_after": error.retry_after,
+        "queue_depth": error.queue_depth,
+        "estimated_wait": round(error.estimated_wait, 1),
+        "text": "",
+        "boxes": [],
+        "confidence": 0.0,
+        "engine": engine,
+        "processing_time": 0.0,
+    }
 
 
 @mcp.tool()
-def recognize_image_paddleocr(image_path: str, lang: str = "ch") -> dict:
+@track_request("recognize_image_paddleocr", "paddleocr")
+async def recognize_image_paddleocr(
+    image_path: str,
+    lang: Optional[str] = None,
+    max_side: Optional[int] = None,
+    max_pixels: Optional[int] = None,
+    tiled: bool = False,
+    pages: Optional[str] = None,
+    detail: str = "full",
+    box_format: str = "dict",
+    include_progress_history: bool = True,
+    ctx: Optional[Context] = None,
+) -> dict:
     """
     Recognize text in an image using PaddleOCR engine.
     
@@ -53,8 +300,25 @@ def recognize_image_paddleocr(image_path: str, lang: str = "ch") -> dict:
     analysis, use the get_prompt_template tool separately.
     
     Args:
-        image_path: Path to the image file
-        lang: Language code (default: 'ch' for Chinese)
+        image_path: Path to the image file (or PDF / multi-page TIFF)
+        lang: Language code, e.g. 'ch' or 'en' (default: PADDLEOCR_LANG, 'ch' unless
+              configured); each language loads its own PaddleOCR engine
+        max_side: Downscale the image so its longer side is at most this many
+                  pixels before recognition (default: OCR_MAX_SIDE, 0 = never).
+                  Speeds up large photos; boxes are returned in original coordinates.
+        max_pixels: Downscale the image so it has at most this many pixels before
+                    recognition (default: OCR_MAX_PIXELS, 0 = never); applied
+                    together with max_side, whichever shrinks the image more.
+        tiled: Split the image into overlapping tiles recognized in parallel and merged
+               (default: False). Use for huge scans and long screenshots whose small
+               text would be unreadable after downscaling.
+        pages: Page range for PDFs and multi-page TIFFs, e.g. "1-3,5" or "2-"
+               (default: all pages). Ignored for single images.
+        detail: Response size: 'text' (text only), 'confidence' (text and confidence)
+                or 'full' (default: boxes, analysis, progress history)
+        box_format: 'dict' (default: {"x1", "y1", "x2", "y2"} per box) or 'flat'
+                    (one integer list [x1, y1, x2, y2, ...], much smaller for dense pages)
+        include_progress_history: Include progress_history in full responses (default: True)
     
     Returns:
         OCR result dictionary containing:
@@ -62,22 +326,44 @@ def recognize_image_paddleocr(image_path: str, lang: str = "ch") -> dict:
         - boxes: Bounding boxes for text regions
         - confidence: Average confidence score
         - engine: OCR engine name
-        - processing_time: Processing time in seconds
+        - processing_time: Processing time in seconds (of the original run on a cache hit)
+        - cache_hit: Whether the result was served from the result cache
+        - scale: Downscale factor applied before recognition (1.0 = full size)
         - analysis: Technical analysis (optional)
+        For PDFs and multi-page TIFFs, text joins all pages and the result also has
+        page_count and pages (per-page results with page number, text, boxes, or error).
+        When the request carries a progress token, progress and the recognized text
+        (in chunks of lines, "[文本 N]" messages) are sent as progress notifications.
     """
     logger = get_logger("tools.recognize_image_paddleocr")
+    invalid = _invalid_options_response("recognize_image_paddleocr", "paddleocr", detail, box_format)
+    if invalid is not None:
+        return invalid
     try:
         logger.info(f"MCP工具调用开始: recognize_image_paddleocr, 图片路径: {image_path}, 语言: {lang}")
         
-        # Recognize with timeout protection
-        result = _recognize_with_engine("paddleocr", image_path, lang=lang)
+        # Recognize on the request executor (event loop stays free), with timeout protection
+        with streaming(ProgressStream.from_context(ctx)):
+            result = await run_ocr(
+                "paddleocr",
+                _recognize_with_engine,
+                "paddleocr",
+                image_path,
+                lang=lang,
+                max_side=max_side,
+                max_pixels=max_pixels,
+                tiled=tiled,
+                pages=pages,
+            )
         
         # Log result summary
-        result_dict = result.to_dict()
-        text_length = len(result_dict.get("text", ""))
-        boxes_count = len(result_dict.get("boxes", []))
-        confidence = result_dict.get("confidence", 0.0)
-        processing_time = result_dict.get("processing_time", 0.0)
+        result_dict = result.to_dict(
+            detail=detail, box_format=box_format, include_progress_history=include_progress_history
+        )
+        text_length = len(result.text)
+        boxes_count = len(getattr(result, "boxes", []))
+        confidence = result.confidence
+        processing_time = result.processing_time
         
         logger.info(
             f"MCP工具调用成功: recognize_image_paddleocr, "
@@ -88,6 +374,8 @@ def recognize_image_paddleocr(image_path: str, lang: str = "ch") -> dict:
         )
         
         return result_dict
+    except OverloadedError as e:
+        return _overloaded_response("recognize_image_paddleocr", "paddleocr", e)
     except TimeoutError as e:
         timeout = get_timeout_for_image(image_path)
         error_msg = f"OCR处理超时（超过{timeout}秒）。图片可能过大或过于复杂。建议：1) 尝试压缩图片 2) 使用更快的引擎 3) 分批处理大图片"
@@ -141,7 +429,17 @@ def recognize_image_paddleocr(image_path: str, lang: str = "ch") -> dict:
 
 
 @mcp.tool()
-def recognize_image_deepseek(image_path: str) -> dict:
+@track_request("recognize_image_deepseek", "deepseek")
+async def recognize_image_deepseek(
+    image_path: str,
+    max_side: Optional[int] = None,
+    max_pixels: Optional[int] = None,
+    pages: Optional[str] = None,
+    detail: str = "full",
+    box_format: str = "dict",
+    include_progress_history: bool = True,
+    ctx: Optional[Context] = None,
+) -> dict:
     """
     Recognize text in an image using DeepSeek OCR engine.
     
@@ -149,7 +447,20 @@ def recognize_image_deepseek(image_path: str) -> dict:
     Use recognize_image_paddleocr or recognize_image_paddleocr_mcp instead.
     
     Args:
-        image_path: Path to the image file
+        image_path: Path to the image file (or PDF / multi-page TIFF)
+        max_side: Downscale the image so its longer side is at most this many
+                  pixels before recognition (default: OCR_MAX_SIDE, 0 = never).
+                  Speeds up large photos; boxes are returned in original coordinates.
+        max_pixels: Downscale the image so it has at most this many pixels before
+                    recognition (default: OCR_MAX_PIXELS, 0 = never); applied
+                    together with max_side, whichever shrinks the image more.
+        pages: Page range for PDFs and multi-page TIFFs, e.g. "1-3,5" or "2-"
+               (default: all pages). Ignored for single images.
+        detail: Response size: 'text' (text only), 'confidence' (text and confidence)
+                or 'full' (default: boxes, analysis, progress history)
+        box_format: 'dict' (default: {"x1", "y1", "x2", "y2"} per box) or 'flat'
+                    (one integer list [x1, y1, x2, y2, ...], much smaller for dense pages)
+        include_progress_history: Include progress_history in full responses (default: True)
     
     Returns:
         OCR result dictionary containing:
@@ -157,22 +468,42 @@ def recognize_image_deepseek(image_path: str) -> dict:
         - boxes: Bounding boxes for text regions
         - confidence: Average confidence score
         - engine: OCR engine name
-        - processing_time: Processing time in seconds
+        - processing_time: Processing time in seconds (of the original run on a cache hit)
+        - cache_hit: Whether the result was served from the result cache
+        - scale: Downscale factor applied before recognition (1.0 = full size)
         - analysis: Technical analysis (optional)
+        For PDFs and multi-page TIFFs, text joins all pages and the result also has
+        page_count and pages (per-page results with page number, text, boxes, or error).
+        When the request carries a progress token, progress and the recognized text
+        (in chunks of lines, "[文本 N]" messages) are sent as progress notifications.
     """
     logger = get_logger("tools.recognize_image_deepseek")
+    invalid = _invalid_options_response("recognize_image_deepseek", "deepseek", detail, box_format)
+    if invalid is not None:
+        return invalid
     try:
         logger.info(f"MCP工具调用开始: recognize_image_deepseek, 图片路径: {image_path}")
         
-        # Recognize with timeout protection
-        result = _recognize_with_engine("deepseek", image_path)
+        # Recognize on the request executor (event loop stays free), with timeout protection
+        with streaming(ProgressStream.from_context(ctx)):
+            result = await run_ocr(
+                "deepseek",
+                _recognize_with_engine,
+                "deepseek",
+                image_path,
+                max_side=max_side,
+                max_pixels=max_pixels,
+                pages=pages,
+            )
         
         # Log result summary
-        result_dict = result.to_dict()
-        text_length = len(result_dict.get("text", ""))
-        boxes_count = len(result_dict.get("boxes", []))
-        confidence = result_dict.get("confidence", 0.0)
-        processing_time = result_dict.get("processing_time", 0.0)
+        result_dict = result.to_dict(
+            detail=detail, box_format=box_format, include_progress_history=include_progress_history
+        )
+        text_length = len(result.text)
+        boxes_count = len(getattr(result, "boxes", []))
+        confidence = result.confidence
+        processing_time = result.processing_time
         
         logger.info(
             f"MCP工具调用成功: recognize_image_deepseek, "
@@ -183,6 +514,8 @@ def recognize_image_deepseek(image_path: str) -> dict:
         )
         
         return result_dict
+    except OverloadedError as e:
+        return _overloaded_response("recognize_image_deepseek", "deepseek", e)
     except TimeoutError as e:
         timeout = get_timeout_for_image(image_path)
         error_msg = f"OCR处理超时（超过{timeout}秒）。DeepSeek OCR处理大图片较慢。建议：1) 使用paddleocr或easyocr 2) 压缩图片 3) 分批处理"
@@ -212,12 +545,39 @@ def recognize_image_deepseek(image_path: str) -> dict:
 
 
 @mcp.tool()
-def recognize_image_paddleocr_mcp(image_path: str) -> dict:
+@track_request("recognize_image_paddleocr_mcp", "paddleocr_mcp")
+async def recognize_image_paddleocr_mcp(
+    image_path: str,
+    max_side: Optional[int] = None,
+    max_pixels: Optional[int] = None,
+    tiled: bool = False,
+    pages: Optional[str] = None,
+    detail: str = "full",
+    box_format: str = "dict",
+    include_progress_history: bool = True,
+    ctx: Optional[Context] = None,
+) -> dict:
     """
     Recognize text in an image using paddleocr-mcp engine (subprocess).
     
     Args:
-        image_path: Path to the image file
+        image_path: Path to the image file (or PDF / multi-page TIFF)
+        max_side: Downscale the image so its longer side is at most this many
+                  pixels before recognition (default: OCR_MAX_SIDE, 0 = never).
+                  Speeds up large photos; boxes are returned in original coordinates.
+        max_pixels: Downscale the image so it has at most this many pixels before
+                    recognition (default: OCR_MAX_PIXELS, 0 = never); applied
+                    together with max_side, whichever shrinks the image more.
+        tiled: Split the image into overlapping tiles recognized in parallel and merged
+               (default: False). Use for huge scans and long screenshots whose small
+               text would be unreadable after downscaling.
+        pages: Page range for PDFs and multi-page TIFFs, e.g. "1-3,5" or "2-"
+               (default: all pages). Ignored for single images.
+        detail: Response size: 'text' (text only), 'confidence' (text and confidence)
+                or 'full' (default: boxes, analysis, progress history)
+        box_format: 'dict' (default: {"x1", "y1", "x2", "y2"} per box) or 'flat'
+                    (one integer list [x1, y1, x2, y2, ...], much smaller for dense pages)
+        include_progress_history: Include progress_history in full responses (default: True)
     
     Returns:
         OCR result dictionary containing:
@@ -225,22 +585,43 @@ def recognize_image_paddleocr_mcp(image_path: str) -> dict:
         - boxes: Bounding boxes for text regions
         - confidence: Average confidence score
         - engine: OCR engine name
-        - processing_time: Processing time in seconds
+        - processing_time: Processing time in seconds (of the original run on a cache hit)
+        - cache_hit: Whether the result was served from the result cache
+        - scale: Downscale factor applied before recognition (1.0 = full size)
         - analysis: Technical analysis (optional)
+        For PDFs and multi-page TIFFs, text joins all pages and the result also has
+        page_count and pages (per-page results with page number, text, boxes, or error).
+        When the request carries a progress token, progress and the recognized text
+        (in chunks of lines, "[文本 N]" messages) are sent as progress notifications.
     """
     logger = get_logger("tools.recognize_image_paddleocr_mcp")
+    invalid = _invalid_options_response("recognize_image_paddleocr_mcp", "paddleocr_mcp", detail, box_format)
+    if invalid is not None:
+        return invalid
     try:
         logger.info(f"MCP工具调用开始: recognize_image_paddleocr_mcp, 图片路径: {image_path}")
         
-        # Recognize with timeout protection
-        result = _recognize_with_engine("paddleocr_mcp", image_path)
+        # Recognize on the request executor (event loop stays free), with timeout protection
+        with streaming(ProgressStream.from_context(ctx)):
+            result = await run_ocr(
+                "paddleocr_mcp",
+                _recognize_with_engine,
+                "paddleocr_mcp",
+                image_path,
+                max_side=max_side,
+                max_pixels=max_pixels,
+                tiled=tiled,
+                pages=pages,
+            )
         
         # Log result summary
-        result_dict = result.to_dict()
-        text_length = len(result_dict.get("text", ""))
-        boxes_count = len(result_dict.get("boxes", []))
-        confidence = result_dict.get("confidence", 0.0)
-        processing_time = result_dict.get("processing_time", 0.0)
+        result_dict = result.to_dict(
+            detail=detail, box_format=box_format, include_progress_history=include_progress_history
+        )
+        text_length = len(result.text)
+        boxes_count = len(getattr(result, "boxes", []))
+        confidence = result.confidence
+        processing_time = result.processing_time
         
         logger.info(
             f"MCP工具调用成功: recognize_image_paddleocr_mcp, "
@@ -251,6 +632,8 @@ def recognize_image_paddleocr_mcp(image_path: str) -> dict:
         )
         
         return result_dict
+    except OverloadedError as e:
+        return _overloaded_response("recognize_image_paddleocr_mcp", "paddleocr_mcp", e)
     except TimeoutError as e:
         timeout = get_timeout_for_image(image_path)
         error_msg = f"OCR处理超时（超过{timeout}秒）。图片可能过大或过于复杂。建议：1) 尝试压缩图片 2) 使用更快的引擎 3) 分批处理大图片"
@@ -280,17 +663,45 @@ def recognize_image_paddleocr_mcp(image_path: str) -> dict:
 
 
 @mcp.tool()
-def recognize_image_easyocr(image_path: str, languages: str = "ch_sim,en") -> dict:
+@track_request("recognize_image_easyocr", "easyocr")
+async def recognize_image_easyocr(
+    image_path: str,
+    languages: str = "ch_sim,en",
+    max_side: Optional[int] = None,
+    max_pixels: Optional[int] = None,
+    tiled: bool = False,
+    pages: Optional[str] = None,
+    detail: str = "full",
+    box_format: str = "dict",
+    include_progress_history: bool = True,
+    ctx: Optional[Context] = None,
+) -> dict:
     """
     Recognize text in an image using EasyOCR engine.
     
     EasyOCR supports 80+ languages and is easy to use. Good for multilingual scenarios.
     
     Args:
-        image_path: Path to the image file
+        image_path: Path to the image file (or PDF / multi-page TIFF)
         languages: Comma-separated language codes (default: 'ch_sim,en' for Chinese Simplified and English).
                   Common codes: 'en' (English), 'ch_sim' (Chinese Simplified), 'ch_tra' (Chinese Traditional),
                   'ja' (Japanese), 'ko' (Korean), 'fr' (French), 'de' (German), etc.
+        max_side: Downscale the image so its longer side is at most this many
+                  pixels before recognition (default: OCR_MAX_SIDE, 0 = never).
+                  Speeds up large photos; boxes are returned in original coordinates.
+        max_pixels: Downscale the image so it has at most this many pixels before
+                    recognition (default: OCR_MAX_PIXELS, 0 = never); applied
+                    together with max_side, whichever shrinks the image more.
+        tiled: Split the image into overlapping tiles recognized in parallel and merged
+               (default: False). Use for huge scans and long screenshots whose small
+               text would be unreadable after downscaling.
+        pages: Page range for PDFs and multi-page TIFFs, e.g. "1-3,5" or "2-"
+               (default: all pages). Ignored for single images.
+        detail: Response size: 'text' (text only), 'confidence' (text and confidence)
+                or 'full' (default: boxes, analysis, progress history)
+        box_format: 'dict' (default: {"x1", "y1", "x2", "y2"} per box) or 'flat'
+                    (one integer list [x1, y1, x2, y2, ...], much smaller for dense pages)
+        include_progress_history: Include progress_history in full responses (default: True)
     
     Returns:
         OCR result dictionary containing:
@@ -298,25 +709,47 @@ def recognize_image_easyocr(image_path: str, languages: str = "ch_sim,en") -> di
         - boxes: Bounding boxes for text regions
         - confidence: Average confidence score
         - engine: OCR engine name
-        - processing_time: Processing time in seconds
+        - processing_time: Processing time in seconds (of the original run on a cache hit)
+        - cache_hit: Whether the result was served from the result cache
+        - scale: Downscale factor applied before recognition (1.0 = full size)
         - analysis: Technical analysis (optional)
+        For PDFs and multi-page TIFFs, text joins all pages and the result also has
+        page_count and pages (per-page results with page number, text, boxes, or error).
+        When the request carries a progress token, progress and the recognized text
+        (in chunks of lines, "[文本 N]" messages) are sent as progress notifications.
     """
     logger = get_logger("tools.recognize_image_easyocr")
+    invalid = _invalid_options_response("recognize_image_easyocr", "easyocr", detail, box_format)
+    if invalid is not None:
+        return invalid
     try:
         logger.info(f"MCP工具调用开始: recognize_image_easyocr, 图片路径: {image_path}, 语言: {languages}")
         
         # Parse languages
         lang_list = [lang.strip() for lang in languages.split(',') if lang.strip()]
         
-        # Recognize with timeout protection
-        result = _recognize_with_engine("easyocr", image_path, languages=lang_list)
+        # Recognize on the request executor (event loop stays free), with timeout protection
+        with streaming(ProgressStream.from_context(ctx)):
+            result = await run_ocr(
+                "easyocr",
+                _recognize_with_engine,
+                "easyocr",
+                image_path,
+                languages=lang_list,
+                max_side=max_side,
+                max_pixels=max_pixels,
+                tiled=tiled,
+                pages=pages,
+            )
         
         # Log result summary
-        result_dict = result.to_dict()
-        text_length = len(result_dict.get("text", ""))
-        boxes_count = len(result_dict.get("boxes", []))
-        confidence = result_dict.get("confidence", 0.0)
-        processing_time = result_dict.get("processing_time", 0.0)
+        result_dict = result.to_dict(
+            detail=detail, box_format=box_format, include_progress_history=include_progress_history
+        )
+        text_length = len(result.text)
+        boxes_count = len(getattr(result, "boxes", []))
+        confidence = result.confidence
+        processing_time = result.processing_time
         
         logger.info(
             f"MCP工具调用成功: recognize_image_easyocr, "
@@ -327,6 +760,8 @@ def recognize_image_easyocr(image_path: str, languages: str = "ch_sim,en") -> di
         )
         
         return result_dict
+    except OverloadedError as e:
+        return _overloaded_response("recognize_image_easyocr", "easyocr", e)
     except TimeoutError as e:
         timeout = get_timeout_for_image(image_path)
         error_msg = f"OCR处理超时（超过{timeout}秒）。图片可能过大或过于复杂。建议：1) 尝试压缩图片 2) 减少支持的语言数量 3) 分批处理大图片"
@@ -355,6 +790,172 @@ def recognize_image_easyocr(image_path: str, languages: str = "ch_sim,en") -> di
         }
 
 
+_BATCH_ENGINES = ENGINE_TYPES
+
+
+def _expand_batch_paths(image_paths: Optional[List[str]], pattern: Optional[str]) -> List[str]:
+    """Combine explicit paths and glob matches, keeping order and dropping duplicates."""
+    import glob
+
+    paths = list(image_paths or [])
+    if pattern:
+        paths.extend(p for p in sorted(glob.glob(pattern, recursive=True)) if Path(p).is_file())
+    return list(dict.fromkeys(paths))
+
+
+def _batch_engine_kwargs(engine: str, lang: Optional[str]) -> dict:
+    """Map the batch-wide language setting to the engine's own parameter."""
+    if not lang:
+        return {}
+    if engine == "paddleocr":
+        return {"lang": lang}
+    if engine == "easyocr":
+        return {"languages": [code.strip() for code in lang.split(",") if code.strip()]}
+    return {}
+
+
+@mcp.tool()
+@track_request("recognize_images_batch")
+async def recognize_images_batch(
+    image_paths: Optional[List[str]] = None,
+    pattern: Optional[str] = None,
+    engine: str = "paddleocr",
+    lang: Optional[str] = None,
+    include_boxes: bool = True,
+    max_side: Optional[int] = None,
+    max_pixels: Optional[int] = None,
+    detail: str = "full",
+    box_format: str = "dict",
+    include_progress_history: bool = True,
+    ctx: Optional[Context] = None,
+) -> dict:
+    """
+    Recognize text in many images with one call.
+    
+    Images are recognized concurrently across the engine's replicas; results come
+    back in input order, and a failing image only fails its own entry.
+    
+    Args:
+        image_paths: Image paths (PDFs and multi-page TIFFs are recognized page by page)
+        pattern: Glob pattern selecting more images, e.g. '/screenshots/*.png' or
+                 '/scans/**/*.jpg' (recursive); matches are added after image_paths
+        engine: OCR engine for every image: paddleocr (default), paddleocr_mcp, easyocr, deepseek
+        lang: Language for every image: a PaddleOCR code (e.g. 'ch', 'en') or comma-separated
+              EasyOCR codes (e.g. 'ch_sim,en'); engine default when omitted, ignored by
+              paddleocr_mcp and deepseek
+        include_boxes: Include bounding boxes in each result (default: True); set False
+                       to keep the response small when only the text is needed
+        max_side: Downscale each image so its longer side is at most this many pixels
+                  (default: OCR_MAX_SIDE, 0 = never)
+        max_pixels: Downscale each image so it has at most this many pixels
+                    (default: OCR_MAX_PIXELS, 0 = never)
+        detail: Size of each result: 'text', 'confidence' or 'full' (default), as for
+                recognize_image_* tools
+        box_format: 'dict' (default) or 'flat' integer list, as for recognize_image_* tools
+        include_progress_history: Include progress_history in full results (default: True)
+    
+    Returns:
+        Dictionary containing:
+        - results: One entry per image, in input order: image_path, ok, and either
+          result (same fields as recognize_image_* tools) or error and error_type
+        - total / succeeded / failed: Image counts
+        - engine: OCR engine used
+        - processing_time: Wall time of the whole batch in seconds
+        When the request carries a progress token, a progress notification is sent
+        as each image finishes.
+    """
+    import asyncio
+    from .models import BatchItemResult
+
+    logger = get_logger("tools.recognize_images_batch")
+    start_time = time.time()
+    paths = _expand_batch_paths(image_paths, pattern)
+    logger.info(
+        f"MCP工具调用开始: recognize_images_batch, 引擎: {engine}, 图片数量: {len(paths)}, 匹配模式: {pattern}"
+    )
+
+    error, error_type = None, "ValueError"
+    try:
+        check_response_options(detail, box_format)
+    except ValueError as e:
+        error, error_type = f"参数无效: {e}", "InvalidArgumentError"
+    else:
+        if engine not in _BATCH_ENGINES:
+            error = f"不支持的引擎: {engine}（可选: {', '.join(_BATCH_ENGINES)}）"
+        elif not paths:
+            error = "没有要识别的图片：请提供 image_paths 或能匹配到文件的 pattern"
+        elif len(paths) > OCR_BATCH_MAX_IMAGES:
+            error = f"图片数量 {len(paths)} 超过单次批量上限 {OCR_BATCH_MAX_IMAGES}，请分批提交"
+    if error is not None:
+        logger.error(f"MCP工具调用失败: recognize_images_batch, {error}")
+        return {
+            "error": error,
+            "error_type": error_type,
+            "results": [],
+            "total": len(paths),
+            "succeeded": 0,
+            "failed": 0,
+            "engine": engine,
+            "processing_time": 0.0,
+        }
+
+    engine_kwargs = _batch_engine_kwargs(engine, lang)
+    # Keep at most one request per replica in flight so the batch fills the
+    # engine without taking up its whole admission queue
+    batch_slots = asyncio.Semaphore(get_engine_limiter().get_limit(engine))
+
+    # Items finish out of order, so the batch reports one notification per
+    # finished image rather than streaming interleaved text
+    stream = ProgressStream.from_context(ctx)
+    finished = 0
+
+    async def recognize_one(path: str) -> BatchItemResult:
+        nonlocal finished
+        async with batch_slots:
+            try:
+                result = await run_ocr(
+                    engine, _recognize_with_engine, engine, path, max_side=max_side, max_pixels=max_pixels,
+                    **engine_kwargs
+                )
+                item = BatchItemResult(image_path=path, result=result)
+            except Exception as e:
+                logger.warning(f"批量识别单张失败: {path}, {type(e).__name__}: {e}")
+                item = BatchItemResult(image_path=path, error=str(e), error_type=type(e).__name__)
+        finished += 1
+        if stream is not None:
+            status = "完成" if item.ok else "失败"
+            stream.report(finished / len(paths) * 100, f"{status} ({finished}/{len(paths)}): {path}")
+        return item
+
+    items = await asyncio.gather(*(recognize_one(path) for path in paths))
+
+    results = []
+    for item in items:
+        entry = item.to_dict(
+            detail=detail, box_format=box_format, include_progress_history=include_progress_history
+        )
+        if not include_boxes and "result" in entry:
+            entry["result"].pop("boxes", None)
+            for page in entry["result"].get("pages", []):
+                page.pop("boxes", None)
+        results.append(entry)
+
+    succeeded = sum(1 for item in items if item.ok)
+    processing_time = time.time() - start_time
+    logger.info(
+        f"MCP工具调用成功: recognize_images_batch, 成功: {succeeded}, "
+        f"失败: {len(items) - succeeded}, 总耗时: {processing_time:.2f}秒"
+    )
+    return {
+        "results": results,
+        "total": len(items),
+        "succeeded": succeeded,
+        "failed": len(items) - succeeded,
+        "engine": engine,
+        "processing_time": processing_time,
+    }
+
+
 @mcp.tool()
 def get_prompt_template() -> dict:
     """
@@ -473,6 +1074,17 @@ def health_check() -> dict:
         - engines_loaded: Number of loaded OCR engines
         - engines: List of loaded engine names
         - usage_stats: Engine usage statistics
+        - engine_pools: Replica pool statistics per engine (in_use, idle, waiters, ...)
+        - resident_engines: Loaded engines with memory footprint (MB), replicas and idle time
+        - memory_budget_mb: Engine memory budget (0 = unlimited)
+        - timeouts: Timed-out runs still executing ("zombies"), abandoned and rejected counts
+        - result_cache: OCR result cache hit/miss statistics (None when disabled)
+        - concurrency: Per-engine OCR admission state: concurrency limit, in-flight requests,
+          queue depth and bound, rejections by reason, average service time and estimated wait
+        - progress: Progress updates received, emitted and suppressed (coalesced) since start
+        - logging: Log queue capacity, records waiting and records dropped because the queue was full
+        - preload: Per-engine preload readiness (pending/loading/warming/ready/failed) with
+          error, load time and warm-up time; engines not preloaded are absent
         - timestamp: Check timestamp
     """
     from datetime import datetime
@@ -483,6 +1095,7 @@ def health_check() -> dict:
         
         # Get engine statistics
         stats = OCREngineFactory.get_usage_stats()
+        cache = get_result_cache()
         
         # Determine service status
         status = "healthy"
@@ -494,6 +1107,15 @@ def health_check() -> dict:
             "engines_loaded": stats["total_engines"],
             "engines": stats["engines"],
             "usage_stats": stats["usage_count"],
+            "engine_pools": stats["pools"],
+            "resident_engines": stats["resident"],
+            "memory_budget_mb": stats["memory_budget_mb"],
+            "timeouts": get_timeout_stats(),
+            "result_cache": cache.get_stats() if cache is not None else None,
+            "concurrency": get_engine_limiter().get_stats(),
+            "progress": get_progress_stats(),
+            "logging": get_logging_stats(),
+            "preload": get_engine_readiness().get_status(),
             "timestamp": datetime.now().isoformat()
         }
         
@@ -510,6 +1132,36 @@ def health_check() -> dict:
         }
 
 
+@mcp.tool()
+def get_metrics() -> dict:
+    """
+    Get OCR request metrics per engine and tool.
+    
+    Returns:
+        Dictionary containing:
+        - uptime_seconds: Seconds since the service started
+        - requests: engine -> tool -> requests, errors (count by error_type), error_count,
+          bytes_processed (input file bytes) and latency (count, sum, avg, max, p50, p95,
+          p99 in seconds; percentiles are estimated from histogram buckets)
+        - queue_wait: engine -> time requests waited for a free engine slot (same summary)
+        - timestamp: Snapshot timestamp
+    """
+    from datetime import datetime
+    logger = get_logger("tools.get_metrics")
+    try:
+        result = get_metrics_registry().get_metrics()
+        result["timestamp"] = datetime.now().isoformat()
+        logger.info("MCP工具调用成功: get_metrics")
+        return result
+    except Exception as e:
+        logger.error(f"MCP工具调用失败: get_metrics, 错误: {e}", exc_info=True)
+        return {
+            "error": str(e),
+            "error_type": type(e).__name__,
+            "timestamp": datetime.now().isoformat()
+        }
+
+
 @mcp.tool()
 def get_usage_guide() -> dict:
     """
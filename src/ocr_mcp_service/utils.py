@@ -1,15 +1,45 @@
 """Utility functions for image processing."""
 
 import os
+import contextvars
 import functools
+import threading
+import time
 from pathlib import Path
 from PIL import Image
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
-from typing import Callable, TypeVar, Any
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Optional, TypeVar, Any
+
+from .config import OCR_MAX_WORKERS, OCR_MAX_WORKERS_PER_KEY, OCR_MAX_ZOMBIE_RUNS
 
 T = TypeVar('T')
 
 
+def get_process_rss(pid: Optional[int] = None) -> Optional[int]:
+    """Get the resident set size of a process in bytes.
+
+    Uses psutil when installed, otherwise /proc (Linux).
+
+    Args:
+        pid: Process ID (None for the current process)
+
+    Returns:
+        RSS in bytes, or None if it cannot be measured
+    """
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
 def validate_image_path(image_path: str) -> Path:
     """Validate and return image path."""
     path = Path(image_path)
@@ -37,31 +67,158 @@ def validate_image(image_path: str) -> Path:
     return path
 
 
-def with_timeout(timeout_seconds: int):
+class EngineBusyError(RuntimeError):
+    """Raised when an engine has too many abandoned (timed-out) runs in flight."""
+
+
+# One bounded executor for all timeout-protected runs (created lazily); each key
+# may hold at most OCR_MAX_WORKERS_PER_KEY of its threads, so the zombie runs of
+# one engine never take the threads another engine needs
+_executor: Optional[ThreadPoolExecutor] = None
+_key_slots: Dict[str, threading.BoundedSemaphore] = {}
+_executor_lock = threading.Lock()
+
+# Zombie tracking: runs whose caller gave up on timeout but that are still executing
+_zombie_lock = threading.Lock()
+_zombie_runs: Dict[str, int] = {}
+_abandoned_total: Dict[str, int] = {}
+_rejected_total: Dict[str, int] = {}
+_start_timeouts: Dict[str, int] = {}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the shared executor, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max(1, OCR_MAX_WORKERS), thread_name_prefix="OCRWorker")
+        return _executor
+
+
+def _get_key_slots(key: str) -> threading.BoundedSemaphore:
+    """Get the semaphore limiting how many shared threads a key may hold."""
+    with _executor_lock:
+        slots = _key_slots.get(key)
+        if slots is None:
+            slots = _key_slots[key] = threading.BoundedSemaphore(max(1, OCR_MAX_WORKERS_PER_KEY))
+        return slots
+
+
+def _busy(key: str, timeout_seconds: float) -> EngineBusyError:
+    """Count a run that found no free worker in time and build its error."""
+    with _zombie_lock:
+        _start_timeouts[key] = _start_timeouts.get(key, 0) + 1
+    return EngineBusyError(
+        f"引擎 {key} 的工作线程均被占用，等待 {timeout_seconds} 秒仍未开始，请稍后重试"
+    )
+
+
+def _zombie_finished(key: str, future: Future):
+    """Done-callback for an abandoned run."""
+    with _zombie_lock:
+        _zombie_runs[key] = max(0, _zombie_runs.get(key, 0) - 1)
+
+
+def _check_zombie_limit(key: str):
+    """Refuse new work if the key already has too many abandoned runs."""
+    with _zombie_lock:
+        zombies = _zombie_runs.get(key, 0)
+        if zombies >= OCR_MAX_ZOMBIE_RUNS:
+            _rejected_total[key] = _rejected_total.get(key, 0) + 1
+            raise EngineBusyError(
+                f"引擎 {key} 仍有 {zombies} 个超时任务在运行，暂不接受新请求，请稍后重试"
+            )
+
+
+def _abandon(key: str, future: Future):
+    """Give up on a timed-out run without waiting for it."""
+    if future.cancel():
+        # Still queued: it will never run, so it is not a zombie
+        return
+    with _zombie_lock:
+        _zombie_runs[key] = _zombie_runs.get(key, 0) + 1
+        _abandoned_total[key] = _abandoned_total.get(key, 0) + 1
+    future.add_done_callback(functools.partial(_zombie_finished, key))
+
+
+def get_timeout_stats() -> dict:
+    """Get statistics about timed-out runs.
+
+    Returns:
+        Dictionary with the shared executor size, the threads one key may hold,
+        and per key the currently running abandoned runs ("zombies"), total
+        abandoned runs, rejected requests, and runs that found no free worker
+        within their timeout
+    """
+    with _zombie_lock:
+        return {
+            "max_workers": OCR_MAX_WORKERS,
+            "max_workers_per_key": OCR_MAX_WORKERS_PER_KEY,
+            "max_zombie_runs": OCR_MAX_ZOMBIE_RUNS,
+            "zombie_runs": {k: v for k, v in _zombie_runs.items() if v},
+            "abandoned_total": dict(_abandoned_total),
+            "rejected_total": dict(_rejected_total),
+            "start_timeouts": dict(_start_timeouts),
+        }
+
+
+def with_timeout(timeout_seconds: int, key: Optional[str] = None):
     """Decorator to add timeout to a function.
     
+    The function runs on the shared bounded executor (OCR_MAX_WORKERS
+    threads), of which ``key`` may hold OCR_MAX_WORKERS_PER_KEY at once.
+    The run timeout counts from when the run starts, not from when it was
+    queued for a worker; waiting for a worker is bounded separately by the
+    same number of seconds, so the caller blocks for at most twice
+    ``timeout_seconds``. On timeout the caller returns immediately; the run
+    keeps executing in the background, holding its thread and key slot,
+    and is tracked as zombie work until it finishes. While ``key`` has
+    OCR_MAX_ZOMBIE_RUNS zombies in flight, new calls are refused. Context
+    variables of the caller are visible inside the function.
+    
     Args:
-        timeout_seconds: Maximum time in seconds to wait for function execution
+        timeout_seconds: Maximum run time in seconds, and maximum wait for a free worker
+        key: Executor and zombie-tracking key (e.g. engine key); defaults to the function name
     
     Returns:
-        Decorated function that raises TimeoutError if execution exceeds timeout
+        Decorated function that raises TimeoutError if execution exceeds timeout,
+        or EngineBusyError if the key has too many zombie runs or no worker
+        became free within the timeout
     """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> T:
-            with ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(func, *args, **kwargs)
+            run_key = key or func.__name__
+            _check_zombie_limit(run_key)
+            # Waiting for a key slot and for a shared thread share one deadline
+            start_deadline = time.monotonic() + timeout_seconds
+            slots = _get_key_slots(run_key)
+            if not slots.acquire(timeout=timeout_seconds):
+                raise _busy(run_key, timeout_seconds)
+            started = threading.Event()
+
+            def run():
+                started.set()
                 try:
-                    return future.result(timeout=timeout_seconds)
-                except FutureTimeoutError:
-                    raise TimeoutError(
-                        f"函数 {func.__name__} 执行超时（超过 {timeout_seconds} 秒）"
-                    )
+                    return func(*args, **kwargs)
+                finally:
+                    slots.release()
+
+            try:
+                future = _get_executor().submit(contextvars.copy_context().run, run)
+            except BaseException:
+                slots.release()
+                raise
+            if not started.wait(max(0.0, start_deadline - time.monotonic())) and future.cancel():
+                # Never started: report a busy engine, not a slow run
+                slots.release()
+                raise _busy(run_key, timeout_seconds)
+            try:
+                return future.result(timeout=timeout_seconds)
+            except FutureTimeoutError:
+                _abandon(run_key, future)
+                raise TimeoutError(
+                    f"函数 {func.__name__} 执行超时（超过 {timeout_seconds} 秒）"
+                )
         return wrapper
     return decorator
-
-
-
-
-
-
@@ -0,0 +1,127 @@
+"""批量识别接口测试"""
+
+import os
+
+from PIL import Image
+
+from ocr_mcp_service.models import BatchItemResult, OCRResult
+from ocr_mcp_service.ocr_engine import (
+    EasyOCREngine,
+    OCREngine,
+    PaddleOCREngine,
+)
+from ocr_mcp_service.logger import get_logger
+
+
+class StubEngine(OCREngine):
+    """逐张识别的桩引擎，文件名为 bad.png 时报错"""
+
+    def recognize_image(self, image_path: str, **kwargs) -> OCRResult:
+        if os.path.basename(image_path) == "bad.png":
+            raise ValueError("bad image")
+        return OCRResult(
+            text=os.path.basename(image_path),
+            boxes=[],
+            confidence=1.0,
+            engine="stub",
+            processing_time=0.0,
+        )
+
+
+class FakePaddlePredictor:
+    """模拟PaddleOCR 3.x的predict()，记录每次调用的批大小"""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, inputs):
+        self.calls.append(list(inputs))
+        return [
+            {
+                "rec_texts": [os.path.basename(path)],
+                "rec_scores": [0.9],
+                "rec_polys": [[[0, 0], [10, 0], [10, 5], [0, 5]]],
+            }
+            for path in inputs
+        ]
+
+    def ocr(self, image_path):
+        return self.predict([image_path])
+
+
+class FakeEasyOCRReader:
+    """模拟EasyOCR的readtext_batched()，要求同一批图片尺寸一致"""
+
+    def __init__(self):
+        self.calls = []
+
+    def readtext_batched(self, images, **kwargs):
+        assert len({image.shape for image in images}) == 1
+        self.calls.append(len(images))
+        return [
+            [([[0, 0], [image.shape[1], 0], [image.shape[1], 5], [0, 5]], f"w={image.shape[1]}", 0.8)]
+            for image in images
+        ]
+
+
+def _make_images(tmp_path, sizes):
+    paths = []
+    for i, size in enumerate(sizes):
+        path = tmp_path / f"img{i}.png"
+        Image.new("RGB", size, color="white").save(path)
+        paths.append(str(path))
+    return paths
+
+
+def test_default_recognize_images_reports_errors_per_item():
+    """测试默认实现按输入顺序返回，且单张失败不影响其他图片"""
+    items = StubEngine().recognize_images(["a.png", "bad.png", "c.png"])
+
+    assert [item.image_path for item in items] == ["a.png", "bad.png", "c.png"]
+    assert [item.ok for item in items] == [True, False, True]
+    assert items[0].result.text == "a.png"
+    assert items[1].error == "bad image"
+    assert items[1].error_type == "ValueError"
+    assert items[1].to_dict() == {
+        "image_path": "bad.png",
+        "ok": False,
+        "error": "bad image",
+        "error_type": "ValueError",
+    }
+
+
+def test_paddle_recognize_images_uses_batched_predict(tmp_path):
+    """测试PaddleOCR按batch_size分块调用predict()，缺失文件单独报错"""
+    paths = _make_images(tmp_path, [(20, 10)] * 5)
+    paths.insert(2, str(tmp_path / "missing.png"))
+
+    engine = PaddleOCREngine.__new__(PaddleOCREngine)
+    engine.logger = get_logger("PaddleOCREngine")
+    engine.ocr = FakePaddlePredictor()
+
+    items = engine.recognize_images(paths, batch_size=2)
+
+    assert [len(call) for call in engine.ocr.calls] == [2, 2, 1]
+    assert len(items) == 6
+    assert items[2].error_type == "FileNotFoundError"
+    for path, item in zip(paths, items):
+        assert item.image_path == path
+        if item.ok:
+            assert item.result.text == os.path.basename(path)
+            assert item.result.engine == "paddleocr"
+            assert item.result.boxes[0].x2 == 10
+
+
+def test_easyocr_recognize_images_groups_by_size(tmp_path):
+    """测试EasyOCR按图片尺寸分组调用readtext_batched()"""
+    paths = _make_images(tmp_path, [(30, 10), (40, 10), (30, 10), (30, 10)])
+
+    engine = EasyOCREngine.__new__(EasyOCREngine)
+    engine.logger = get_logger("EasyOCREngine")
+    engine.reader = FakeEasyOCRReader()
+
+    items = engine.recognize_images(paths, batch_size=8)
+
+    assert sorted(engine.reader.calls) == [1, 3]
+    assert [item.result.text for item in items] == ["w=30", "w=40", "w=30", "w=30"]
+    assert all(isinstance(item, BatchItemResult) and item.ok for item in items)
@@ -0,0 +1,218 @@
+"""异步工具与按引擎并发限制测试"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ocr_mcp_service import tools
+from ocr_mcp_service.concurrency import EngineLimiter, OverloadedError
+from ocr_mcp_service.models import BoundingBox, OCRResult
+
+
+class Probe:
+    """记录同时运行的阻塞任务数"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+
+    def work(self, seconds, value=None):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(seconds)
+        with self.lock:
+            self.running -= 1
+        return value
+
+
+@pytest.mark.asyncio
+async def test_limiter_caps_in_flight_per_engine():
+    """测试每个引擎的在途请求数不超过上限，其它引擎不受影响"""
+    limiter = EngineLimiter(limit_for=lambda engine: 1 if engine == "slow" else 2)
+    slow, other = Probe(), Probe()
+
+    results = await asyncio.gather(
+        *[limiter.run("slow", slow.work, 0.05, i) for i in range(3)],
+        *[limiter.run("other", other.work, 0.05) for _ in range(2)],
+    )
+
+    assert results[:3] == [0, 1, 2]
+    assert slow.peak == 1
+    assert other.peak == 2
+    stats = limiter.get_stats()["slow"]
+    assert (stats["limit"], stats["in_flight"], stats["queue_depth"], stats["completed"]) == (1, 0, 0, 3)
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive():
+    """测试阻塞OCR运行期间事件循环仍能处理其它协程"""
+    limiter = EngineLimiter(limit_for=lambda engine: 1)
+    probe = Probe()
+    task = asyncio.ensure_future(limiter.run("slow", probe.work, 0.3))
+
+    start = time.monotonic()
+    await asyncio.sleep(0.01)
+    assert time.monotonic() - start < 0.2
+    assert limiter.get_stats()["slow"]["in_flight"] == 1
+    await task
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_keeps_slot_until_work_ends():
+    """测试取消的请求在线程结束前不释放并发名额"""
+    limiter = EngineLimiter(limit_for=lambda engine: 1)
+    probe = Probe()
+    first = asyncio.ensure_future(limiter.run("slow", probe.work, 0.2))
+    await asyncio.sleep(0.05)
+    first.cancel()
+    await asyncio.sleep(0)
+
+    await limiter.run("slow", probe.work, 0.0)
+    assert probe.peak == 1
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected_immediately():
+    """测试队列已满时立即拒绝并给出重试时间"""
+    limiter = EngineLimiter(
+        limit_for=lambda engine: 1, queue_max_for=lambda engine: 1, max_wait=0, initial_service_time=2.0
+    )
+    probe = Probe()
+    running = asyncio.ensure_future(limiter.run("slow", probe.work, 0.2))
+    queued = asyncio.ensure_future(limiter.run("slow", probe.work, 0.0))
+    await asyncio.sleep(0.01)
+
+    start = time.monotonic()
+    with pytest.raises(OverloadedError) as excinfo:
+        await limiter.run("slow", probe.work, 0.0)
+    assert time.monotonic() - start < 0.1
+    assert excinfo.value.reason == "queue_full"
+    assert excinfo.value.queue_depth == 1
+    assert excinfo.value.retry_after >= 1
+
+    await asyncio.gather(running, queued)
+    stats = limiter.get_stats()["slow"]
+    assert stats["rejected"] == {"queue_full": 1}
+    assert stats["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_estimated_wait_exceeds_max():
+    """测试预计等待时间超过上限时拒绝，估计值随实际耗时更新"""
+    limiter = EngineLimiter(
+        limit_for=lambda engine: 1, queue_max_for=lambda engine: 0, max_wait=1.0, initial_service_time=5.0
+    )
+    probe = Probe()
+    running = asyncio.ensure_future(limiter.run("slow", probe.work, 0.1))
+    await asyncio.sleep(0.01)
+    assert limiter.estimate_wait("slow") == pytest.approx(5.0)
+
+    with pytest.raises(OverloadedError) as excinfo:
+        await limiter.run("slow", probe.work, 0.0)
+    assert excinfo.value.reason == "wait_too_long"
+    assert excinfo.value.retry_after >= 5
+
+    await running
+    # One measured 0.1s run replaces the initial guess
+    assert limiter.get_stats()["slow"]["avg_service_time"] < 1.0
+    assert limiter.estimate_wait("slow") == 0.0
+
+
+@pytest.mark.asyncio
+async def test_wait_timeout_rejects_queued_request():
+    """测试排队超过最长等待时间的请求被拒绝"""
+    limiter = EngineLimiter(
+        limit_for=lambda engine: 1, queue_max_for=lambda engine: 0, max_wait=0.05, initial_service_time=0.0
+    )
+    probe = Probe()
+    running = asyncio.ensure_future(limiter.run("slow", probe.work, 0.3))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(OverloadedError) as excinfo:
+        await limiter.run("slow", probe.work, 0.0)
+    assert excinfo.value.reason == "wait_timeout"
+    await running
+    assert limiter.get_stats()["slow"]["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_tool_is_async_and_propagates_errors(monkeypatch):
+    """测试识别工具为异步函数，错误仍按原格式返回"""
+    def fake_recognize(engine_type, image_path, **kwargs):
+        if image_path == "missing.png":
+            raise FileNotFoundError(image_path)
+        return OCRResult(text="ok", boxes=[], confidence=1.0, engine=engine_type, processing_time=0.0)
+
+    monkeypatch.setattr(tools, "_recognize_with_engine", fake_recognize)
+
+    fn = tools.recognize_image_paddleocr.fn
+    assert asyncio.iscoroutinefunction(fn)
+    assert (await fn("image.png"))["text"] == "ok"
+    error = await fn("missing.png")
+    assert error["error_type"] == "FileNotFoundError"
+
+    async def overloaded(engine_type, func, *args, **kwargs):
+        raise OverloadedError(engine_type, "queue_full", 7, 16, 12.0)
+
+    monkeypatch.setattr(tools, "run_ocr", overloaded)
+    refused = await fn("image.png")
+    assert refused["error_type"] == "OverloadedError"
+    assert refused["retry_after"] == 7
+    assert refused["queue_depth"] == 16
+    assert "concurrency" in tools.health_check.fn()
+
+
+@pytest.mark.asyncio
+async def test_batch_tool_runs_images_concurrently(tmp_path, monkeypatch):
+    """测试批量工具并发识别、按输入顺序返回，单张失败不影响其它图片"""
+    for name in ("b.png", "a.png", "c.txt"):
+        (tmp_path / name).write_bytes(b"x")
+    probe = Probe()
+
+    def fake_recognize(engine_type, image_path, **kwargs):
+        probe.work(0.05)
+        if image_path.endswith("bad.png"):
+            raise FileNotFoundError(image_path)
+        return OCRResult(
+            text=f"{image_path}:{kwargs.get('lang')}",
+            boxes=[BoundingBox(0, 0, 1, 1)],
+            confidence=1.0,
+            engine=engine_type,
+            processing_time=0.0,
+        )
+
+    limiter = EngineLimiter(limit_for=lambda engine: 3)
+    monkeypatch.setattr(tools, "_recognize_with_engine", fake_recognize)
+    monkeypatch.setattr(tools, "get_engine_limiter", lambda: limiter)
+
+    async def run_ocr(engine_type, func, *args, **kwargs):
+        return await limiter.run(engine_type, func, *args, **kwargs)
+
+    monkeypatch.setattr(tools, "run_ocr", run_ocr)
+
+    response = await tools.recognize_images_batch.fn(
+        image_paths=["bad.png", str(tmp_path / "a.png")],
+        pattern=str(tmp_path / "*.png"),
+        lang="en",
+        include_boxes=False,
+    )
+
+    paths = [r["image_path"] for r in response["results"]]
+    assert paths == ["bad.png", str(tmp_path / "a.png"), str(tmp_path / "b.png")]
+    assert (response["total"], response["succeeded"], response["failed"]) == (3, 2, 1)
+    assert response["results"][0]["error_type"] == "FileNotFoundError"
+    assert response["results"][1]["result"]["text"].endswith("a.png:en")
+    assert "boxes" not in response["results"][1]["result"]
+    assert probe.peak > 1
+
+
+@pytest.mark.asyncio
+async def test_batch_tool_validates_input():
+    """测试批量工具的参数校验"""
+    assert (await tools.recognize_images_batch.fn())["error_type"] == "ValueError"
+    response = await tools.recognize_images_batch.fn(image_paths=["a.png"], engine="nope")
+    assert "不支持的引擎" in response["error"]
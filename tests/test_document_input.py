@@ -0,0 +1,149 @@
+"""多页文档（PDF、多帧TIFF）输入测试"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from ocr_mcp_service import tools
+from ocr_mcp_service.document_input import (
+    count_pages,
+    is_multipage_document,
+    iter_pages,
+    parse_page_range,
+    recognize_document,
+)
+from ocr_mcp_service.models import DocumentResult, OCRResult
+from ocr_mcp_service.ocr_engine import OCREngine, OCREngineFactory
+
+# Frame colors encode the page number in the red channel
+COLORS = [(10, 0, 0), (20, 0, 0), (30, 0, 0), (40, 0, 0)]
+
+
+@pytest.fixture
+def tiff_path(tmp_path):
+    path = tmp_path / "scan.tiff"
+    frames = [Image.new("RGB", (60, 40), color=c) for c in COLORS]
+    frames[0].save(path, save_all=True, append_images=frames[1:])
+    return str(path)
+
+
+def _page_result(pixels):
+    return OCRResult(
+        text=f"page {pixels[0, 0, 0] // 10}",
+        boxes=[],
+        confidence=0.5,
+        engine="stub",
+        processing_time=0.0,
+    )
+
+
+def test_is_multipage_document(tiff_path, tmp_path):
+    """测试只有PDF和多帧TIFF按文档处理"""
+    single = tmp_path / "single.tiff"
+    Image.new("RGB", (10, 10)).save(single)
+    pdf = tmp_path / "doc.bin"
+    pdf.write_bytes(b"%PDF-1.4\n")
+
+    assert is_multipage_document(tiff_path)
+    assert is_multipage_document(str(pdf))
+    assert not is_multipage_document(str(single))
+    assert not is_multipage_document(str(tmp_path / "missing.pdf"))
+    assert count_pages(tiff_path) == 4
+
+
+def test_parse_page_range():
+    """测试页码范围解析"""
+    assert parse_page_range(None, 3) == [1, 2, 3]
+    assert parse_page_range("2", 5) == [2]
+    assert parse_page_range("1-2, 4-", 6) == [1, 2, 4, 5, 6]
+    assert parse_page_range("-2,2", 6) == [1, 2]
+    assert parse_page_range("3-10", 4) == [3, 4]
+    for spec in ("a", "0", "3-1"):
+        with pytest.raises(ValueError):
+            parse_page_range(spec, 5)
+    with pytest.raises(ValueError):
+        parse_page_range("9", 5)
+
+
+def test_pages_are_lazy(tiff_path):
+    """测试页面在访问像素前不解码"""
+    pages = list(iter_pages(tiff_path, [2, 4]))
+    assert [p.page for p in pages] == [2, 4]
+    assert not any(p.is_decoded for p in pages)
+    assert tuple(pages[1].array[0, 0]) == COLORS[3]
+    assert pages[1].source_file is None
+
+
+def test_recognize_document_releases_each_page(tiff_path):
+    """测试逐页识别，识别完的页面立即释放，单页失败不影响其它页"""
+    seen, progress = [], []
+
+    def recognize_page(image):
+        # The previous page is already released
+        assert all(not p.is_decoded for p in seen)
+        seen.append(image)
+        if image.page == 3:
+            raise RuntimeError("boom")
+        return _page_result(image.array)
+
+    result = recognize_document(
+        tiff_path, recognize_page, progress_callback=lambda r, done, total: progress.append((done, total))
+    )
+
+    assert isinstance(result, DocumentResult)
+    assert result.page_count == 4
+    assert [p.page for p in result.pages] == [1, 2, 3, 4]
+    assert [p.ok for p in result.pages] == [True, True, False, True]
+    assert result.pages[2].error_type == "RuntimeError"
+    assert result.text == "page 1\n\npage 2\n\npage 4"
+    assert progress == [(1, 4), (2, 4), (3, 4), (4, 4)]
+    data = result.to_dict()
+    assert data["pages"][0]["text"] == "page 1"
+    assert data["pages"][2]["error"] == "boom"
+
+
+def test_recognize_document_raises_when_all_pages_fail(tiff_path):
+    """测试所有页都失败时抛出异常"""
+    def recognize_page(image):
+        raise RuntimeError("engine down")
+
+    with pytest.raises(RuntimeError, match="engine down"):
+        recognize_document(tiff_path, recognize_page, pages="1-2")
+
+
+def test_tool_path_recognizes_selected_pages(tiff_path, monkeypatch):
+    """测试工具层按页码范围逐页识别，文件型引擎收到单页临时文件"""
+    received = []
+
+    class FileEngine(OCREngine):
+        def recognize_image(self, image_path, **kwargs):
+            with Image.open(image_path) as img:
+                received.append(img.size)
+                return _page_result(np.asarray(img))
+
+    monkeypatch.setattr(tools, "get_result_cache", lambda: None)
+    monkeypatch.setattr(OCREngineFactory, "_engines", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_usage_count", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_locks", {})
+    monkeypatch.setattr(OCREngineFactory, "_pools", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_info", {})
+    monkeypatch.setattr(
+        OCREngineFactory, "_create_engine", staticmethod(lambda engine_type, **kwargs: FileEngine())
+    )
+
+    result = tools._recognize_with_engine("stub", tiff_path, pages="2,4")
+    assert received == [(60, 40), (60, 40)]
+    assert result.to_dict()["text"] == "page 2\n\npage 4"
+    assert [p["page"] for p in result.to_dict()["pages"]] == [2, 4]
+
+
+def test_pdf_pages(tmp_path):
+    """测试PDF逐页栅格化（需要pypdfium2）"""
+    pytest.importorskip("pypdfium2")
+    path = tmp_path / "doc.pdf"
+    frames = [Image.new("RGB", (72, 36), color=c) for c in COLORS[:2]]
+    frames[0].save(path, save_all=True, append_images=frames[1:], resolution=72)
+
+    assert count_pages(str(path)) == 2
+    shapes = [(page.page, page.size, page.array.shape) for page in iter_pages(str(path), dpi=144)]
+    assert shapes == [(1, (144, 72), (72, 144, 3)), (2, (144, 72), (72, 144, 3))]
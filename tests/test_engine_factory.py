@@ -0,0 +1,212 @@
+"""引擎工厂并发测试"""
+
+import threading
+import time
+
+import pytest
+
+from ocr_mcp_service.ocr_engine import OCREngine, OCREngineFactory
+from ocr_mcp_service.models import OCRResult
+
+
+class SlowStubEngine(OCREngine):
+    """模拟加载缓慢的引擎"""
+
+    init_count = 0
+    _count_lock = threading.Lock()
+
+    def __init__(self, load_time: float = 0.1):
+        with SlowStubEngine._count_lock:
+            SlowStubEngine.init_count += 1
+        time.sleep(load_time)
+
+    def recognize_image(self, image_path: str, **kwargs) -> OCRResult:
+        return OCRResult(text="stub", boxes=[], confidence=1.0, engine="stub", processing_time=0.0)
+
+
+@pytest.fixture
+def stub_factory(monkeypatch):
+    """用慢速桩引擎替换工厂的引擎构造"""
+    SlowStubEngine.init_count = 0
+    monkeypatch.setattr(OCREngineFactory, "_engines", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_usage_count", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_locks", {})
+    monkeypatch.setattr(OCREngineFactory, "_pools", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_info", {})
+
+    def create_engine(engine_type, **kwargs):
+        if engine_type != "stub":
+            raise ValueError(f"Unknown engine type: {engine_type}")
+        return SlowStubEngine()
+
+    monkeypatch.setattr(OCREngineFactory, "_create_engine", staticmethod(create_engine))
+    return OCREngineFactory
+
+
+def test_get_engine_key():
+    """测试引擎缓存键"""
+    assert OCREngineFactory.get_engine_key("paddleocr") == "paddleocr"
+    assert OCREngineFactory.get_engine_key("easyocr") == "easyocr"
+    assert OCREngineFactory.get_engine_key("easyocr", languages=["en", "ch_sim"]) == "easyocr_ch_sim,en"
+
+
+def test_concurrent_cold_start_loads_once(stub_factory):
+    """测试并发冷启动时只加载一次引擎"""
+    results = []
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        results.append(stub_factory.get_engine("stub"))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert SlowStubEngine.init_count == 1
+    assert len(results) == 8
+    assert all(engine is results[0] for engine in results)
+    assert stub_factory.get_usage_stats()["usage_count"]["stub"] == 8
+
+
+def test_usage_count_is_atomic(stub_factory):
+    """测试使用计数在并发下准确"""
+    stub_factory.get_engine("stub")
+
+    def worker():
+        for _ in range(200):
+            stub_factory.get_engine("stub")
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert stub_factory.get_usage_stats()["usage_count"]["stub"] == 1 + 8 * 200
+
+
+def test_failed_init_can_be_retried(stub_factory):
+    """测试初始化失败后可以重试，且不会缓存失败的引擎"""
+    with pytest.raises(ValueError):
+        stub_factory.get_engine("unknown_engine")
+    assert stub_factory.get_engine_count() == 0
+
+    assert stub_factory.get_engine("stub") is not None
+    assert stub_factory.get_engine_count() == 1
+
+
+def test_acquire_engine_uses_replica_pool(stub_factory, monkeypatch):
+    """测试acquire_engine按池大小创建副本并并发借出"""
+    monkeypatch.setenv("ENGINE_POOL_SIZE_STUB", "3")
+    barrier = threading.Barrier(3)
+    engines = []
+
+    def worker():
+        with stub_factory.acquire_engine("stub", timeout=5) as engine:
+            engines.append(engine)
+            barrier.wait()
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len({id(engine) for engine in engines}) == 3
+    assert SlowStubEngine.init_count == 3
+    stats = stub_factory.get_usage_stats()["pools"]["stub"]
+    assert stats["size"] == 3
+    assert stats["in_use"] == 0
+    assert stats["idle"] == 3
+    # get_engine still returns the shared primary instance
+    assert stub_factory.get_engine("stub") in engines
+
+
+class SizedStubEngine(OCREngine):
+    """报告固定内存占用并记录卸载的桩引擎"""
+
+    def __init__(self, memory_mb: int):
+        self.memory_mb = memory_mb
+        self.unloaded = False
+
+    def get_memory_usage(self):
+        return self.memory_mb * 1024 * 1024
+
+    def unload(self):
+        self.unloaded = True
+
+    def recognize_image(self, image_path: str, **kwargs) -> OCRResult:
+        return OCRResult(text="stub", boxes=[], confidence=1.0, engine="stub", processing_time=0.0)
+
+
+@pytest.fixture
+def sized_factory(stub_factory, monkeypatch):
+    """按引擎类型返回不同内存占用的桩引擎"""
+    sizes = {"small": 100, "medium": 300, "large": 500}
+    created = []
+
+    def create_engine(engine_type, **kwargs):
+        engine = SizedStubEngine(sizes[engine_type])
+        created.append(engine)
+        return engine
+
+    monkeypatch.setattr(OCREngineFactory, "_create_engine", staticmethod(create_engine))
+    stub_factory.created = created
+    return stub_factory
+
+
+def test_idle_engines_are_unloaded(sized_factory, monkeypatch):
+    """测试超过空闲时间的引擎被卸载，使用中的引擎保留"""
+    monkeypatch.setenv("ENGINE_IDLE_TTL_SMALL", "60")
+    monkeypatch.setenv("ENGINE_IDLE_TTL_MEDIUM", "60")
+    small = sized_factory.get_engine("small")
+    sized_factory.get_engine("medium")
+    now = time.monotonic()
+
+    assert sized_factory.evict_idle_engines(now=now + 30) == []
+    with sized_factory.acquire_engine("medium"):
+        # medium is checked out, so only small can go
+        assert sized_factory.evict_idle_engines(now=now + 120) == ["small"]
+
+    assert small.unloaded
+    assert sized_factory.get_usage_stats()["engines"] == ["medium"]
+    assert list(sized_factory.get_resident_engines()) == ["medium"]
+
+    # Unloaded engines are loaded again on demand
+    assert sized_factory.get_engine("small") is not small
+
+
+def test_memory_budget_evicts_least_recently_used(sized_factory, monkeypatch):
+    """测试超出内存预算时按LRU卸载其他引擎"""
+    import ocr_mcp_service.ocr_engine as ocr_engine
+    monkeypatch.setattr(ocr_engine, "ENGINE_MEMORY_BUDGET_MB", 700)
+
+    sized_factory.get_engine("small")
+    time.sleep(0.01)
+    sized_factory.get_engine("medium")
+    time.sleep(0.01)
+    sized_factory.get_engine("small")  # small is now more recent than medium
+    time.sleep(0.01)
+    sized_factory.get_engine("large")  # 100 + 300 + 500 > 700
+
+    resident = sized_factory.get_resident_engines()
+    assert sorted(resident) == ["large", "small"]
+    assert resident["large"]["memory_mb"] == 500
+    assert [e.unloaded for e in sized_factory.created] == [False, True, False]
+
+
+def test_unload_engine_closes_pool(sized_factory):
+    """测试卸载引擎时释放池中所有副本，之后的acquire重新加载"""
+    with sized_factory.acquire_engine("small") as first:
+        assert not sized_factory.unload_engine("small")  # in use
+
+    assert sized_factory.unload_engine("small")
+    assert first.unloaded
+    assert sized_factory.get_engine_count() == 0
+
+    with sized_factory.acquire_engine("small") as second:
+        assert second is not first
+        assert not second.unloaded
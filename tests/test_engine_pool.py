@@ -0,0 +1,132 @@
+"""引擎副本池测试"""
+
+import threading
+import time
+
+import pytest
+
+from ocr_mcp_service.engine_pool import EnginePool, PoolClosedError
+
+
+def _counting_factory():
+    created = []
+
+    def create():
+        engine = object()
+        created.append(engine)
+        return engine
+
+    return create, created
+
+
+def test_pool_seeded_with_initial():
+    """测试池使用已加载的实例作为第一个副本"""
+    initial = object()
+    create, created = _counting_factory()
+    pool = EnginePool("test", create, max_size=2, initial=initial)
+
+    engine = pool.checkout()
+    assert engine is initial
+    assert created == []
+    pool.checkin(engine)
+
+    stats = pool.get_stats()
+    assert stats["size"] == 1
+    assert stats["idle"] == 1
+    assert stats["in_use"] == 0
+    assert stats["checkouts"] == 1
+
+
+def test_pool_grows_up_to_max_size():
+    """测试池按需创建副本且不超过上限"""
+    create, created = _counting_factory()
+    pool = EnginePool("test", create, max_size=2)
+
+    first = pool.checkout()
+    second = pool.checkout()
+    assert first is not second
+    assert len(created) == 2
+
+    stats = pool.get_stats()
+    assert stats["size"] == 2
+    assert stats["in_use"] == 2
+    assert stats["idle"] == 0
+
+    with pytest.raises(TimeoutError):
+        pool.checkout(timeout=0.05)
+    assert pool.get_stats()["timeouts"] == 1
+
+    pool.checkin(first)
+    assert pool.checkout(timeout=0.05) is first
+    assert len(created) == 2
+
+
+def test_pool_waiter_receives_checked_in_replica():
+    """测试等待者在副本归还后被唤醒"""
+    create, _ = _counting_factory()
+    pool = EnginePool("test", create, max_size=1)
+    engine = pool.checkout()
+    received = []
+
+    def waiter():
+        received.append(pool.checkout(timeout=5))
+
+    t = threading.Thread(target=waiter)
+    t.start()
+    deadline = time.time() + 5
+    while pool.get_stats()["waiters"] == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert pool.get_stats()["waiters"] == 1
+
+    pool.checkin(engine)
+    t.join(timeout=5)
+    assert received == [engine]
+    assert pool.get_stats()["waiters"] == 0
+
+
+def test_pool_acquire_context_manager_returns_replica():
+    """测试acquire上下文管理器在异常时也归还副本"""
+    create, _ = _counting_factory()
+    pool = EnginePool("test", create, max_size=1)
+
+    with pytest.raises(RuntimeError):
+        with pool.acquire(timeout=1):
+            raise RuntimeError("boom")
+
+    stats = pool.get_stats()
+    assert stats["in_use"] == 0
+    assert stats["idle"] == 1
+
+
+def test_pool_failed_creation_releases_slot():
+    """测试副本创建失败后释放名额"""
+    attempts = []
+
+    def create():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("load failed")
+        return object()
+
+    pool = EnginePool("test", create, max_size=1)
+    with pytest.raises(RuntimeError):
+        pool.checkout(timeout=1)
+    assert pool.get_stats()["creating"] == 0
+
+    engine = pool.checkout(timeout=1)
+    assert engine is not None
+    assert pool.get_stats()["size"] == 1
+
+
+def test_pool_close_if_idle():
+    """测试空闲时关闭池并返回副本，关闭后无法借出"""
+    create, _ = _counting_factory()
+    pool = EnginePool("test", create, max_size=2)
+
+    engine = pool.checkout(timeout=1)
+    assert pool.close_if_idle() is None  # in use
+    pool.checkin(engine)
+
+    assert pool.close_if_idle() == [engine]
+    with pytest.raises(PoolClosedError):
+        pool.checkout(timeout=1)
@@ -0,0 +1,102 @@
+"""引擎工作进程测试"""
+
+import os
+import time
+
+import pytest
+
+from ocr_mcp_service.engine_worker import EngineWorker, ProcessEngine
+from ocr_mcp_service.models import OCRResult
+from ocr_mcp_service.ocr_engine import OCREngine
+
+
+class StubEngine(OCREngine):
+    """根据图片路径模拟正常、缓慢、报错和崩溃的引擎"""
+
+    def recognize_image(self, image_path: str, **kwargs) -> OCRResult:
+        name = os.path.basename(image_path)
+        if name == "sleep.png":
+            time.sleep(30)
+        elif name == "crash.png":
+            os._exit(3)
+        elif name == "missing.png":
+            raise FileNotFoundError(f"Image file not found: {image_path}")
+        return OCRResult(
+            text=f"pid={os.getpid()}",
+            boxes=[],
+            confidence=1.0,
+            engine="stub",
+            processing_time=0.0,
+        )
+
+
+def stub_engine_factory(engine_type, **kwargs):
+    """在工作进程中构造桩引擎（需可pickle，故定义在模块级）"""
+    if engine_type == "broken":
+        raise ImportError("stub engine not installed")
+    return StubEngine()
+
+
+@pytest.fixture
+def worker():
+    worker = EngineWorker("stub", engine_factory=stub_engine_factory, start_timeout=60)
+    yield worker
+    worker.close()
+
+
+def test_worker_recognizes_in_separate_process(worker):
+    """测试识别在独立进程中执行"""
+    result = worker.recognize_image("ok.png", timeout=30)
+    assert isinstance(result, OCRResult)
+    assert result.text == f"pid={worker.pid}"
+    assert worker.pid != os.getpid()
+
+
+def test_worker_timeout_kills_and_respawns(worker):
+    """测试超时后终止工作进程并在下次请求时重启"""
+    old_pid = worker.pid
+    start = time.time()
+    with pytest.raises(TimeoutError):
+        worker.recognize_image("sleep.png", timeout=0.5)
+    assert time.time() - start < 10
+    assert not worker.is_alive()
+
+    result = worker.recognize_image("ok.png", timeout=30)
+    assert worker.restarts == 1
+    assert worker.pid != old_pid
+    assert result.text == f"pid={worker.pid}"
+
+
+def test_worker_crash_is_reported_and_recovered(worker):
+    """测试工作进程崩溃后报错并恢复"""
+    with pytest.raises(RuntimeError, match="exitcode=3"):
+        worker.recognize_image("crash.png", timeout=30)
+
+    result = worker.recognize_image("ok.png", timeout=30)
+    assert result.engine == "stub"
+    assert worker.restarts == 1
+
+
+def test_worker_propagates_builtin_exceptions(worker):
+    """测试引擎异常类型被保留，且工作进程不重启"""
+    with pytest.raises(FileNotFoundError):
+        worker.recognize_image("missing.png", timeout=30)
+    assert worker.is_alive()
+    assert worker.restarts == 0
+
+
+def test_worker_init_error():
+    """测试引擎加载失败时抛出原始异常类型"""
+    with pytest.raises(ImportError, match="not installed"):
+        EngineWorker("broken", engine_factory=stub_engine_factory, start_timeout=60)
+
+
+def test_process_engine_supports_timeout():
+    """测试ProcessEngine作为OCREngine使用"""
+    engine = ProcessEngine("stub", engine_factory=stub_engine_factory)
+    try:
+        assert engine.supports_timeout
+        result = engine.recognize_image("ok.png", timeout=30)
+        assert result.engine == "stub"
+    finally:
+        engine.close()
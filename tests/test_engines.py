@@ -267,3 +267,92 @@ def test_engine_recognize_nonexistent_file():
 
 
 
+
+
+def test_paddleocr_mcp_reuses_one_predictor(monkeypatch, tmp_path):
+    """Test that paddleocr-mcp builds the PaddleOCR predictor once and reuses it across calls."""
+    import importlib.machinery
+    import sys
+    import types
+
+    constructed = []
+    calls = []
+
+    class FakePaddleOCR:
+        def __init__(self, *args, **kwargs):
+            constructed.append(self)
+
+        def ocr(self, source):
+            calls.append(self)
+            return [[[[[0, 0], [10, 0], [10, 10], [0, 10]], ("hello", 0.9)]]]
+
+    for name, attrs in (("paddleocr_mcp", {}), ("paddleocr", {"PaddleOCR": FakePaddleOCR})):
+        module = types.ModuleType(name)
+        module.__spec__ = importlib.machinery.ModuleSpec(name, None)
+        for key, value in attrs.items():
+            setattr(module, key, value)
+        monkeypatch.setitem(sys.modules, name, module)
+
+    image_path = tmp_path / "a.png"
+    Image.new("RGB", (20, 20), "white").save(image_path)
+
+    engine = PaddleOCRMCPEngine()
+    for _ in range(3):
+        result = engine.recognize_image(str(image_path))
+        assert result.text == "hello"
+
+    assert len(constructed) == 1
+    assert calls == constructed * 3
+
+
+def test_paddleocr_engine_per_language(monkeypatch, tmp_path):
+    """Test that the PaddleOCR language picks (and keys) the engine instead of being ignored."""
+    import sys
+    import types
+    from ocr_mcp_service import tools
+    from ocr_mcp_service.config import PADDLEOCR_LANG
+
+    langs = []
+
+    class FakePaddleOCR:
+        def __init__(self, lang=None, **kwargs):
+            langs.append(lang)
+
+    module = types.ModuleType("paddleocr")
+    module.PaddleOCR = FakePaddleOCR
+    monkeypatch.setitem(sys.modules, "paddleocr", module)
+
+    assert OCREngineFactory.get_engine_key("paddleocr") == "paddleocr"
+    assert OCREngineFactory.get_engine_key("paddleocr", lang=PADDLEOCR_LANG) == "paddleocr"
+    assert OCREngineFactory.get_engine_key("paddleocr", lang="xx") == "paddleocr_xx"
+    assert PaddleOCREngine().lang == PADDLEOCR_LANG
+    assert PaddleOCREngine(lang="xx").lang == "xx"
+    assert langs == [PADDLEOCR_LANG, "xx"]
+
+    created = []
+
+    class LangEngine(PaddleOCREngine):
+        def __init__(self, lang=None):
+            self.lang = lang or PADDLEOCR_LANG
+            created.append(self.lang)
+
+        def recognize_image(self, image_path, image=None, **kwargs):
+            return OCRResult(text=self.lang, boxes=[], confidence=1.0, engine="paddleocr", processing_time=0.0)
+
+    monkeypatch.setattr(tools, "get_result_cache", lambda: None)
+    monkeypatch.setattr(tools, "_wait_for_preload", lambda engine_type, timeout: None)
+    monkeypatch.setattr(OCREngineFactory, "_engines", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_usage_count", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_locks", {})
+    monkeypatch.setattr(OCREngineFactory, "_pools", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_info", {})
+    monkeypatch.setattr(
+        OCREngineFactory, "_create_engine", staticmethod(lambda engine_type, **kwargs: LangEngine(**kwargs))
+    )
+
+    image_path = tmp_path / "a.png"
+    Image.new("RGB", (20, 20), "white").save(image_path)
+    assert tools._recognize_with_engine("paddleocr", str(image_path), lang="xx").text == "xx"
+    assert tools._recognize_with_engine("paddleocr", str(image_path), lang="xx").text == "xx"
+    assert tools._recognize_with_engine("paddleocr", str(image_path)).text == PADDLEOCR_LANG
+    assert created == ["xx", PADDLEOCR_LANG]
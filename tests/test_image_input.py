@@ -0,0 +1,265 @@
+"""单次解码图像输入测试"""
+
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from ocr_mcp_service import tools
+from ocr_mcp_service.image_input import LoadedImage, load_image, to_bgr_array
+from ocr_mcp_service.models import OCRResult
+from ocr_mcp_service.ocr_engine import OCREngine, OCREngineFactory
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    path = tmp_path / "image.png"
+    img = Image.new("RGB", (40, 20), color=(255, 0, 0))
+    img.save(path)
+    return str(path)
+
+
+def test_open_reads_header_only(image_path):
+    """测试打开图片只读取文件头，像素在首次访问时解码"""
+    image = load_image(image_path)
+    assert image.size == (40, 20)
+    assert image.format == "PNG"
+    assert not image.is_decoded
+
+    array = image.array
+    assert array.shape == (20, 40, 3)
+    assert tuple(array[0, 0]) == (255, 0, 0)
+    assert tuple(image.bgr_array[0, 0]) == (0, 0, 255)
+    assert image.bgr_array.flags["C_CONTIGUOUS"]
+
+
+def test_pixels_are_decoded_once(image_path, monkeypatch):
+    """测试多次访问像素只解码一次"""
+    calls = []
+    original = LoadedImage._decode
+
+    def counting_decode(self):
+        calls.append(1)
+        return original(self)
+
+    monkeypatch.setattr(LoadedImage, "_decode", counting_decode)
+    image = load_image(image_path)
+    image.array
+    image.bgr_array
+    image.pil_image
+    assert len(calls) == 1
+
+
+def test_invalid_images(tmp_path):
+    """测试不存在或无法识别的文件"""
+    with pytest.raises(FileNotFoundError):
+        load_image(str(tmp_path / "missing.png"))
+
+    bad = tmp_path / "bad.png"
+    bad.write_bytes(b"not an image")
+    with pytest.raises(ValueError):
+        load_image(str(bad))
+
+
+def test_from_array_and_helpers():
+    """测试直接传入数组"""
+    gray = np.zeros((5, 6), dtype=np.uint8)
+    image = LoadedImage.from_array(gray)
+    assert image.size == (6, 5)
+    assert image.array.shape == (5, 6, 3)
+
+    rgb = np.zeros((2, 2, 3), dtype=np.uint8)
+    rgb[..., 0] = 7
+    assert to_bgr_array(rgb)[0, 0, 2] == 7
+
+
+def test_recognize_passes_decoded_image_to_array_engines(image_path, monkeypatch):
+    """测试工具层把同一个图像对象传给支持数组输入的引擎"""
+    received = {}
+
+    class ArrayEngine(OCREngine):
+        accepts_arrays = True
+
+        def recognize_image(self, image_path, image=None, **kwargs):
+            received["image"] = image
+            received["shape"] = image.array.shape
+            return OCRResult(text="", boxes=[], confidence=0.0, engine="stub", processing_time=0.0)
+
+    monkeypatch.setattr(tools, "get_result_cache", lambda: None)
+    monkeypatch.setattr(OCREngineFactory, "_engines", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_usage_count", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_locks", {})
+    monkeypatch.setattr(OCREngineFactory, "_pools", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_info", {})
+    monkeypatch.setattr(
+        OCREngineFactory, "_create_engine", staticmethod(lambda engine_type, **kwargs: ArrayEngine())
+    )
+
+    tools._recognize_with_engine("stub", image_path)
+    assert isinstance(received["image"], LoadedImage)
+    assert received["shape"] == (20, 40, 3)
+    # Pixels are released once the request is done
+    assert not received["image"].is_decoded
+
+
+def test_exif_orientation_is_applied(tmp_path):
+    """测试带EXIF方向的图片按正向解码，尺寸取旋转后的值，且不直接交给读文件的引擎"""
+    path = tmp_path / "rotated.jpg"
+    # Stored 40x20 with a red left half; orientation 6 means "rotate 90° clockwise to view"
+    stored = Image.new("RGB", (40, 20), color=(0, 0, 255))
+    stored.paste((255, 0, 0), (0, 0, 20, 20))
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    stored.save(path, exif=exif, quality=95)
+
+    image = load_image(str(path), max_side=0)
+    assert image.size == (20, 40)
+    assert image.source_file is None
+    array = image.array
+    assert array.shape == (40, 20, 3)
+    # The stored left half ends up on top
+    assert array[5, 10, 0] > 200 and array[35, 10, 2] > 200
+
+    downscaled = load_image(str(path), max_side=20)
+    assert downscaled.size == (10, 20)
+    assert downscaled.array.shape == (20, 10, 3)
+
+    plain = tmp_path / "plain.jpg"
+    Image.new("RGB", (40, 20)).save(plain)
+    assert load_image(str(plain), max_side=0).source_file is not None
+
+
+def test_compute_scale():
+    """测试缩放比例计算"""
+    from ocr_mcp_service.image_input import compute_scale
+
+    assert compute_scale(3000, 4500) == 1.0
+    assert compute_scale(3000, 4500, max_side=4500) == 1.0
+    assert compute_scale(3000, 4500, max_side=1500) == pytest.approx(1 / 3)
+    assert compute_scale(4000, 3000, max_pixels=3_000_000) == pytest.approx(0.5)
+    assert compute_scale(4000, 3000, max_side=1000, max_pixels=3_000_000) == pytest.approx(0.25)
+
+
+def test_downscaled_jpeg_decode(tmp_path):
+    """测试大JPEG按限制缩小解码"""
+    path = tmp_path / "photo.jpg"
+    Image.new("RGB", (3000, 4500), color=(0, 128, 255)).save(path, quality=90)
+
+    image = load_image(str(path), max_side=1000)
+    assert image.size == (667, 1000)
+    assert (image.original_width, image.original_height) == (3000, 4500)
+    assert image.scale == pytest.approx(1000 / 4500, rel=1e-3)
+    assert image.array.shape == (1000, 667, 3)
+
+    full = load_image(str(path), max_side=0)
+    assert full.size == (3000, 4500)
+    assert full.scale == 1.0
+
+
+def test_rescale_boxes():
+    """测试文本框坐标映射回原图"""
+    from ocr_mcp_service.image_input import rescale_boxes
+    from ocr_mcp_service.models import BoundingBox
+
+    boxes = rescale_boxes([BoundingBox(10, 20, 30, 40)], 0.5, 0.25)
+    assert boxes == [BoundingBox(20, 80, 60, 160)]
+
+
+def test_recognize_remaps_boxes_after_downscale(tmp_path, monkeypatch):
+    """测试缩小识别后文本框为原图坐标并记录缩放比例"""
+    from ocr_mcp_service.models import BoundingBox
+
+    path = tmp_path / "large.png"
+    Image.new("RGB", (800, 400), color="white").save(path)
+
+    class ArrayEngine(OCREngine):
+        accepts_arrays = True
+
+        def recognize_image(self, image_path, image=None, **kwargs):
+            h, w = image.array.shape[:2]
+            return OCRResult(
+                text="x", boxes=[BoundingBox(0, 0, w, h)], confidence=1.0, engine="stub", processing_time=0.0
+            )
+
+    monkeypatch.setattr(tools, "get_result_cache", lambda: None)
+    monkeypatch.setattr(OCREngineFactory, "_engines", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_usage_count", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_locks", {})
+    monkeypatch.setattr(OCREngineFactory, "_pools", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_info", {})
+    monkeypatch.setattr(
+        OCREngineFactory, "_create_engine", staticmethod(lambda engine_type, **kwargs: ArrayEngine())
+    )
+
+    result = tools._recognize_with_engine("stub", str(path), max_side=200)
+    assert result.scale == pytest.approx(0.25)
+    assert result.boxes == [BoundingBox(0, 0, 800, 400)]
+    assert result.to_dict()["scale"] == pytest.approx(0.25)
+
+
+def test_file_engines_receive_downscaled_temp_file(tmp_path, monkeypatch):
+    """测试读取文件的引擎在缩小时收到缩小后的临时文件，文本框映射回原图坐标"""
+    from ocr_mcp_service.models import BoundingBox
+
+    path = tmp_path / "large.png"
+    Image.new("RGB", (800, 400), color="white").save(path)
+    received = []
+
+    class FileEngine(OCREngine):
+        accepts_arrays = False
+
+        def recognize_image(self, image_path, **kwargs):
+            with Image.open(image_path) as image:
+                w, h = image.size
+            received.append((image_path, (w, h)))
+            return OCRResult(
+                text="x", boxes=[BoundingBox(0, 0, w, h)], confidence=1.0, engine="stub", processing_time=0.0
+            )
+
+    monkeypatch.setattr(tools, "get_result_cache", lambda: None)
+    monkeypatch.setattr(OCREngineFactory, "_engines", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_usage_count", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_locks", {})
+    monkeypatch.setattr(OCREngineFactory, "_pools", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_info", {})
+    monkeypatch.setattr(
+        OCREngineFactory, "_create_engine", staticmethod(lambda engine_type, **kwargs: FileEngine())
+    )
+
+    result = tools._recognize_with_engine("stub", str(path), max_side=200)
+    temp_path, size = received[0]
+    assert size == (200, 100)
+    assert temp_path != str(path)
+    assert not os.path.exists(temp_path)
+    assert result.scale == pytest.approx(0.25)
+    assert result.boxes == [BoundingBox(0, 0, 800, 400)]
+
+    # No downscale: the engine reads the original file
+    result = tools._recognize_with_engine("stub", str(path), max_side=0)
+    assert received[1] == (str(path), (800, 400))
+    assert result.scale == 1.0
+
+
+@pytest.mark.asyncio
+async def test_tools_pass_downscale_limits(monkeypatch):
+    """测试所有识别工具（含批量）都把 max_side/max_pixels 传给识别"""
+    calls = []
+
+    def fake_recognize(engine_type, image_path, **kwargs):
+        calls.append((engine_type, kwargs.get("max_side"), kwargs.get("max_pixels")))
+        return OCRResult(text="ok", boxes=[], confidence=1.0, engine=engine_type, processing_time=0.0)
+
+    monkeypatch.setattr(tools, "_recognize_with_engine", fake_recognize)
+
+    for tool in (
+        tools.recognize_image_paddleocr,
+        tools.recognize_image_paddleocr_mcp,
+        tools.recognize_image_easyocr,
+        tools.recognize_image_deepseek,
+    ):
+        await tool.fn("image.png", max_side=800, max_pixels=500_000)
+    await tools.recognize_images_batch.fn(image_paths=["a.png"], engine="deepseek", max_side=800, max_pixels=500_000)
+
+    assert [engine for engine, _, _ in calls] == ["paddleocr", "paddleocr_mcp", "easyocr", "deepseek", "deepseek"]
+    assert all((side, pixels) == (800, 500_000) for _, side, pixels in calls)
@@ -4,11 +4,14 @@ import pytest
 import tempfile
 import os
 import logging
+import threading
 from pathlib import Path
 from unittest.mock import Mock, patch
 from ocr_mcp_service.logger import (
+    DroppingQueueHandler,
     MCPLogHandler,
     OCRLogger,
+    flush_logs,
     get_logger,
     initialize_logger,
     set_mcp_log_level,
@@ -17,6 +20,18 @@ from ocr_mcp_service.logger import (
 )
 
 
+@pytest.fixture
+def temp_logger_reset():
+    """测试结束后停止日志监听线程并重置单例，避免其继续写入已删除的临时日志文件"""
+    import ocr_mcp_service.logger as logger_module
+
+    yield
+    OCRLogger._stop_listener()
+    OCRLogger._instance = None
+    OCRLogger._initialized = False
+    logger_module._logger_instance = None
+
+
 def test_mcp_log_handler_init():
     """测试MCPLogHandler初始化"""
     handler = MCPLogHandler()
@@ -146,7 +161,7 @@ def test_ocr_logger_singleton():
     assert logger1 is logger2
 
 
-def test_ocr_logger_file_handler():
+def test_ocr_logger_file_handler(temp_logger_reset):
     """测试OCRLogger文件处理器"""
     with tempfile.TemporaryDirectory() as tmpdir:
         log_file = os.path.join(tmpdir, "test.log")
@@ -166,10 +181,10 @@ def test_ocr_logger_file_handler():
             logger = OCRLogger()
             test_logger = logger.get_logger("test")
             test_logger.info("test message")
+            assert logger.flush()
             
             # 关闭所有处理器以释放文件句柄
-            for handler in logger.logger.handlers:
-                handler.close()
+            logger.file_handler.close()
             
             # 验证日志文件被创建
             assert os.path.exists(log_file)
@@ -228,6 +243,7 @@ def test_ocr_logger_log_progress():
     logger.set_mcp_callback(callback)
     
     logger.log_progress("test", 50.0, "Processing", stage="ocr")
+    assert logger.flush()
     
     # 验证回调被调用
     callback.assert_called()
@@ -293,6 +309,7 @@ def test_log_progress_function():
     assert logger_module._logger_instance.mcp_handler.mcp_callback == callback
     
     log_progress("test", 75.0, "Almost done", stage="final")
+    assert flush_logs()
     
     # 验证回调被调用（通过MCPLogHandler的emit方法）
     # 回调是通过logger.info() -> handler.emit() -> callback()调用的
@@ -315,3 +332,133 @@ def test_python_to_mcp_level_mapping():
     assert PYTHON_TO_MCP_LEVEL[logging.ERROR] == "error"
     assert PYTHON_TO_MCP_LEVEL[logging.CRITICAL] == "critical"
 
+
+
+def test_logging_does_not_block_on_slow_handlers():
+    """测试处理器在后台线程运行，慢回调不阻塞调用方"""
+    OCRLogger._instance = None
+    OCRLogger._initialized = False
+
+    release = threading.Event()
+    threads = []
+
+    def slow_callback(level, logger, data):
+        threads.append(threading.current_thread())
+        release.wait(5)
+
+    logger = OCRLogger()
+    logger.set_mcp_callback(slow_callback)
+    test_logger = logger.get_logger("test")
+    for i in range(5):
+        test_logger.info("message %d", i, extra={"image_path": "a.png"})
+    assert logger.get_stats()["queued"] >= 4
+
+    release.set()
+    assert logger.flush()
+    assert len(threads) == 5
+    assert threading.current_thread() not in threads
+    assert logger.get_stats()["queued"] == 0
+
+
+def test_queue_handler_drops_when_full():
+    """测试队列满时丢弃日志并计数，而不是阻塞"""
+    import queue
+
+    handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+    test_logger = logging.getLogger("ocr_mcp_service.test_drop")
+    test_logger.addHandler(handler)
+    try:
+        for i in range(5):
+            test_logger.warning("message %d", i)
+    finally:
+        test_logger.removeHandler(handler)
+
+    assert handler.dropped == 3
+    record = handler.queue.get_nowait()
+    assert record.getMessage() == "message 0"
+    assert record.args is None
+
+
+def test_queue_handler_renders_exceptions():
+    """测试异常信息在入队前被格式化，交给后台线程后仍可输出"""
+    import queue
+
+    handler = DroppingQueueHandler(queue.Queue())
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        import sys
+        record = logging.LogRecord("test", logging.ERROR, "test.py", 1, "failed", (), sys.exc_info())
+    handler.handle(record)
+
+    queued = handler.queue.get_nowait()
+    assert queued.exc_info is None
+    assert "ValueError: boom" in queued.exc_text
+    assert record.exc_info is not None
+
+
+def test_json_formatter_emits_typed_extra_fields():
+    """测试JSON格式日志按原类型输出附加字段"""
+    import json
+    from ocr_mcp_service.logger import JSONFormatter
+
+    record = logging.makeLogRecord({
+        "name": "ocr_mcp_service.PaddleOCREngine",
+        "levelno": logging.INFO,
+        "levelname": "INFO",
+        "msg": "OCR识别完成，耗时 %.2f秒",
+        "args": (1.234,),
+        "processing_time": 1.234,
+        "text_count": 12,
+        "image_path": Path("a.png"),
+        "stage": None,
+    })
+    data = json.loads(JSONFormatter().format(record))
+
+    assert data["message"] == "OCR识别完成，耗时 1.23秒"
+    assert data["level"] == "INFO"
+    assert data["logger"] == "ocr_mcp_service.PaddleOCREngine"
+    assert data["processing_time"] == 1.234
+    assert data["text_count"] == 12
+    assert data["image_path"] == "a.png"
+    assert data["stage"] is None
+    assert "T" in data["timestamp"]
+    assert "args" not in data and "exc_info" not in data
+
+
+def test_ocr_logger_json_format(temp_logger_reset):
+    """测试LOG_FORMAT=json时日志文件为JSON行，且tail_logs可解析"""
+    import json
+    from scripts.tail_logs import parse_log_line
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        log_file = os.path.join(tmpdir, "test.log")
+        OCRLogger._instance = None
+        OCRLogger._initialized = False
+
+        with patch("ocr_mcp_service.logger.get_env") as mock_get_env:
+            mock_get_env.side_effect = lambda key, default: {
+                "LOG_FILE": log_file,
+                "LOG_FORMAT": "json",
+            }.get(key, default)
+
+            logger = OCRLogger()
+            logger.log_progress("test", 50.0, "Processing", stage="ocr", image_path="a.png")
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logger.get_logger("test").error("failed", exc_info=True)
+            assert logger.flush()
+            logger.file_handler.close()
+
+        with open(log_file, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        progress, error = [json.loads(line) for line in lines]
+        assert progress["progress"] == 50.0
+        assert progress["stage"] == "ocr"
+        assert "ValueError: boom" in error["exc_info"]
+
+        entry = parse_log_line(lines[0])
+        assert entry["message"] == "50% - Processing"
+        assert entry["fields"]["image_path"] == "a.png"
+        assert parse_log_line("[2025-01-01 00:00:00] INFO [x] text")["fields"] == {}
@@ -0,0 +1,120 @@
+"""请求指标（延迟直方图、错误、排队等待、字节数）与Prometheus导出测试"""
+
+import time
+
+import pytest
+
+from ocr_mcp_service import metrics, tools
+from ocr_mcp_service.concurrency import EngineLimiter
+from ocr_mcp_service.metrics import (
+    Histogram,
+    MetricsRegistry,
+    add_bytes_processed,
+    start_prometheus_writer,
+    write_prometheus_file,
+)
+from ocr_mcp_service.models import OCRResult
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics, "_registry", registry)
+    return registry
+
+
+def test_histogram_quantiles():
+    """测试直方图分位数估计落在正确的桶内"""
+    histogram = Histogram((0.1, 1.0, 10.0))
+    assert histogram.quantile(0.5) is None
+
+    for _ in range(90):
+        histogram.observe(0.05)
+    for _ in range(9):
+        histogram.observe(0.5)
+    histogram.observe(42.0)
+
+    summary = histogram.summary()
+    assert summary["count"] == 100
+    assert 0 < summary["p50"] <= 0.1
+    assert 0.1 < summary["p95"] <= 1.0
+    assert 0.1 < summary["p99"] <= 1.0
+    # Above the last bucket: bounded by the largest observation
+    assert 10.0 < histogram.quantile(0.999) <= 42.0
+    assert summary["max"] == 42.0
+    assert histogram.cumulative_counts()[-1] == ("+Inf", 100)
+
+
+@pytest.mark.asyncio
+async def test_tools_record_requests_errors_and_bytes(registry, monkeypatch, tmp_path):
+    """测试识别工具按引擎和工具记录请求数、错误类型、延迟和处理字节数"""
+    image = tmp_path / "a.png"
+    image.write_bytes(b"x" * 100)
+    other = tmp_path / "b.png"
+    other.write_bytes(b"x" * 200)
+
+    def fake_recognize(engine_type, image_path, **kwargs):
+        if image_path == "missing.png":
+            raise FileNotFoundError(image_path)
+        add_bytes_processed(image_path)
+        return OCRResult(text="ok", boxes=[], confidence=1.0, engine=engine_type, processing_time=0.1)
+
+    monkeypatch.setattr(tools, "_recognize_with_engine", fake_recognize)
+
+    await tools.recognize_image_paddleocr.fn(str(image))
+    await tools.recognize_image_paddleocr.fn("missing.png")
+    await tools.recognize_images_batch.fn(image_paths=[str(image), str(other)], engine="easyocr")
+
+    data = tools.get_metrics.fn()
+    paddle = data["requests"]["paddleocr"]["recognize_image_paddleocr"]
+    assert paddle["requests"] == 2
+    assert paddle["errors"] == {"FileNotFoundError": 1}
+    assert paddle["bytes_processed"] == 100
+    assert paddle["latency"]["count"] == 2 and paddle["latency"]["p99"] is not None
+
+    batch = data["requests"]["easyocr"]["recognize_images_batch"]
+    assert batch["requests"] == 1 and batch["error_count"] == 0
+    assert batch["bytes_processed"] == 300
+    assert data["queue_wait"]["paddleocr"]["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_limiter_records_queue_wait(registry):
+    """测试排队等待时间按引擎记录"""
+    limiter = EngineLimiter(limit_for=lambda engine: 1, queue_max_for=lambda engine: 0, max_wait=0)
+    await limiter.run("stub", lambda: None)
+    assert registry.get_metrics()["queue_wait"]["stub"]["count"] == 1
+
+
+def test_prometheus_text_file(registry, tmp_path):
+    """测试Prometheus文本格式输出和定时写入文件"""
+    registry.observe_request("recognize_image_paddleocr", "paddleocr", 0.3, bytes_processed=10)
+    registry.observe_request("recognize_image_paddleocr", "paddleocr", 2.0, error_type="TimeoutError")
+    registry.observe_queue_wait("paddleocr", 0.02)
+
+    text = registry.to_prometheus()
+    labels = 'tool="recognize_image_paddleocr",engine="paddleocr"'
+    assert f"ocr_requests_total{{{labels}}} 2" in text
+    assert f'ocr_request_errors_total{{{labels},error_type="TimeoutError"}} 1' in text
+    assert f"ocr_bytes_processed_total{{{labels}}} 10" in text
+    assert f'ocr_request_duration_seconds_bucket{{{labels},le="0.5"}} 1' in text
+    assert f'ocr_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"ocr_request_duration_seconds_count{{{labels}}} 2" in text
+    assert 'ocr_queue_wait_seconds_count{engine="paddleocr"} 1' in text
+    assert "# TYPE ocr_request_duration_seconds histogram" in text
+
+    path = tmp_path / "textfile" / "ocr.prom"
+    write_prometheus_file(str(path))
+    assert path.read_text(encoding="utf-8") == text
+    assert [p.name for p in path.parent.iterdir()] == ["ocr.prom"]
+
+    assert start_prometheus_writer(None) is None
+    stop = start_prometheus_writer(str(tmp_path / "live.prom"), interval=60)
+    try:
+        for _ in range(100):
+            if (tmp_path / "live.prom").exists():
+                break
+            time.sleep(0.01)
+        assert "ocr_requests_total" in (tmp_path / "live.prom").read_text(encoding="utf-8")
+    finally:
+        stop.set()
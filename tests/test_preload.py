@@ -0,0 +1,93 @@
+"""后台预加载、预热与引擎就绪状态测试"""
+
+import threading
+import time
+
+import pytest
+
+from ocr_mcp_service import tools
+from ocr_mcp_service.models import OCRResult
+from ocr_mcp_service.ocr_engine import OCREngine, OCREngineFactory
+from ocr_mcp_service.preload import (
+    FAILED,
+    LOADING,
+    READY,
+    EngineReadiness,
+    make_warmup_image,
+    start_preload,
+)
+
+
+class WarmupEngine(OCREngine):
+    """加载缓慢、记录识别调用的桩引擎"""
+
+    accepts_arrays = True
+
+    def __init__(self, gate: threading.Event):
+        gate.wait(5)
+        self.calls = []
+
+    def recognize_image(self, image_path, image=None, **kwargs):
+        self.calls.append(image.array.shape)
+        return OCRResult(text="warm", boxes=[], confidence=1.0, engine="stub", processing_time=0.0)
+
+
+@pytest.fixture
+def factory(monkeypatch):
+    gate = threading.Event()
+    monkeypatch.setattr(OCREngineFactory, "_engines", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_usage_count", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_locks", {})
+    monkeypatch.setattr(OCREngineFactory, "_pools", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_info", {})
+
+    def create_engine(engine_type, **kwargs):
+        if engine_type == "broken":
+            raise RuntimeError("model missing")
+        return WarmupEngine(gate)
+
+    monkeypatch.setattr(OCREngineFactory, "_create_engine", staticmethod(create_engine))
+    return gate
+
+
+def test_warmup_image_has_text():
+    """测试预热图片为白底黑字的合成图片"""
+    image = make_warmup_image()
+    pixels = image.array
+    assert pixels.shape[2] == 3
+    assert pixels.min() < 128 and pixels.max() == 255
+
+
+def test_preload_runs_in_background_and_warms_up(factory):
+    """测试预加载在后台线程并行运行，加载后在合成图片上预热"""
+    readiness = EngineReadiness()
+
+    start = time.monotonic()
+    threads = start_preload(["stub", "broken", "stub"], warmup=True, readiness=readiness)
+    assert time.monotonic() - start < 0.5
+    assert [t.name for t in threads] == ["OCRPreload-stub", "OCRPreload-broken"]
+    assert readiness.wait("broken", 5) == FAILED
+    assert readiness.get_state("stub") == LOADING
+
+    factory.set()
+    assert readiness.wait("stub", 5) == READY
+    status = readiness.get_status()
+    assert status["stub"]["warmup_time"] is not None
+    assert "model missing" in status["broken"]["error"]
+    assert readiness.get_state("paddleocr") is None
+
+    engine = OCREngineFactory.get_engine("stub")
+    assert engine.calls == [make_warmup_image().array.shape]
+
+
+def test_tool_waits_for_preloading_engine(factory, monkeypatch):
+    """测试请求到达时引擎仍在预加载，则等待其就绪后再识别"""
+    readiness = EngineReadiness()
+    monkeypatch.setattr(tools, "get_engine_readiness", lambda: readiness)
+    start_preload(["stub"], warmup=False, readiness=readiness)
+    threading.Timer(0.1, factory.set).start()
+
+    tools._wait_for_preload("stub", timeout=5)
+    assert readiness.get_state("stub") == READY
+    assert "stub" in OCREngineFactory._engines
+    assert "preload" in tools.health_check.fn()
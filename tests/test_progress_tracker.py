@@ -214,3 +214,109 @@ def test_progress_tracker_history_format():
     assert record["stage"] == "test_stage"
     assert record["message"] == "Test message with special chars: !@#$%"
 
+
+
+def test_heartbeat_scheduler_runs_callbacks_on_one_thread():
+    """测试心跳调度器用单个线程按间隔调度所有回调，注销后不再调用"""
+    import threading
+    from ocr_mcp_service.progress_tracker import HeartbeatScheduler
+
+    scheduler = HeartbeatScheduler()
+    calls = {"fast": 0, "slow": 0}
+    threads = set()
+
+    def tick(name):
+        threads.add(threading.current_thread().name)
+        calls[name] += 1
+
+    fast = scheduler.register(lambda: tick("fast"), 0.02)
+    slow = scheduler.register(lambda: tick("slow"), 0.5)
+    time.sleep(0.15)
+    scheduler.unregister(fast)
+    fast_calls = calls["fast"]
+    time.sleep(0.1)
+
+    assert fast_calls >= 3
+    assert calls["fast"] <= fast_calls + 1
+    assert calls["slow"] == 0
+    assert threads == {"ProgressHeartbeat"}
+    assert scheduler.active_count() == 1
+    scheduler.unregister(slow)
+    scheduler.unregister(slow)
+    assert scheduler.active_count() == 0
+
+
+def test_progress_tracker_heartbeat_shared_and_stops_instantly():
+    """测试多个跟踪器共享心跳线程，停止心跳立即返回"""
+    import threading
+    from ocr_mcp_service.progress_tracker import get_heartbeat_scheduler
+
+    callbacks = [Mock() for _ in range(20)]
+    trackers = [ProgressTracker(on_progress=cb, heartbeat_interval=0.02) for cb in callbacks]
+    before = threading.active_count()
+    for tracker in trackers:
+        tracker.update(10, "OCR引擎调用", "识别中")
+        tracker.start_heartbeat()
+    time.sleep(0.1)
+    assert threading.active_count() <= before + 1
+
+    start = time.monotonic()
+    for tracker in trackers:
+        tracker.stop_heartbeat()
+    assert time.monotonic() - start < 0.05
+    assert get_heartbeat_scheduler().active_count() == 0
+    # Every tracker got heartbeats in addition to its own update
+    assert all(cb.call_count >= 2 for cb in callbacks)
+    cb = callbacks[0]
+    assert cb.call_args[0][2].startswith("处理中")
+
+
+def test_progress_tracker_coalesces_updates_within_min_interval():
+    """测试最小间隔内的更新被合并，最终更新总是发送，并统计被抑制的数量"""
+    from ocr_mcp_service.progress_tracker import get_progress_stats
+
+    callback = Mock()
+    before = get_progress_stats()
+    tracker = ProgressTracker(on_progress=callback, min_interval=10.0)
+
+    tracker.update(10, "图像加载")
+    for i in range(5):
+        tracker.update(20 + i, "结果解析", f"{i}")
+    tracker.update(100, "完成", "处理完成")
+
+    assert [c[0][0] for c in callback.call_args_list] == [10.0, 100.0]
+    assert tracker.get_stats() == {"updates": 7, "emitted": 2, "suppressed": 5}
+    assert len(tracker.history) == 7
+    after = get_progress_stats()
+    assert after["suppressed"] - before["suppressed"] == 5
+
+
+def test_progress_tracker_emits_coalesced_update_later():
+    """测试被合并的更新在间隔过后由心跳或flush发送"""
+    callback = Mock()
+    tracker = ProgressTracker(on_progress=callback, min_interval=0.05)
+
+    tracker.update(10, "图像加载")
+    tracker.update(50, "OCR引擎调用", "识别中")
+    assert callback.call_count == 1
+    tracker.send_heartbeat()
+    assert callback.call_count == 1
+    time.sleep(0.06)
+    tracker.send_heartbeat()
+    assert callback.call_args[0] == (50.0, "OCR引擎调用", "识别中")
+
+    tracker.update(60, "结果解析")
+    tracker.flush()
+    assert callback.call_args[0][0] == 60.0
+    assert tracker.get_stats()["suppressed"] == 0
+
+
+def test_progress_tracker_without_history():
+    """测试关闭历史记录"""
+    callback = Mock()
+    tracker = ProgressTracker(on_progress=callback, record_history=False)
+    tracker.update(50, "processing")
+    tracker.update(100, "完成")
+    assert tracker.get_history() == []
+    assert callback.call_count == 2
+    assert tracker.get_current()["percentage"] == 100.0
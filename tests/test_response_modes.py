@@ -0,0 +1,123 @@
+"""识别结果精简返回模式（detail、box_format、progress_history）测试"""
+
+import pytest
+
+from ocr_mcp_service import tools
+from ocr_mcp_service.models import (
+    BatchItemResult,
+    BoundingBox,
+    DocumentResult,
+    OCRResult,
+    PageResult,
+    check_response_options,
+)
+
+
+def _result(**kwargs):
+    return OCRResult(
+        text="第一行\n第二行",
+        boxes=[BoundingBox(10.4, 20.6, 110.0, 40.2), BoundingBox(10.0, 50.0, 90.5, 70.0)],
+        confidence=0.9,
+        engine="paddleocr",
+        processing_time=1.5,
+        analysis="技术解析",
+        progress_history=[{"percentage": 100.0, "stage": "完成", "message": ""}],
+        **kwargs,
+    )
+
+
+def test_detail_levels():
+    """测试三种详细程度返回的字段"""
+    result = _result()
+
+    assert result.to_dict(detail="text") == {
+        "text": "第一行\n第二行",
+        "engine": "paddleocr",
+        "processing_time": 1.5,
+        "cache_hit": False,
+    }
+    assert set(result.to_dict(detail="confidence")) == {
+        "text", "confidence", "engine", "processing_time", "cache_hit", "scale"
+    }
+    full = result.to_dict()
+    assert full["boxes"][0] == {"x1": 10.4, "y1": 20.6, "x2": 110.0, "y2": 40.2}
+    assert full["analysis"] == "技术解析"
+    assert "progress_history" in full
+    assert "progress_history" not in result.to_dict(include_progress_history=False)
+
+
+def test_flat_boxes_round_trip():
+    """测试扁平整数框编码，且可由from_dict还原"""
+    data = _result().to_dict(box_format="flat")
+    assert data["box_format"] == "flat"
+    assert data["boxes"] == [10, 21, 110, 40, 10, 50, 90, 70]
+
+    restored = OCRResult.from_dict(data)
+    assert restored.boxes[0] == BoundingBox(10.0, 21.0, 110.0, 40.0)
+    assert len(restored.boxes) == 2
+
+
+def test_options_apply_to_pages_and_batch_items():
+    """测试文档各页和批量结果同样应用返回选项"""
+    document = DocumentResult(
+        document_path="/tmp/doc.pdf",
+        page_count=2,
+        pages=[
+            PageResult(page=1, result=_result()),
+            PageResult(page=2, error="boom", error_type="RuntimeError"),
+        ],
+        processing_time=3.0,
+    )
+    data = document.to_dict(detail="text")
+    assert "boxes" not in data and "confidence" not in data
+    assert data["pages"][0] == {"page": 1, "ok": True, **_result().to_dict(detail="text")}
+    assert data["pages"][1]["error"] == "boom"
+
+    item = BatchItemResult(image_path="a.png", result=_result()).to_dict(box_format="flat")
+    assert item["result"]["boxes"] == [10, 21, 110, 40, 10, 50, 90, 70]
+
+
+def test_invalid_options_are_rejected():
+    """测试无效的选项值报错"""
+    check_response_options("full", "dict")
+    with pytest.raises(ValueError, match="detail"):
+        check_response_options("everything", "dict")
+    with pytest.raises(ValueError, match="box_format"):
+        check_response_options("full", "xywh")
+
+
+@pytest.mark.asyncio
+async def test_tools_accept_response_options(monkeypatch):
+    """测试识别工具按参数精简结果，无效参数在识别前返回错误"""
+    calls = []
+
+    def fake_recognize(engine_type, image_path, **kwargs):
+        calls.append(image_path)
+        return _result()
+
+    monkeypatch.setattr(tools, "_recognize_with_engine", fake_recognize)
+
+    response = await tools.recognize_image_paddleocr.fn("image.png", detail="text")
+    assert set(response) == {"text", "engine", "processing_time", "cache_hit"}
+    response = await tools.recognize_image_deepseek.fn(
+        "image.png", box_format="flat", include_progress_history=False
+    )
+    assert response["boxes"] == [10, 21, 110, 40, 10, 50, 90, 70]
+    assert "progress_history" not in response
+
+    calls.clear()
+    for tool in (
+        tools.recognize_image_paddleocr,
+        tools.recognize_image_paddleocr_mcp,
+        tools.recognize_image_easyocr,
+        tools.recognize_image_deepseek,
+    ):
+        error = await tool.fn("image.png", detail="verbose")
+        assert error["error_type"] == "InvalidArgumentError"
+        assert "图片验证失败" not in error["error"]
+    error = await tools.recognize_image_paddleocr.fn("image.png", box_format="xywh")
+    assert error["error_type"] == "InvalidArgumentError"
+    assert calls == []
+
+    batch = await tools.recognize_images_batch.fn(image_paths=["a.png"], detail="verbose")
+    assert batch["error_type"] == "InvalidArgumentError"
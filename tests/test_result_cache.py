@@ -0,0 +1,112 @@
+"""OCR结果缓存测试"""
+
+import shutil
+
+import pytest
+from PIL import Image
+
+from ocr_mcp_service import tools
+from ocr_mcp_service.models import BoundingBox, OCRResult
+from ocr_mcp_service.ocr_engine import OCREngine, OCREngineFactory
+from ocr_mcp_service.result_cache import ResultCache
+
+
+def _result(text="hello", processing_time=1.5):
+    return OCRResult(
+        text=text,
+        boxes=[BoundingBox(0, 0, 10, 5)],
+        confidence=0.9,
+        engine="stub",
+        processing_time=processing_time,
+    )
+
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / "image.png"
+    Image.new("RGB", (20, 10), color="white").save(path)
+    return str(path)
+
+
+def test_key_depends_on_content_engine_and_params(image, tmp_path):
+    """测试缓存键由图片内容、引擎和参数决定"""
+    key = ResultCache.make_key(image, "paddleocr", {"lang": "ch"})
+
+    copy = tmp_path / "copy.png"
+    shutil.copy(image, copy)
+    assert ResultCache.make_key(str(copy), "paddleocr", {"lang": "ch"}) == key
+    assert ResultCache.make_key(image, "paddleocr", {"lang": "ch", "timeout": 5}) == key
+    assert ResultCache.make_key(image, "paddleocr", {"lang": "en"}) != key
+    assert ResultCache.make_key(image, "easyocr_en", {"lang": "ch"}) != key
+
+    Image.new("RGB", (20, 10), color="black").save(copy)
+    assert ResultCache.make_key(str(copy), "paddleocr", {"lang": "ch"}) != key
+
+
+def test_memory_tier_is_lru():
+    """测试内存层按LRU淘汰并统计命中"""
+    cache = ResultCache(max_entries=2, disk_dir=None)
+    cache.put("a", _result("a"))
+    cache.put("b", _result("b"))
+    assert cache.get("a").text == "a"  # a becomes most recently used
+    cache.put("c", _result("c"))
+
+    assert cache.get("b") is None
+    hit = cache.get("a")
+    assert hit.cache_hit
+    assert hit.processing_time == 1.5
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+    assert stats["memory_entries"] == 2
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    """测试磁盘层在新实例中仍可命中，并按数量上限清理"""
+    disk_dir = tmp_path / "cache"
+    ResultCache(max_entries=4, disk_dir=str(disk_dir)).put("k" * 64, _result("persisted"))
+
+    cache = ResultCache(max_entries=4, disk_dir=str(disk_dir), max_disk_entries=5)
+    hit = cache.get("k" * 64)
+    assert hit.text == "persisted"
+    assert hit.cache_hit
+    assert hit.boxes == [BoundingBox(0, 0, 10, 5)]
+    assert cache.get_stats()["disk_hits"] == 1
+
+    for i in range(10):
+        cache.put(f"{i:02d}" * 32, _result(str(i)))
+    assert len(list(disk_dir.glob("*/*.json"))) <= 5
+
+
+def test_recognize_with_engine_uses_cache(image, monkeypatch):
+    """测试相同图片第二次识别直接命中缓存"""
+    calls = []
+
+    class CountingEngine(OCREngine):
+        def recognize_image(self, image_path, **kwargs):
+            calls.append(kwargs)
+            return _result()
+
+    cache = ResultCache(max_entries=8, disk_dir=None)
+    monkeypatch.setattr(tools, "get_result_cache", lambda: cache)
+    monkeypatch.setattr(OCREngineFactory, "_engines", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_usage_count", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_locks", {})
+    monkeypatch.setattr(OCREngineFactory, "_pools", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_info", {})
+    monkeypatch.setattr(
+        OCREngineFactory, "_create_engine", staticmethod(lambda engine_type, **kwargs: CountingEngine())
+    )
+
+    first = tools._recognize_with_engine("stub", image, lang="ch")
+    second = tools._recognize_with_engine("stub", image, lang="ch")
+    third = tools._recognize_with_engine("stub", image, lang="en")
+
+    assert len(calls) == 2
+    assert not first.cache_hit
+    assert second.cache_hit
+    assert second.to_dict()["cache_hit"] is True
+    assert second.processing_time == first.processing_time
+    assert not third.cache_hit
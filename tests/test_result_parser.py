@@ -0,0 +1,101 @@
+"""结果解析器测试"""
+
+import numpy as np
+import pytest
+
+from ocr_mcp_service.models import BoundingBox
+from ocr_mcp_service.result_parser import (
+    parse_easyocr_result,
+    parse_paddle_result,
+    polys_to_boxes,
+)
+
+
+def _quad(x1, y1, x2, y2):
+    return [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+
+
+def test_polys_to_boxes_uniform():
+    """测试规则多边形数组的向量化转换"""
+    polys = np.array([_quad(1, 2, 3, 4), [[5, 6], [9, 5], [8, 10], [4, 9]]])
+    boxes = polys_to_boxes(polys)
+    assert boxes.shape == (2, 4)
+    assert boxes.tolist() == [[1, 2, 3, 4], [4, 5, 9, 10]]
+
+
+def test_polys_to_boxes_ragged():
+    """测试不规则输入（缺失或点数不足的多边形）"""
+    polys = [_quad(1, 2, 3, 4), None, [[0, 0], [1, 1]], _quad(0, 0, 5, 5) + [[6, 7]]]
+    boxes = polys_to_boxes(polys)
+    assert boxes.tolist() == [[1, 2, 3, 4], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 6, 7]]
+
+
+def test_parse_paddle_dict_format():
+    """测试PaddleOCR 3.x字典格式"""
+    result = [{
+        "rec_texts": ["第一行", "", "第三行", "第四行"],
+        "rec_scores": [0.9, 0.1, 0.8],
+        "rec_polys": np.array([
+            _quad(0, 0, 10, 5), _quad(0, 10, 10, 15), _quad(0, 20, 10, 25), _quad(0, 30, 10, 35)
+        ]),
+    }]
+    parsed = parse_paddle_result(result)
+    assert parsed.texts == ["第一行", "第三行", "第四行"]
+    assert parsed.text == "第一行\n第三行\n第四行"
+    # Missing score defaults to 1.0
+    assert parsed.scores == pytest.approx([0.9, 0.8, 1.0])
+    assert parsed.confidence == pytest.approx((0.9 + 0.8 + 1.0) / 3)
+    assert parsed.boxes == [
+        BoundingBox(0, 0, 10, 5), BoundingBox(0, 20, 10, 25), BoundingBox(0, 30, 10, 35)
+    ]
+    assert parsed.box_array.shape == (3, 4)
+
+
+def test_parse_paddle_dict_missing_polys():
+    """测试缺少多边形时使用零框"""
+    parsed = parse_paddle_result([{"rec_texts": ["a", "b"], "rec_scores": [0.5, 0.7], "rec_polys": [_quad(1, 1, 2, 2)]}])
+    assert parsed.boxes == [BoundingBox(1, 1, 2, 2), BoundingBox(0, 0, 0, 0)]
+
+
+def test_parse_paddle_legacy_format():
+    """测试旧版列表格式（使用第0和第2个角点）"""
+    result = [[
+        [[[1, 2], [5, 2], [5, 8], [1, 8]], ("hello", 0.95)],
+        [[[3, 4], [7, 4], [7, 9], [3, 9]], "world"],
+        [[[0, 0], [1, 0]], ("too few points", 0.5)],
+        None,
+    ]]
+    parsed = parse_paddle_result(result)
+    assert parsed.texts == ["hello", "world"]
+    assert parsed.scores == pytest.approx([0.95, 1.0])
+    assert parsed.boxes == [BoundingBox(1, 2, 5, 8), BoundingBox(3, 4, 7, 9)]
+
+
+def test_parse_paddle_empty():
+    """测试空结果"""
+    for result in (None, [], [{}], [[]]):
+        parsed = parse_paddle_result(result)
+        assert parsed.texts == []
+        assert parsed.boxes == []
+        assert parsed.confidence == 0.0
+
+
+def test_parse_easyocr_result():
+    """测试EasyOCR结果解析"""
+    results = [
+        (_quad(10, 20, 30, 40), "Hello", 0.9),
+        (_quad(0, 0, 1, 1), "", 0.2),
+        ([[5, 5], [15, 4], [16, 12], [4, 13]], "World", 0.7),
+    ]
+    parsed = parse_easyocr_result(results)
+    assert parsed.texts == ["Hello", "World"]
+    assert parsed.confidence == pytest.approx(0.8)
+    assert parsed.boxes == [BoundingBox(10, 20, 30, 40), BoundingBox(4, 4, 16, 13)]
+    assert all(isinstance(v, float) for v in (parsed.boxes[0].x1, parsed.boxes[1].y2))
+
+
+def test_parse_easyocr_empty():
+    """测试EasyOCR空结果"""
+    parsed = parse_easyocr_result([])
+    assert parsed.texts == []
+    assert parsed.confidence == 0.0
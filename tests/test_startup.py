@@ -0,0 +1,93 @@
+"""服务启动导入耗时预算测试"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from ocr_mcp_service import config
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Import time budget for the service's own startup, excluding the MCP framework
+# (fastmcp), which every deployment pays. Cold caches on CI are slow, so this is
+# generous; an engine dependency imported at startup costs seconds on its own.
+STARTUP_IMPORT_BUDGET_MS = 1000
+
+# Optional engine dependencies: only the engine that needs them may import them
+HEAVY_MODULES = ("torch", "paddle", "paddleocr", "easyocr", "transformers", "cv2", "pypdfium2")
+
+
+def _parse_importtime(stderr: str) -> dict:
+    """Map module name -> (depth, cumulative microseconds) from -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.setdefault(name.strip(), (depth, int(cumulative)))
+    return modules
+
+
+@pytest.fixture
+def stub_dependencies(tmp_path):
+    """为可选依赖生成桩模块，使导入耗时与是否安装无关，且提前导入可被发现"""
+    stubs = tmp_path / "stubs"
+    for name in HEAVY_MODULES:
+        package = stubs / name
+        package.mkdir(parents=True)
+        (package / "__init__.py").write_text("")
+    (stubs / "torch" / "__init__.py").write_text(
+        "class cuda:\n    @staticmethod\n    def is_available():\n        return False\n"
+    )
+    return stubs
+
+
+def test_startup_import_budget(stub_dependencies, tmp_path):
+    """测试 python -m ocr_mcp_service 启动时不导入引擎依赖，且导入耗时在预算内"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(stub_dependencies), str(SRC_DIR)])
+    env["PRELOAD_ENGINES"] = ""
+    # stdin at EOF: the stdio server starts and exits right away
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "ocr_mcp_service"],
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        cwd=tmp_path,
+        env=env,
+        timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+
+    modules = _parse_importtime(proc.stderr)
+    assert "ocr_mcp_service.tools" in modules
+    eager = [name for name in HEAVY_MODULES if name in modules]
+    assert not eager, f"启动时导入了引擎依赖: {eager}"
+
+    total_us = sum(cumulative for depth, cumulative in modules.values() if depth == 0)
+    framework_us = modules.get("fastmcp", (0, 0))[1]
+    own_ms = (total_us - framework_us) / 1000
+    assert own_ms < STARTUP_IMPORT_BUDGET_MS, f"启动导入耗时 {own_ms:.0f}ms 超出预算"
+
+
+def test_deepseek_device_is_resolved_lazily(monkeypatch):
+    """测试DeepSeek设备在创建引擎时才解析"""
+    class FakeTorch:
+        class cuda:
+            available = True
+
+            @classmethod
+            def is_available(cls):
+                return cls.available
+
+    monkeypatch.setitem(sys.modules, "torch", FakeTorch)
+    assert config.resolve_deepseek_device("auto") == "cuda"
+    assert config.resolve_deepseek_device("cpu") == "cpu"
+    FakeTorch.cuda.available = False
+    assert config.resolve_deepseek_device("cuda") == "cpu"
+    monkeypatch.setitem(sys.modules, "torch", None)
+    assert config.resolve_deepseek_device("auto") == "cpu"
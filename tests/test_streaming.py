@@ -0,0 +1,231 @@
+"""识别文本经MCP进度通知流式发送的测试"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from ocr_mcp_service import tools
+from ocr_mcp_service.image_input import LoadedImage
+from ocr_mcp_service.models import BoundingBox, OCRResult
+from ocr_mcp_service.ocr_engine import OCREngine, OCREngineFactory
+from ocr_mcp_service.progress_tracker import ProgressTracker
+from ocr_mcp_service.streaming import ProgressStream, emit_text, get_progress_stream, streaming
+from ocr_mcp_service.utils import with_timeout
+
+
+class FakeContext:
+    """模拟带progressToken的FastMCP Context，记录发送的通知"""
+
+    def __init__(self, token="token-1"):
+        self.request_context = SimpleNamespace(meta=SimpleNamespace(progressToken=token))
+        self.sent = []
+
+    async def report_progress(self, progress, total=None, message=None):
+        self.sent.append((progress, total, message))
+
+
+async def _drain():
+    # Let notifications scheduled from worker threads run
+    for _ in range(5):
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_text_is_sent_in_chunks():
+    """测试按行分块发送，返回文本由同样的分块拼成"""
+    ctx = FakeContext()
+    stream = ProgressStream(ctx.report_progress, asyncio.get_running_loop(), chunk_lines=2)
+    lines = ["a", "b", "c", "d", "e"]
+
+    assert stream.emit_text(lines) == "\n".join(lines)
+    await _drain()
+
+    assert stream.chunks == ["a\nb", "c\nd", "e"]
+    assert [m for _, _, m in ctx.sent] == ["[文本 1]\na\nb", "[文本 2]\nc\nd", "[文本 3]\ne"]
+    progress = [p for p, _, _ in ctx.sent]
+    assert progress == sorted(progress) and len(set(progress)) == 3
+    assert all(total == 100.0 for _, total, _ in ctx.sent)
+
+
+@pytest.mark.asyncio
+async def test_progress_is_monotonic_and_spans_map_subtasks():
+    """测试进度单调递增，子任务进度映射到所在区间"""
+    ctx = FakeContext()
+    stream = ProgressStream(ctx.report_progress, asyncio.get_running_loop())
+
+    with stream.span(50, 100):
+        stream.report(50, "half of second page")
+    stream.report(10, "late update")
+    await _drain()
+
+    assert ctx.sent[0][0] == pytest.approx(75.0)
+    assert ctx.sent[1][0] > ctx.sent[0][0]
+
+
+def test_no_stream_without_progress_token():
+    """测试客户端未提供progressToken时不创建流，文本照常拼接"""
+    assert ProgressStream.from_context(None) is None
+    assert ProgressStream.from_context(FakeContext(token=None)) is None
+    assert get_progress_stream() is None
+    assert emit_text(["x", "y"]) == "x\ny"
+
+
+@pytest.mark.asyncio
+async def test_engine_thread_inherits_request_stream():
+    """测试引擎线程通过with_timeout继承请求的流"""
+    ctx = FakeContext()
+    stream = ProgressStream.from_context(ctx)
+
+    @with_timeout(5)
+    def engine_run():
+        tracker = ProgressTracker()
+        tracker.update(50, "OCR引擎调用", "识别中")
+        return emit_text(["line 1", "line 2"])
+
+    with streaming(stream):
+        # Same hand-off as run_ocr: the request context goes to the worker thread
+        text = await asyncio.get_running_loop().run_in_executor(
+            None, contextvars.copy_context().run, engine_run
+        )
+    await _drain()
+
+    assert text == "line 1\nline 2"
+    assert [m for _, _, m in ctx.sent] == ["OCR引擎调用: 识别中", "[文本 1]\nline 1\nline 2"]
+
+
+@pytest.mark.asyncio
+async def test_tool_streams_text_for_request(monkeypatch):
+    """测试识别工具把识别文本作为进度通知发送，最终结果与通知内容一致"""
+    def fake_recognize(engine_type, image_path, **kwargs):
+        text = emit_text(["第一行", "第二行"])
+        return OCRResult(text=text, boxes=[], confidence=1.0, engine=engine_type, processing_time=0.0)
+
+    monkeypatch.setattr(tools, "_recognize_with_engine", fake_recognize)
+    ctx = FakeContext()
+
+    result = await tools.recognize_image_easyocr.fn("image.png", ctx=ctx)
+    await _drain()
+
+    assert result["text"] == "第一行\n第二行"
+    assert [m for _, _, m in ctx.sent] == ["[文本 1]\n第一行\n第二行"]
+    assert (await tools.recognize_image_easyocr.fn("image.png"))["text"] == result["text"]
+
+
+@pytest.mark.asyncio
+async def test_single_shot_engine_text_is_sent_once(tmp_path, monkeypatch):
+    """测试一次返回全部文本的引擎，识别完成后只发送一次文本"""
+    from PIL import Image
+
+    class WholeTextEngine(OCREngine):
+        accepts_arrays = False
+
+        def recognize_image(self, image_path, **kwargs):
+            return OCRResult(text="a\nb", boxes=[], confidence=1.0, engine="stub", processing_time=0.0)
+
+    monkeypatch.setattr(tools, "get_result_cache", lambda: None)
+    monkeypatch.setattr(OCREngineFactory, "_engines", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_usage_count", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_locks", {})
+    monkeypatch.setattr(OCREngineFactory, "_pools", {})
+    monkeypatch.setattr(OCREngineFactory, "_engine_info", {})
+    monkeypatch.setattr(
+        OCREngineFactory, "_create_engine", staticmethod(lambda engine_type, **kwargs: WholeTextEngine())
+    )
+    path = tmp_path / "image.png"
+    Image.new("RGB", (20, 20)).save(path)
+    ctx = FakeContext()
+
+    with streaming(ProgressStream.from_context(ctx)):
+        result = await asyncio.get_running_loop().run_in_executor(
+            None, contextvars.copy_context().run, tools._recognize_with_engine, "stub", str(path)
+        )
+    await _drain()
+
+    assert result.text == "a\nb"
+    assert [m for _, _, m in ctx.sent] == ["[文本 1]\na\nb"]
+
+
+@pytest.mark.asyncio
+async def test_tiles_stream_in_order_as_they_finish():
+    """测试分块识别时每个分块完成且之前的分块都已完成即发送其文本，不等全部分块结束"""
+    from ocr_mcp_service.tiling import recognize_tiled
+
+    ctx = FakeContext()
+    stream = ProgressStream.from_context(ctx)
+    tile_1_done = threading.Event()
+    seen_by_last_tile = []
+
+    class TileEngine(OCREngine):
+        accepts_arrays = False
+
+        def recognize_image(self, image_path, **kwargs):
+            index = int(image_path.rsplit("tile_", 1)[1].split(".")[0])
+            if index == 0:
+                # The first tile finishes after the second one
+                tile_1_done.wait(5)
+            elif index == 1:
+                tile_1_done.set()
+            else:
+                deadline = time.monotonic() + 5
+                while len(stream.chunks) < 2 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                seen_by_last_tile.extend(stream.chunks)
+            return OCRResult(
+                text=f"tile {index}", boxes=[BoundingBox(10, 10, 50, 30)], confidence=1.0,
+                engine="stub", processing_time=0.0, box_texts=[f"tile {index}"], box_scores=[1.0],
+            )
+
+    @contextmanager
+    def acquire():
+        yield TileEngine()
+
+    image = LoadedImage.from_array(np.zeros((50, 300, 3), dtype=np.uint8))
+    with streaming(stream):
+        result = await asyncio.get_running_loop().run_in_executor(
+            None,
+            contextvars.copy_context().run,
+            lambda: recognize_tiled(acquire, image, tile_size=100, overlap=0, max_workers=3),
+        )
+    await _drain()
+
+    assert seen_by_last_tile == ["tile 0", "tile 1"]
+    assert stream.chunks == ["tile 0", "tile 1", "tile 2"]
+    assert result.text == "tile 0\ntile 1\ntile 2"
+
+
+@pytest.mark.asyncio
+async def test_document_pages_stream_in_order(tmp_path):
+    """测试多页文档逐页发送文本，页进度按页数划分"""
+    from PIL import Image
+
+    from ocr_mcp_service.document_input import recognize_document
+
+    path = tmp_path / "scan.tiff"
+    frames = [Image.new("RGB", (20, 20)) for _ in range(2)]
+    frames[0].save(path, save_all=True, append_images=frames[1:])
+    ctx = FakeContext()
+
+    def recognize_page(image):
+        # A cached page: the recognizer itself streams nothing
+        return OCRResult(
+            text=f"page {image.page}", boxes=[], confidence=1.0, engine="stub", processing_time=0.0
+        )
+
+    with streaming(ProgressStream.from_context(ctx)):
+        result = await asyncio.get_running_loop().run_in_executor(
+            None, contextvars.copy_context().run, recognize_document, str(path), recognize_page
+        )
+    await _drain()
+
+    assert result.text == "page 1\n\npage 2"
+    assert [m for _, _, m in ctx.sent] == [
+        "[文本 1]\npage 1", "第 1 页完成 (1/2)", "[文本 2]\npage 2", "第 2 页完成 (2/2)",
+    ]
+    assert ctx.sent[1][0] == pytest.approx(50.0)
+    assert ctx.sent[3][0] == pytest.approx(100.0)
@@ -0,0 +1,117 @@
+"""分块识别测试"""
+
+from contextlib import contextmanager
+
+import numpy as np
+import pytest
+
+from ocr_mcp_service.image_input import LoadedImage
+from ocr_mcp_service.models import BoundingBox, OCRResult
+from ocr_mcp_service.ocr_engine import OCREngine
+from ocr_mcp_service.tiling import box_iou, dedupe_boxes, plan_tiles, reading_order, recognize_tiled
+
+# Ground-truth words: (x1, y1, x2, y2, text), in reading order
+LAYOUT = [
+    (10, 10, 40, 20, "alpha"),
+    (80, 12, 110, 22, "beta"),    # crosses the first vertical tile edge
+    (170, 10, 200, 20, "gamma"),
+    (20, 65, 50, 75, "delta"),    # inside the horizontal overlap zone
+    (130, 90, 160, 100, "eps"),
+    (30, 150, 60, 160, "zeta"),
+]
+
+
+def _coordinate_image(width, height):
+    """每个像素编码自身坐标，桩引擎据此还原分块位置"""
+    ys, xs = np.mgrid[0:height, 0:width]
+    return np.stack([xs & 255, ys & 255, (xs >> 8) | ((ys >> 8) << 4)], axis=-1).astype(np.uint8)
+
+
+class LayoutEngine(OCREngine):
+    """按LAYOUT返回分块内（被分块边缘裁剪后）的文本框"""
+
+    accepts_arrays = True
+
+    def recognize_image(self, image_path, image=None, **kwargs):
+        pixels = image.array
+        r, g, b = (int(v) for v in pixels[0, 0])
+        x0, y0 = r | ((b & 15) << 8), g | ((b >> 4) << 8)
+        h, w = pixels.shape[:2]
+        boxes, texts = [], []
+        for x1, y1, x2, y2, text in LAYOUT:
+            cx1, cy1 = max(x1, x0), max(y1, y0)
+            cx2, cy2 = min(x2, x0 + w), min(y2, y0 + h)
+            if cx1 < cx2 and cy1 < cy2:
+                clipped = (cx2 - cx1) < (x2 - x1) or (cy2 - cy1) < (y2 - y1)
+                boxes.append(BoundingBox(cx1 - x0, cy1 - y0, cx2 - x0, cy2 - y0))
+                texts.append(text[:2] if clipped else text)
+        return OCRResult(
+            text="\n".join(texts),
+            boxes=boxes,
+            confidence=0.9,
+            engine="layout",
+            processing_time=0.0,
+            box_texts=texts,
+            box_scores=[0.9] * len(texts),
+        )
+
+
+def test_plan_tiles_covers_image():
+    """测试分块覆盖整张图且相邻分块重叠"""
+    tiles = plan_tiles(250, 180, tile_size=100, overlap=40)
+    assert len(tiles) == 4 * 3
+    assert tiles[0] == (0, 0, 100, 100)
+    assert tiles[-1] == (150, 80, 250, 180)
+    covered = np.zeros((180, 250), dtype=bool)
+    for x0, y0, x1, y1 in tiles:
+        assert x1 - x0 <= 100 and y1 - y0 <= 100
+        covered[y0:y1, x0:x1] = True
+    assert covered.all()
+    assert plan_tiles(50, 40, tile_size=100, overlap=40) == [(0, 0, 50, 40)]
+
+
+def test_box_iou():
+    """测试向量化IoU计算"""
+    boxes = np.array([[0, 0, 10, 10], [0, 0, 10, 10], [5, 0, 15, 10], [0, 0, 5, 10]], dtype=float)
+    iou, ios = box_iou(boxes)
+    assert iou[0, 1] == pytest.approx(1.0)
+    assert iou[0, 2] == pytest.approx(50 / 150)
+    assert ios[0, 3] == pytest.approx(1.0)
+
+
+def test_dedupe_keeps_larger_box_from_other_tile():
+    """测试重叠区重复框只保留较完整的一个，同一分块内不去重"""
+    boxes = np.array([[0, 0, 30, 10], [0, 0, 18, 10], [0, 0, 30, 10]], dtype=float)
+    keep = dedupe_boxes(
+        boxes,
+        scores=np.array([0.8, 0.9, 0.7]),
+        tile_ids=np.array([0, 1, 0]),
+        overlap_mask=np.ones(3, dtype=bool),
+    )
+    assert keep.tolist() == [True, False, True]
+
+
+def test_reading_order():
+    """测试按行从上到下、行内从左到右排序"""
+    boxes = np.array([[50, 0, 60, 10], [0, 2, 10, 12], [0, 30, 10, 40]], dtype=float)
+    assert reading_order(boxes).tolist() == [1, 0, 2]
+
+
+def test_recognize_tiled_merges_tiles():
+    """测试分块识别合并后每个文本只出现一次，坐标为原图坐标"""
+    image = LoadedImage.from_array(_coordinate_image(250, 180))
+    engine = LayoutEngine()
+    checkouts = []
+
+    @contextmanager
+    def acquire():
+        checkouts.append(1)
+        yield engine
+
+    result = recognize_tiled(acquire, image, tile_size=100, overlap=40, max_workers=3)
+
+    assert len(checkouts) == len(plan_tiles(250, 180, tile_size=100, overlap=40))
+    assert result.text.split("\n") == [word[4] for word in LAYOUT]
+    assert result.boxes == [BoundingBox(*word[:4]) for word in LAYOUT]
+    assert result.engine == "layout"
+    assert result.confidence == pytest.approx(0.9)
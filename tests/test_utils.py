@@ -0,0 +1,187 @@
+"""超时工具测试"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ocr_mcp_service import utils
+from ocr_mcp_service.utils import EngineBusyError, get_timeout_stats, with_timeout
+
+
+def test_with_timeout_returns_result():
+    """测试正常执行返回结果"""
+    @with_timeout(5, key="test_ok")
+    def add(a, b):
+        return a + b
+
+    assert add(1, 2) == 3
+
+
+def test_with_timeout_propagates_exceptions():
+    """测试函数异常原样抛出"""
+    @with_timeout(5, key="test_error")
+    def fail():
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError, match="bad input"):
+        fail()
+
+
+def test_with_timeout_returns_promptly_and_tracks_zombie():
+    """测试超时后立即返回，并将仍在运行的任务计为僵尸任务"""
+    release = threading.Event()
+
+    @with_timeout(0.2, key="test_zombie")
+    def slow():
+        release.wait(10)
+        return "done"
+
+    start = time.time()
+    with pytest.raises(TimeoutError):
+        slow()
+    assert time.time() - start < 2
+
+    stats = get_timeout_stats()
+    assert stats["zombie_runs"]["test_zombie"] == 1
+    assert stats["abandoned_total"]["test_zombie"] == 1
+
+    release.set()
+    deadline = time.time() + 5
+    while "test_zombie" in get_timeout_stats()["zombie_runs"] and time.time() < deadline:
+        time.sleep(0.01)
+    assert "test_zombie" not in get_timeout_stats()["zombie_runs"]
+    assert get_timeout_stats()["abandoned_total"]["test_zombie"] == 1
+
+
+def test_with_timeout_refuses_work_with_too_many_zombies(monkeypatch):
+    """测试僵尸任务过多时拒绝新请求"""
+    monkeypatch.setattr(utils, "OCR_MAX_ZOMBIE_RUNS", 1)
+    release = threading.Event()
+
+    @with_timeout(0.1, key="test_busy")
+    def slow():
+        release.wait(10)
+
+    try:
+        with pytest.raises(TimeoutError):
+            slow()
+        with pytest.raises(EngineBusyError):
+            slow()
+        assert get_timeout_stats()["rejected_total"]["test_busy"] == 1
+    finally:
+        release.set()
+
+
+def test_with_timeout_shares_one_bounded_executor():
+    """测试所有键共用一个有界执行器，每个键各有自己的线程配额"""
+    threads = []
+
+    @with_timeout(5, key="test_shared")
+    def current_thread_name():
+        return threading.current_thread().name
+
+    for _ in range(3):
+        threads.append(current_thread_name())
+
+    assert all(name.startswith("OCRWorker") for name in threads)
+    assert utils._get_executor() is utils._get_executor()
+    assert utils._executor._max_workers == utils.OCR_MAX_WORKERS
+    assert utils._get_key_slots("test_shared") is utils._get_key_slots("test_shared")
+    assert utils._get_key_slots("test_shared") is not utils._get_key_slots("test_other")
+
+
+@pytest.fixture
+def small_executor(monkeypatch):
+    """Two shared threads, one per key."""
+    monkeypatch.setattr(utils, "OCR_MAX_WORKERS", 2)
+    monkeypatch.setattr(utils, "OCR_MAX_WORKERS_PER_KEY", 1)
+    monkeypatch.setattr(utils, "_executor", None)
+    monkeypatch.setattr(utils, "_key_slots", {})
+
+
+def test_with_timeout_clock_starts_when_run_starts(small_executor):
+    """测试等待工作线程的时间不计入超时"""
+
+    @with_timeout(0.5, key="test_queue")
+    def work(seconds):
+        time.sleep(seconds)
+        return seconds
+
+    # Each run takes 0.3s, but the second one first waits 0.3s for the key's only slot
+    with ThreadPoolExecutor(max_workers=2) as callers:
+        results = list(callers.map(work, [0.3, 0.3]))
+    assert results == [0.3, 0.3]
+
+
+def test_with_timeout_reports_busy_when_run_never_starts(small_executor):
+    """测试等待工作线程超时时报告引擎繁忙而不是识别超时，也不计为僵尸任务"""
+    release = threading.Event()
+
+    @with_timeout(0.2, key="test_starved")
+    def blocker():
+        release.wait(10)
+
+    @with_timeout(0.2, key="test_starved")
+    def quick():
+        return "ran"
+
+    @with_timeout(0.2, key="test_unaffected")
+    def other():
+        return "ok"
+
+    try:
+        with pytest.raises(TimeoutError):
+            blocker()
+        start = time.monotonic()
+        with pytest.raises(EngineBusyError, match="均被占用"):
+            quick()
+        assert time.monotonic() - start < 0.4
+        # A zombie of one key does not hold the threads of another
+        assert other() == "ok"
+        stats = get_timeout_stats()
+        assert stats["start_timeouts"]["test_starved"] == 1
+        assert stats["zombie_runs"]["test_starved"] == 1
+    finally:
+        release.set()
+
+
+def test_with_timeout_bounds_wait_for_shared_threads(small_executor):
+    """测试共享线程被其他键占满时，等待线程的时间同样受超时限制"""
+    release = threading.Event()
+
+    @with_timeout(0.2, key="test_hog_a")
+    def hog_a():
+        release.wait(10)
+
+    @with_timeout(0.2, key="test_hog_b")
+    def hog_b():
+        release.wait(10)
+
+    @with_timeout(0.2, key="test_late")
+    def late():
+        return "ran"
+
+    try:
+        # Both shared threads are taken by zombies of other keys
+        for hog in (hog_a, hog_b):
+            with pytest.raises(TimeoutError):
+                hog()
+        start = time.monotonic()
+        with pytest.raises(EngineBusyError):
+            late()
+        assert time.monotonic() - start < 0.4
+    finally:
+        release.set()
+
+
+def test_check_worker_capacity(monkeypatch):
+    """测试启动检查发现并发上限超过执行线程数的引擎"""
+    from ocr_mcp_service import concurrency
+    from ocr_mcp_service.concurrency import EngineLimiter, check_worker_capacity
+
+    monkeypatch.setattr(concurrency, "OCR_MAX_WORKERS_PER_KEY", 4)
+    limits = {"paddleocr": 4, "easyocr": 6}
+    limiter = EngineLimiter(limit_for=limits.get)
+    assert check_worker_capacity(["paddleocr", "easyocr"], limiter) == ["easyocr"]